@@ -0,0 +1,607 @@
+"""
+.evtx 리더(src/evtx_reader.py)를 고정 파일로 확인하는 스크립트.
+
+benchmarks/fixtures/sample.evtx 는 이 스크립트의 인코더로 만든 작은 파일(청크 2개)이며,
+청크/레코드 경계, 템플릿 재사용, 치환 값 타입, UTC → 로컬 시각 변환을 확인할 수 있도록 구성되어 있습니다.
+시각 변환은 여러 시간대(서머타임 전환 포함)에서 확인합니다 (TZ 를 바꿀 수 있는 POSIX 에서만).
+
+python-evtx 가 설치되어 있으면 같은 파일을 그 파서(별도 구현)로도 읽어 레코드마다 결과를 비교하므로,
+인코더와 리더가 형식을 똑같이 잘못 이해한 경우도 드러납니다. --compare 로 Windows 에서 내보낸 실제 파일
+(예: wevtutil epl System System.evtx) 을 주면 그 파일도 python-evtx 와 비교합니다.
+
+사용 예:
+    python benchmarks/check_evtx_reader.py               # 고정 파일을 읽어 기대값과 비교 (실패하면 종료 코드 1)
+    python benchmarks/check_evtx_reader.py --regenerate  # 고정 파일을 다시 만든 뒤 비교
+    python benchmarks/check_evtx_reader.py --compare System.evtx  # 내보낸 파일을 python-evtx 결과와 비교
+"""
+import argparse
+import calendar
+import datetime
+import importlib.util
+import logging
+import os
+import struct
+import sys
+import time
+import uuid
+import xml.etree.ElementTree as ElementTree
+import zlib
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.event_filter import EventFilter
+from src.evtx_reader import (CHUNK_RECORDS_OFFSET, CHUNK_SIZE, EVTX_CHUNK_MAGIC, EVTX_FILE_MAGIC, EVTX_RECORD_MAGIC,
+                             FILE_HEADER_SIZE, EvtxFileSource)
+
+DEFAULT_FIXTURE = os.path.join(PROJECT_ROOT, 'benchmarks', 'fixtures', 'sample.evtx')
+# 확인할 시간대 (POSIX TZ 문자열이므로 zoneinfo 데이터가 없어도 됨). 유럽 시간대는 고정 파일 안에서 서머타임이 시작됨
+CHECK_TIMEZONES = ('UTC0', 'KST-9', 'EST5EDT,M3.2.0,M11.1.0', 'CET-1CEST,M3.5.0,M10.5.0/3')
+# 레코드 수. 첫 청크를 채우고 두 번째 청크 일부에 들어가는 크기
+RECORD_COUNT = 300
+# 첫 레코드 시각 (UTC). 유럽 서머타임 전환(2026-03-29 01:00 UTC) 직전이므로 로컬 시각으로 바꾸면 결과가 달라짐
+START_TIME = datetime.datetime(2026, 3, 29, 0, 59, 58, 250000)
+RECORD_INTERVAL = datetime.timedelta(seconds=7, microseconds=500000)
+# 청크의 여유 공간 뒤에 남겨 두는 (읽으면 안 되는) 레코드의 번호
+STALE_RECORD_ID = 999999
+# 이 번호의 배수인 레코드는 UserData 템플릿(여러 치환 값 타입, TimeCreated/Channel 없음)을 사용
+USER_DATA_EVERY = 5
+
+_FILETIME_EPOCH = datetime.datetime(1601, 1, 1)
+# 청크 헤더의 공용 문자열/템플릿 해시 테이블 위치와 버킷 수
+CHUNK_STRING_TABLE_OFFSET, CHUNK_STRING_BUCKETS = 0x80, 64
+CHUNK_TEMPLATE_TABLE_OFFSET, CHUNK_TEMPLATE_BUCKETS = 0x180, 32
+_GUID = uuid.UUID('6b9f3e2a-1c4d-4e8f-9a0b-7c6d5e4f3a21')
+_BINARY = bytes(range(0x10, 0x16))
+
+# BinXML 값 타입
+T_NULL, T_WSTRING, T_STRING, T_INT32, T_UINT8, T_UINT16, T_UINT32, T_INT64, T_UINT64 = 0x00, 0x01, 0x02, 0x07, 0x04, 0x06, 0x08, 0x09, 0x0A
+T_DOUBLE, T_BOOL, T_BINARY, T_GUID, T_SIZE_T, T_FILETIME = 0x0C, 0x0D, 0x0E, 0x0F, 0x10, 0x11
+T_SYSTEMTIME, T_SID, T_HEX32, T_HEX64, T_BINXML, T_WSTRING_ARRAY, T_UINT16_ARRAY = 0x12, 0x13, 0x14, 0x15, 0x21, 0x81, 0x86
+
+
+# --- 고정 파일 내용 ---
+def _record_time(record_id):
+    """레코드의 기록 시각 (UTC)."""
+    return START_TIME + (record_id - 1) * RECORD_INTERVAL
+
+def _local(utc_time):
+    """UTC 시각을 이 프로세스의 시간대 기준 로컬 시각으로 바꿉니다 (리더와 다른 방법으로 계산)."""
+    seconds = calendar.timegm(utc_time.timetuple())
+    return datetime.datetime.fromtimestamp(seconds).replace(microsecond=utc_time.microsecond)
+
+def _is_user_data(record_id):
+    return record_id % USER_DATA_EVERY == 0
+
+def _system_fields(record_id):
+    """System/EventData 템플릿 레코드의 (Provider, EventID, Level, Qualifiers, Data 3개)."""
+    level = (1, 2, 2, 3, 4, 2)[record_id % 6]
+    provider = ('Disk', 'Ntfs', 'volmgr')[record_id % 3]
+    event_id = (7, 55, 153, 161)[record_id % 4]
+    qualifiers = 0xC004 if record_id % 2 else None # 홀수 레코드만 선택적 치환 값이 있음
+    device = f"\\Device\\Harddisk{record_id % 4}\\DR{record_id % 4}"
+    detail = f"retry {record_id} of block {record_id * 4096}"
+    error_code = 0xC0000185 + record_id
+    return provider, event_id, level, qualifiers, device, detail, error_code
+
+def _user_data_fields(record_id):
+    return {
+        'guid': _GUID,
+        'sid': (1, 5, (21, 1004336348, 1177238915, 682003330, 1000 + record_id)),
+        'count': -record_id,
+        'total': 2 ** 40 + record_id,
+        'flag': record_id % 2,
+        'ratio': record_id / 4,
+        'hex64': 0x1122334455667700 + record_id,
+        'size': 0x7FF6_0000 + record_id,
+        'when': datetime.datetime(2026, 3, 29, 2, 30, 15, 125000),
+        'blob': _BINARY,
+        'names': ['alpha', 'beta', f"gamma{record_id}"],
+        'ports': [80, 443, 8000 + record_id],
+        'inner': (f"svc{record_id}", record_id * 3),
+    }
+
+def expected_events():
+    """고정 파일에서 심각/오류 수준 이벤트를 최신순으로 (record_number, 로컬 시각, Source, EventID, 로그 종류, 메시지) 로 반환합니다."""
+    events = []
+    for record_id in range(RECORD_COUNT, 0, -1):
+        timestamp = _local(_record_time(record_id))
+        if _is_user_data(record_id):
+            f = _user_data_fields(record_id)
+            revision, authority, subs = f['sid']
+            message = (f"guid={{{str(f['guid']).upper()}}};sid=S-{revision}-{authority}{''.join(f'-{s}' for s in subs)};"
+                       f"count={f['count']};total={f['total']};flag={f['flag']};ratio={f['ratio']};"
+                       f"hex64=0x{f['hex64']:016x};size=0x{f['size']:016x};when={f['when']};"
+                       f"blob={f['blob'].hex().upper()};names={', '.join(f['names'])};"
+                       f"ports={', '.join(str(p) for p in f['ports'])};"
+                       f"inner={f['inner'][0]}; {f['inner'][1]};note=A&B <ok> ]]")
+            events.append((record_id, timestamp, 'Service Control Manager', 7031, 'sample', message))
+            continue
+        provider, event_id, level, _, device, detail, error_code = _system_fields(record_id)
+        if level not in (1, 2):
+            continue
+        message = f"DeviceName: {device}; {detail}; ErrorCode: 0x{error_code:08x}"
+        events.append((record_id, timestamp, provider, event_id, 'System', message))
+    return events
+
+
+# --- 인코더 ---
+def _filetime(value):
+    return (value - _FILETIME_EPOCH) // datetime.timedelta(microseconds=1) * 10
+
+def _name_hash(name):
+    """청크 문자열 테이블에 기록하는 이름 해시 (UTF-16 코드 단위로 hash * 65599 + c, 하위 16비트)."""
+    value = 0
+    for unit in struct.unpack(f'<{len(name)}H', name.encode('utf-16-le')):
+        value = (value * 65599 + unit) & 0xFFFFFFFF
+    return value & 0xFFFF
+
+
+class _Sub:
+    """템플릿 안의 치환 자리."""
+
+    def __init__(self, index, value_type, optional=False):
+        self.index = index
+        self.value_type = value_type
+        self.optional = optional
+
+
+class _El:
+    """템플릿 요소. children 은 _El, _Sub, 문자열(값 노드) 또는 ('charref', 코드)/('entity', 이름)/('cdata', 문자열)."""
+
+    def __init__(self, name, attrs=(), children=None):
+        self.name = name
+        self.attrs = list(attrs)
+        self.children = children
+
+
+class _ChunkWriter:
+    """
+    청크 하나를 순서대로 기록하는 BinXML 인코더.
+    evtx_reader 가 해석하는 것과 같은 구조(청크 기준 위치로 참조하는 이름/템플릿 정의, 값 선언 배열)를 만들며,
+    이름과 템플릿은 청크마다 한 번만 인라인으로 정의하고 이후에는 위치로 참조합니다.
+    실제 파일처럼 청크 헤더의 문자열/템플릿 해시 테이블과 CRC32 체크섬도 채우므로 다른 파서로도 읽을 수 있습니다.
+    """
+
+    def __init__(self, first_record):
+        self.data = bytearray(CHUNK_RECORDS_OFFSET)
+        self.first_record = first_record
+        self.last_record = first_record - 1
+        self.last_record_offset = 0
+        self._names = {}
+        self._templates = {}
+        self._string_buckets = [0] * CHUNK_STRING_BUCKETS # 버킷별 마지막으로 정의한 이름 위치 (이름 항목끼리 연결)
+        self._template_buckets = [0] * CHUNK_TEMPLATE_BUCKETS
+
+    @property
+    def pos(self):
+        return len(self.data)
+
+    def _pack(self, fmt, *values):
+        self.data += struct.pack('<' + fmt, *values)
+
+    def _patch(self, pos, fmt, *values):
+        struct.pack_into('<' + fmt, self.data, pos, *values)
+
+    def _name_ref(self, field_pos, name):
+        """field_pos 에 이름 위치를 기록하고, 청크에서 처음 나온 이름이면 지금 위치에 인라인으로 정의합니다."""
+        offset = self._names.get(name)
+        if offset is None:
+            offset = self._names[name] = self.pos
+            encoded = name.encode('utf-16-le')
+            name_hash = _name_hash(name)
+            bucket = name_hash % CHUNK_STRING_BUCKETS
+            self._pack('IHH', self._string_buckets[bucket], name_hash, len(name))
+            self._string_buckets[bucket] = offset
+            self.data += encoded + b'\x00\x00'
+        self._patch(field_pos, 'I', offset)
+
+    def _value_text(self, text):
+        encoded = text.encode('utf-16-le')
+        self._pack('BBH', 0x05, T_WSTRING, len(text))
+        self.data += encoded
+
+    def _sub(self, sub):
+        self._pack('BHB', 0x0E if sub.optional else 0x0D, sub.index, sub.value_type)
+
+    def _element(self, element):
+        start = self.pos
+        self._pack('BHII', 0x41 if element.attrs else 0x01, 0xFFFF, 0, 0)
+        if element.attrs:
+            self._pack('I', 0)
+        self._name_ref(start + 7, element.name)
+        attrs_start = self.pos
+        for i, (name, value) in enumerate(element.attrs):
+            attr_pos = self.pos
+            self._pack('BI', 0x06 | (0x40 if i < len(element.attrs) - 1 else 0), 0)
+            self._name_ref(attr_pos + 1, name)
+            if isinstance(value, _Sub):
+                self._sub(value)
+            else:
+                self._value_text(value)
+        if element.attrs:
+            self._patch(start + 11, 'I', self.pos - attrs_start)
+        if element.children is None:
+            self._pack('B', 0x03)
+        else:
+            self._pack('B', 0x02)
+            for child in element.children:
+                self._node(child)
+            self._pack('B', 0x04)
+        self._patch(start + 3, 'I', self.pos - start - 7)
+
+    def _node(self, node):
+        if isinstance(node, _El):
+            self._element(node)
+        elif isinstance(node, _Sub):
+            self._sub(node)
+        elif isinstance(node, str):
+            self._value_text(node)
+        elif node[0] == 'charref':
+            self._pack('BH', 0x08, node[1])
+        elif node[0] == 'entity':
+            ref_pos = self.pos
+            self._pack('BI', 0x09, 0)
+            self._name_ref(ref_pos + 1, node[1])
+        elif node[0] == 'cdata':
+            self._pack('BH', 0x07, len(node[1]))
+            self.data += node[1].encode('utf-16-le')
+
+    def fragment(self, template_key, root, values):
+        """템플릿 인스턴스 프래그먼트를 기록합니다. values: [(타입, 값)], 템플릿이 처음이면 인라인으로 정의."""
+        self._pack('4B', 0x0F, 0x01, 0x01, 0x00)
+        instance_pos = self.pos
+        self._pack('BBII', 0x0C, 0x01, len(self._templates) + 1, 0)
+        offset = self._templates.get(template_key)
+        if offset is None:
+            offset = self._templates[template_key] = self.pos
+            template_guid = uuid.uuid5(_GUID, template_key)
+            bucket = template_guid.bytes_le[0] % CHUNK_TEMPLATE_BUCKETS
+            self._pack('I', self._template_buckets[bucket])
+            self._template_buckets[bucket] = offset
+            self.data += template_guid.bytes_le
+            self._pack('I', 0)
+            body_start = self.pos
+            self._pack('4B', 0x0F, 0x01, 0x01, 0x00)
+            self._element(root)
+            self._pack('B', 0x00)
+            self._patch(offset + 20, 'I', self.pos - body_start)
+        self._patch(instance_pos + 6, 'I', offset)
+
+        self._pack('I', len(values))
+        decls_pos = self.pos
+        self.data += bytes(4 * len(values))
+        for i, (value_type, value) in enumerate(values):
+            value_start = self.pos
+            self._encode_value(value_type, value)
+            self._patch(decls_pos + 4 * i, 'HBx', self.pos - value_start, value_type)
+
+    def _encode_value(self, value_type, value):
+        if value is None:
+            return
+        if value_type == T_WSTRING:
+            self.data += (value + '\x00').encode('utf-16-le')
+        elif value_type == T_STRING:
+            self.data += value.encode('latin-1')
+        elif value_type == T_FILETIME:
+            self._pack('Q', _filetime(value))
+        elif value_type == T_SYSTEMTIME:
+            self._pack('8H', value.year, value.month, value.isoweekday() % 7, value.day, value.hour,
+                       value.minute, value.second, value.microsecond // 1000)
+        elif value_type == T_GUID:
+            self.data += value.bytes_le
+        elif value_type == T_SID:
+            revision, authority, subs = value
+            self.data += bytes([revision, len(subs)]) + authority.to_bytes(6, 'big') + struct.pack(f'<{len(subs)}I', *subs)
+        elif value_type == T_BINARY:
+            self.data += value
+        elif value_type == T_WSTRING_ARRAY:
+            self.data += ''.join(item + '\x00' for item in value).encode('utf-16-le')
+        elif value_type == T_UINT16_ARRAY:
+            self._pack(f'{len(value)}H', *value)
+        elif value_type == T_BINXML:
+            name, count = value
+            self.fragment('inner', _El('Inner', children=[_El('Name', children=[_Sub(0, T_WSTRING)]),
+                                                          _El('Count', children=[_Sub(1, T_UINT32)])]),
+                          [(T_WSTRING, name), (T_UINT32, count)])
+            self._pack('B', 0x00)
+        else:
+            fmt = {T_INT32: 'i', T_UINT8: 'B', T_UINT16: 'H', T_UINT32: 'I', T_INT64: 'q', T_UINT64: 'Q',
+                   T_DOUBLE: 'd', T_BOOL: 'I', T_HEX32: 'I', T_HEX64: 'Q', T_SIZE_T: 'Q'}[value_type]
+            self._pack(fmt, value)
+
+    def add_record(self, record_id, written, template_key, root, values):
+        """레코드를 추가합니다. 청크에 공간이 없으면 아무것도 기록하지 않고 False 를 반환합니다."""
+        start = self.pos
+        saved = (dict(self._names), dict(self._templates), list(self._string_buckets), list(self._template_buckets))
+        self.data += EVTX_RECORD_MAGIC
+        self._pack('IQQ', 0, record_id, _filetime(written))
+        self.fragment(template_key, root, values)
+        self._pack('B', 0x00)
+        size = self.pos - start + 4
+        self._pack('I', size)
+        if self.pos > CHUNK_SIZE:
+            del self.data[start:]
+            self._names, self._templates, self._string_buckets, self._template_buckets = saved
+            return False
+        self._patch(start + 4, 'I', size)
+        self.last_record = record_id
+        self.last_record_offset = start
+        return True
+
+    def finish(self):
+        free_space = self.pos
+        data = self.data + bytes(CHUNK_SIZE - self.pos)
+        # 여유 공간 뒤에 이전에 쓰였던 레코드 흔적(마지막 레코드의 복사본)을 남김. 리더는 헤더의 여유 공간 오프셋까지만 읽어야 함
+        last_record = self.data[self.last_record_offset:]
+        if CHUNK_SIZE - free_space >= len(last_record):
+            data[free_space:free_space + len(last_record)] = last_record
+            struct.pack_into('<Q', data, free_space + 8, STALE_RECORD_ID)
+        data[0:8] = EVTX_CHUNK_MAGIC
+        struct.pack_into('<QQQQIIII', data, 8, self.first_record, self.last_record, self.first_record,
+                         self.last_record, 128, self.last_record_offset, free_space,
+                         zlib.crc32(data[CHUNK_RECORDS_OFFSET:free_space]))
+        struct.pack_into(f'<{CHUNK_STRING_BUCKETS}I', data, CHUNK_STRING_TABLE_OFFSET, *self._string_buckets)
+        struct.pack_into(f'<{CHUNK_TEMPLATE_BUCKETS}I', data, CHUNK_TEMPLATE_TABLE_OFFSET, *self._template_buckets)
+        # 헤더 체크섬: 0~120 바이트와 128~512 바이트의 CRC32
+        struct.pack_into('<I', data, 124, zlib.crc32(data[128:CHUNK_RECORDS_OFFSET], zlib.crc32(data[:120])))
+        return bytes(data)
+
+
+_SYSTEM_TEMPLATE = _El('Event', [('xmlns', 'http://schemas.microsoft.com/win/2004/08/events/event')], [
+    _El('System', children=[
+        _El('Provider', [('Name', _Sub(0, T_WSTRING))]),
+        _El('EventID', [('Qualifiers', _Sub(1, T_UINT16, optional=True))], [_Sub(2, T_UINT16)]),
+        _El('Level', children=[_Sub(3, T_UINT8)]),
+        _El('TimeCreated', [('SystemTime', _Sub(4, T_FILETIME))]),
+        _El('EventRecordID', children=[_Sub(5, T_UINT64)]),
+        _El('Channel', children=[_Sub(6, T_WSTRING)]),
+    ]),
+    _El('EventData', children=[
+        _El('Data', [('Name', 'DeviceName')], [_Sub(7, T_WSTRING)]),
+        _El('Data', children=[_Sub(8, T_STRING)]),
+        _El('Data', [('Name', 'ErrorCode')], [_Sub(9, T_HEX32)]),
+    ]),
+])
+
+_USER_DATA_FIELDS = (('guid', T_GUID), ('sid', T_SID), ('count', T_INT32), ('total', T_INT64), ('flag', T_BOOL),
+                     ('ratio', T_DOUBLE), ('hex64', T_HEX64), ('size', T_SIZE_T), ('when', T_SYSTEMTIME),
+                     ('blob', T_BINARY), ('names', T_WSTRING_ARRAY), ('ports', T_UINT16_ARRAY), ('inner', T_BINXML))
+
+_USER_DATA_TEMPLATE = _El('Event', [('xmlns', 'http://schemas.microsoft.com/win/2004/08/events/event')], [
+    _El('System', children=[
+        _El('Provider', [('Name', _Sub(0, T_WSTRING))]),
+        _El('EventID', children=[_Sub(1, T_UINT16)]),
+        _El('Level', children=[_Sub(2, T_UINT8)]),
+        _El('EventRecordID', children=[_Sub(3, T_UINT64)]),
+    ]),
+    _El('UserData', children=[_El('ServiceFailure', children=[
+        _El(name.capitalize(), children=[f"{name}=", _Sub(4 + i, value_type), ';'])
+        for i, (name, value_type) in enumerate(_USER_DATA_FIELDS)
+    ] + [_El('Note', children=['note=A', ('entity', 'amp'), 'B ', ('charref', ord('<')), 'ok', ('entity', 'gt'),
+                               ('cdata', ' ]]')])])]),
+])
+
+
+def _record_values(record_id):
+    if _is_user_data(record_id):
+        fields = _user_data_fields(record_id)
+        return 'user_data', _USER_DATA_TEMPLATE, [
+            (T_WSTRING, 'Service Control Manager'), (T_UINT16, 7031), (T_UINT8, 2), (T_UINT64, record_id)
+        ] + [(value_type, fields[name]) for name, value_type in _USER_DATA_FIELDS]
+    provider, event_id, level, qualifiers, device, detail, error_code = _system_fields(record_id)
+    return 'system', _SYSTEM_TEMPLATE, [
+        (T_WSTRING, provider), (T_UINT16 if qualifiers is not None else T_NULL, qualifiers), (T_UINT16, event_id),
+        (T_UINT8, level), (T_FILETIME, _record_time(record_id)), (T_UINT64, record_id), (T_WSTRING, 'System'),
+        (T_WSTRING, device), (T_STRING, detail), (T_HEX32, error_code)
+    ]
+
+def build_fixture():
+    """고정 .evtx 파일 내용(bytes)을 만듭니다. 순환 로그처럼 최신 청크를 파일 앞쪽에 둡니다."""
+    chunks = []
+    writer = _ChunkWriter(1)
+    for record_id in range(1, RECORD_COUNT + 1):
+        template_key, root, values = _record_values(record_id)
+        if not writer.add_record(record_id, _record_time(record_id), template_key, root, values):
+            chunks.append(writer.finish())
+            writer = _ChunkWriter(record_id)
+            if not writer.add_record(record_id, _record_time(record_id), template_key, root, values):
+                raise ValueError(f"Record {record_id} does not fit in an empty chunk.")
+    chunks.append(writer.finish())
+    chunks.reverse()
+
+    header = bytearray(FILE_HEADER_SIZE)
+    header[0:8] = EVTX_FILE_MAGIC
+    struct.pack_into('<QQQIHHHH', header, 8, 0, len(chunks) - 1, RECORD_COUNT + 1, 128, 1, 3, FILE_HEADER_SIZE,
+                     len(chunks))
+    struct.pack_into('<I', header, 124, zlib.crc32(header[:120]))
+    return bytes(header) + b''.join(chunks)
+
+def chunk_record_ranges(data):
+    """파일의 청크별 (첫 레코드 번호, 마지막 레코드 번호) 를 레코드 번호 순으로 반환합니다."""
+    ranges = []
+    for offset in range(FILE_HEADER_SIZE, len(data), CHUNK_SIZE):
+        ranges.append(struct.unpack_from('<QQ', data, offset + 8))
+    return sorted(ranges)
+
+
+# --- 확인 ---
+_ALL_LEVELS = 'critical,error,warning,information,verbose'
+
+def _read(path, max_records=None, after_record=None, event_filter=None):
+    source = EvtxFileSource(path, event_filter=event_filter)
+    return [(event.record_number, event.timestamp, event.source, event.event_id, event.log_type,
+             source.format_message(event)) for event in source.iter_raw_events(max_records, after_record=after_record)]
+
+def _read_with_python_evtx(path):
+    """
+    python-evtx 로 파일의 모든 레코드를 읽어 _read 와 같은 형태의 튜플 목록을 레코드 번호 순으로 반환합니다.
+    python-evtx 가 렌더링하지 못하는 레코드(지원하지 않는 치환 값 타입)는 (레코드 번호, 헤더 시각) 만 담습니다.
+    """
+    from Evtx.Evtx import Evtx
+    namespace = '{http://schemas.microsoft.com/win/2004/08/events/event}'
+    default_log_type = os.path.splitext(os.path.basename(path))[0]
+    events = []
+    with Evtx(path) as log:
+        for record in log.records():
+            header_time = _local(record.timestamp().replace(tzinfo=None))
+            try:
+                root = ElementTree.fromstring(record.xml())
+            except Exception:
+                events.append((record.record_num(), header_time))
+                continue
+            system = root.find(f'{namespace}System')
+            provider = system.find(f'{namespace}Provider')
+            time_created = system.find(f'{namespace}TimeCreated')
+            channel = system.findtext(f'{namespace}Channel')
+            timestamp = header_time
+            if time_created is not None and time_created.get('SystemTime'):
+                timestamp = _local(datetime.datetime.fromisoformat(time_created.get('SystemTime')).replace(tzinfo=None))
+            parts = []
+            for data in root.iter(f'{namespace}Data'):
+                text = (data.text or '').strip()
+                if text:
+                    parts.append(f"{data.get('Name')}: {text}" if data.get('Name') else text)
+            events.append((record.record_num(), timestamp, provider.get('Name') if provider is not None else 'Unknown',
+                           int(system.findtext(f'{namespace}EventID') or 0), channel or default_log_type,
+                           '; '.join(parts) or None))
+    return sorted(events)
+
+def compare_with_python_evtx(path):
+    """
+    리더와 python-evtx 의 결과를 레코드마다 비교해 (전체 일치 수, 일부만 비교한 수, 불일치 목록) 을 반환합니다.
+    EventData 가 없는 레코드(UserData 등)는 두 파서의 렌더링 방식이 달라 메시지를 비교하지 않고,
+    python-evtx 가 렌더링하지 못한 레코드는 레코드 번호와 헤더 시각만 비교합니다.
+    """
+    ours = {event[0]: event for event in _read(path, event_filter=EventFilter(levels=_ALL_LEVELS))}
+    matched, partial, mismatches = 0, 0, []
+    for theirs in _read_with_python_evtx(path):
+        mine = ours.pop(theirs[0], None)
+        if mine is None:
+            mismatches.append((theirs, None))
+            continue
+        compared = 2 if len(theirs) == 2 else 5 if theirs[5] is None else 6
+        if mine[:compared] != theirs[:compared]:
+            mismatches.append((theirs, mine))
+        elif compared == 6:
+            matched += 1
+        else:
+            partial += 1
+    mismatches.extend((None, mine) for mine in ours.values())
+    return matched, partial, mismatches
+
+def run_checks(path):
+    """고정 파일을 여러 방식으로 읽어 기대값과 비교하고 실패한 확인 이름 목록을 반환합니다 (현재 시간대 기준)."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    expected = expected_events()
+    (first_start, first_end), (second_start, second_end) = chunk_record_ranges(data)
+    newer_chunk = [event for event in expected if event[0] >= second_start]
+    if not any(event[0] == first_end for event in expected):
+        raise ValueError(f"The last record of the first chunk ({first_end}) must be an error event.")
+    since = _local(_record_time(60))
+    until = _local(_record_time(150))
+    user_data_event = next(event for event in expected if _is_user_data(event[0]))
+    checks = [
+        ('fixture matches generator', lambda: data == build_fixture(), None),
+        ('two chunks, second chunk partially filled', lambda: (first_start, first_end, second_end) == (1, second_start - 1, RECORD_COUNT), None),
+        ('all error events newest first across chunks', lambda: _read(path), expected),
+        ('all levels', lambda: len(_read(path, event_filter=EventFilter(levels=_ALL_LEVELS))), RECORD_COUNT),
+        ('max_records stops after the chunk boundary', lambda: _read(path, max_records=len(newer_chunk) + 3),
+         expected[:len(newer_chunk) + 3]),
+        ('bookmark at the chunk boundary', lambda: _read(path, after_record=first_end), newer_chunk),
+        ('bookmark one record before the chunk boundary', lambda: _read(path, after_record=first_end - 1),
+         [event for event in expected if event[0] >= first_end]),
+        ('bookmark inside a chunk', lambda: _read(path, after_record=first_end - 10),
+         [event for event in expected if event[0] > first_end - 10]),
+        ('bookmark newer than the file is ignored', lambda: _read(path, after_record=RECORD_COUNT + 100), expected),
+        ('local time filter on record headers', lambda: _read(path, event_filter=EventFilter(since=since, until=until)),
+         [event for event in expected if since <= event[1] <= until]),
+        ('FILETIME converted to local time', lambda: _read(path)[-1][1], _local(datetime.datetime(2026, 3, 29, 0, 59, 58, 250000))),
+        ('record header time used without TimeCreated', lambda: next(e for e in _read(path) if e[0] == user_data_event[0])[1],
+         _local(_record_time(user_data_event[0]))),
+        ('substitution types in UserData', lambda: next(e for e in _read(path) if e[0] == user_data_event[0])[5],
+         user_data_event[5]),
+    ]
+    if importlib.util.find_spec('Evtx') is not None:
+        # UserData 레코드는 python-evtx 가 UInt16 배열을 지원하지 않아 레코드 번호와 헤더 시각만 비교됨
+        checks.append(('same records as python-evtx', lambda: compare_with_python_evtx(path),
+                       (RECORD_COUNT - RECORD_COUNT // USER_DATA_EVERY, RECORD_COUNT // USER_DATA_EVERY, [])))
+    else:
+        print(f"{'same records as python-evtx':<50} skipped (python-evtx is not installed)")
+    failures = []
+    for name, actual_func, expected_value in checks:
+        try:
+            actual = actual_func()
+            passed = actual is True if expected_value is None else actual == expected_value
+        except Exception as e:
+            actual, passed = f"{type(e).__name__}: {e}", False
+        print(f"{name:<50} {'ok' if passed else 'FAIL'}")
+        if not passed:
+            failures.append(name)
+            if expected_value is not None:
+                print(f"    expected: {str(expected_value)[:300]}")
+            print(f"    actual:   {str(actual)[:300]}")
+    return failures
+
+def _set_timezone(timezone):
+    if timezone is None:
+        os.environ.pop('TZ', None)
+    else:
+        os.environ['TZ'] = timezone
+    time.tzset()
+
+def run_checks_in_timezones(path, timezones=CHECK_TIMEZONES):
+    """run_checks 를 시간대마다 실행합니다. TZ 를 바꿀 수 없는 플랫폼(Windows)에서는 현재 시간대로 한 번만 실행."""
+    if not hasattr(time, 'tzset'):
+        return run_checks(path)
+    original = os.environ.get('TZ')
+    failures = []
+    try:
+        for timezone in timezones:
+            _set_timezone(timezone)
+            print(f"[TZ={timezone}]")
+            failures.extend(f"{name} (TZ={timezone})" for name in run_checks(path))
+    finally:
+        _set_timezone(original)
+    return failures
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the .evtx reader against a generated fixture")
+    parser.add_argument('--fixture', default=DEFAULT_FIXTURE, help="fixture .evtx path")
+    parser.add_argument('--regenerate', action='store_true', help="rewrite the fixture before checking")
+    parser.add_argument('--compare', nargs='+', default=[], metavar='EVTX',
+                        help="also compare these .evtx files (e.g. real exports) with python-evtx")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('src').setLevel(logging.ERROR)
+
+    if args.regenerate:
+        os.makedirs(os.path.dirname(args.fixture) or '.', exist_ok=True)
+        with open(args.fixture, 'wb') as f:
+            f.write(build_fixture())
+        print(f"Wrote '{args.fixture}'.")
+    failures = run_checks_in_timezones(args.fixture)
+
+    if args.compare and importlib.util.find_spec('Evtx') is None:
+        print("--compare needs python-evtx (pip install python-evtx).")
+        return 1
+    for path in args.compare:
+        matched, partial, mismatches = compare_with_python_evtx(path)
+        print(f"{path}: {matched} records match python-evtx, {partial} partially compared, {len(mismatches)} differ")
+        for theirs, mine in mismatches[:5]:
+            print(f"    python-evtx: {str(theirs)[:300]}")
+            print(f"    reader:      {str(mine)[:300]}")
+        if mismatches:
+            failures.append(f"compare {path}")
+
+    if failures:
+        print(f"{len(failures)} check(s) failed.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
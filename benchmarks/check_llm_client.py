@@ -0,0 +1,371 @@
+"""
+LLM 클라이언트(src/llm_interface.py)를 로컬 스텁 서버로 확인하는 스크립트.
+
+ThreadingHTTPServer 로 채팅 완성 API 를 흉내 내는 스텁을 띄워(응답 지연, 429/5xx 주입, 요청 기록)
+동시 요청의 속도 향상과 결과 순서, 재시도/백오프, 일부 요청이 실패했을 때의 결과를 확인합니다.
+스트리밍(LLM_STREAM) 요청에는 chunked text/event-stream 으로 응답하며, 줄과 UTF-8 문자 중간에서 조각을 나누고
+주석 줄, 역할만 있는 delta, [DONE] 뒤의 데이터를 섞어 _read_stream 의 처리와 첫 토큰 시간 로그를 확인합니다.
+응답 캐시는 환경 변수로 스텁을 가리킨 get_llm_suggestions_from_env 를 임시 캐시 파일로 여러 번 실행하며
+실행마다 스텁이 받은 요청 수로 전체 목록 적중, 오류별 부분 적중, TTL 만료, LRU 제거를 확인합니다.
+스텁은 프롬프트의 '소스: <이름>' 줄을 읽어 소스마다 '<이름> 조치 방법' 을 응답하므로 결과가 어느 요청의 것인지 알 수 있습니다.
+실제 API 나 네트워크는 사용하지 않습니다.
+
+사용 예:
+    python benchmarks/check_llm_client.py   # 실패하면 종료 코드 1
+"""
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.llm_interface import LlmRequestError, _get_suggestions, _LlmClient, get_llm_suggestions_from_env
+from src.prompt_builder import PromptBuilder
+
+# 스텁 응답 지연(초). 동시 요청 확인에서는 뒤 프롬프트일수록 빨리 끝나도록 소스마다 다르게 줌
+BASE_LATENCY = 0.3
+LATENCY_STEP = 0.05
+CONCURRENCY = 6
+# 동시 요청이 순차 요청보다 이 배수 이상 빨라야 함
+MIN_SPEEDUP = 3.0
+# 스트리밍 응답: 첫 조각 전 지연(초), 조각 크기(바이트), 조각 사이 지연(초)
+FIRST_CHUNK_DELAY = 0.3
+STREAM_CHUNK_BYTES = 7
+STREAM_CHUNK_DELAY = 0.01
+STREAM_DELTAS = ("SrcS 조치", " 방법: 서비스", " 재시작")
+# 캐시 TTL 확인: 이 TTL(초)로 저장한 뒤 TTL_WAIT 초 기다리면 만료되어야 함
+CACHE_TTL_SECONDS = 0.5
+CACHE_TTL_WAIT = 0.7
+
+_SOURCE_LINE = re.compile(r'^소스: (\S+)', re.MULTILINE)
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # keep-alive 세션이 연결을 재사용하도록 함
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        payload = json.loads(body)
+        self.server.stub.handle(self, payload)
+
+    def send_json(self, status, data, headers=None):
+        encoded = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def send_stream(self, body):
+        """body 를 STREAM_CHUNK_BYTES 크기의 chunked 조각으로 나눠 보냅니다 (charset 없는 text/event-stream)."""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+        self.wfile.flush()
+        time.sleep(FIRST_CHUNK_DELAY)
+        try:
+            for start in range(0, len(body), STREAM_CHUNK_BYTES):
+                piece = body[start:start + STREAM_CHUNK_BYTES]
+                self.wfile.write(f"{len(piece):x}\r\n".encode('ascii') + piece + b"\r\n")
+                self.wfile.flush()
+                time.sleep(STREAM_CHUNK_DELAY)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True # 클라이언트가 [DONE] 에서 읽기를 멈추고 연결을 닫은 경우
+
+
+class StubChatServer:
+    """
+    채팅 완성 API 스텁. failures 에 소스별 상태 코드 목록을 넣으면 그 소스가 든 요청에 앞에서부터 하나씩 응답하고
+    (429 에는 Retry-After 헤더를 붙임), 목록이 비면 정상 응답합니다. latency(소스) 만큼 기다린 뒤 응답합니다.
+    """
+
+    def __init__(self):
+        self.latency = lambda source: 0.0
+        self.retry_after = '0.2'
+        self.failures = {}
+        self.requests = [] # (받은 시각, 소스 목록, 응답 상태 코드)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), _StubHandler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        self._thread = None
+
+    @property
+    def endpoint(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1/chat/completions"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='llm-stub', daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def reset(self, latency=None, failures=None):
+        self.latency = latency or (lambda source: 0.0)
+        self.failures = {source: list(codes) for source, codes in (failures or {}).items()}
+        self.requests = []
+        self.max_in_flight = 0
+
+    def requests_for(self, source):
+        return [request for request in self.requests if source in request[1]]
+
+    def handle(self, handler, payload):
+        sources = list(dict.fromkeys(_SOURCE_LINE.findall(payload['messages'][-1]['content'])))
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            status = next((self.failures[source].pop(0) for source in sources if self.failures.get(source)), 200)
+            self.requests.append((time.perf_counter(), sources, status))
+        try:
+            time.sleep(max((self.latency(source) for source in sources), default=0.0))
+            if status != 200:
+                headers = {'Retry-After': self.retry_after} if status == 429 else None
+                handler.send_json(status, {'error': {'message': f"stub error {status}"}}, headers)
+                return
+            if payload.get('stream'):
+                handler.send_stream(self.stream_body())
+                return
+            handler.send_json(200, {'choices': [{'message': {'content': self.answer(sources)}}]})
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+    @staticmethod
+    def answer(sources):
+        """소스가 하나면 본문만, 여러 개면 '오류 #N 분석' 제목으로 나눈 응답을 만듭니다."""
+        if len(sources) == 1:
+            return f"{sources[0]} 조치 방법"
+        return "\n\n".join(f"### 오류 #{i} 분석\n{source} 조치 방법" for i, source in enumerate(sources, 1))
+
+    @staticmethod
+    def stream_body():
+        """주석, 역할만 있는 delta, 내용 delta, [DONE], [DONE] 뒤의(무시되어야 할) delta 로 된 SSE 본문."""
+        events = [': keep-alive', 'data: ' + json.dumps({'choices': [{'delta': {'role': 'assistant'}}]})]
+        events += ['data: ' + json.dumps({'choices': [{'delta': {'content': delta}}]}, ensure_ascii=False)
+                   for delta in STREAM_DELTAS]
+        events += ['data: [DONE]', 'data: ' + json.dumps({'choices': [{'delta': {'content': ' 무시'}}]}, ensure_ascii=False)]
+        return ''.join(f"{event}\n\n" for event in events).encode('utf-8')
+
+
+class _MetricCapture(logging.Handler):
+    """extra={'metric': ...} 로 남긴 로그 레코드를 모읍니다."""
+
+    def __init__(self):
+        super().__init__(level=logging.INFO)
+        self.metrics = []
+
+    def emit(self, record):
+        if hasattr(record, 'metric'):
+            self.metrics.append((record.metric, record.value))
+
+
+def _error(source, event_id=1, count=10):
+    return {'Source': source, 'EventID': event_id, 'Count': count, 'SampleMessage': f"{source} failed"}
+
+def _client(stub, concurrency=1, max_retries=3):
+    return _LlmClient(stub.endpoint, 'stub-key', 'stub-model', timeout=10, max_retries=max_retries,
+                      concurrency=concurrency, backoff_seconds=0.05)
+
+def _headings(result):
+    return [line for line in result.splitlines() if line.startswith('### ')]
+
+
+# --- 확인 ---
+def check_concurrency(stub):
+    """순차/동시 요청 시간과 결과를 반환합니다. 뒤 프롬프트일수록 빨리 끝나므로 완료 순서는 입력 순서와 반대."""
+    sources = [f"Src{i}" for i in range(CONCURRENCY)]
+    prompts = [PromptBuilder().build([_error(source)]) for source in sources]
+    latency = lambda source: BASE_LATENCY + LATENCY_STEP * (CONCURRENCY - 1 - int(source[3:]))
+    timings = {}
+    results = {}
+    for concurrency in (1, CONCURRENCY):
+        stub.reset(latency=latency)
+        client = _client(stub, concurrency=concurrency)
+        started = time.perf_counter()
+        results[concurrency] = client.complete_all(prompts)
+        timings[concurrency] = time.perf_counter() - started
+        client.close()
+    return sources, timings, results, stub.max_in_flight
+
+def check_retry(stub):
+    """429(Retry-After) 다음 503 을 받은 뒤 성공하는 요청의 (결과, 요청 수, 걸린 시간)."""
+    stub.reset(failures={'SrcR': [429, 503]})
+    client = _client(stub, max_retries=3)
+    started = time.perf_counter()
+    result = client.complete(PromptBuilder().build([_error('SrcR')]))
+    client.close()
+    return result, len(stub.requests_for('SrcR')), time.perf_counter() - started
+
+def check_retry_exhausted(stub):
+    """계속 503 을 받는 요청의 (예외 종류, 요청 수)."""
+    stub.reset(failures={'SrcX': [503] * 10})
+    client = _client(stub, max_retries=2)
+    try:
+        client.complete(PromptBuilder().build([_error('SrcX')]))
+        outcome = 'no error'
+    except LlmRequestError:
+        outcome = 'LlmRequestError'
+    client.close()
+    return outcome, len(stub.requests_for('SrcX'))
+
+def check_partial_failure(stub):
+    """오류 4개 중 하나의 요청이 400 으로 실패할 때 _get_suggestions 결과와 요청 수."""
+    errors = [_error('SrcA', 1), _error('SrcF', 2), _error('SrcB', 3), _error('SrcC', 4)]
+    stub.reset(latency=lambda source: {'SrcA': 0.2, 'SrcB': 0.1}.get(source, 0.0), failures={'SrcF': [400]})
+    client = _client(stub, concurrency=3)
+    result = _get_suggestions(client, PromptBuilder(), None, errors, batch_size=1)
+    client.close()
+    return result, len(stub.requests)
+
+def check_stream(stub):
+    """스트리밍 요청의 (내용, on_delta 로 받은 텍스트 목록, 첫 토큰 시간 metric 목록, 걸린 시간, 요청 수)."""
+    stub.reset()
+    client = _LlmClient(stub.endpoint, 'stub-key', 'stub-model', timeout=10, backoff_seconds=0.05, stream=True)
+    deltas = []
+    capture = _MetricCapture()
+    llm_logger = logging.getLogger('src.llm_interface')
+    original_level = llm_logger.level
+    llm_logger.addHandler(capture)
+    llm_logger.setLevel(logging.INFO)
+    llm_logger.propagate = False
+    try:
+        started = time.perf_counter()
+        content = client.complete(PromptBuilder().build([_error('SrcS')]), on_delta=deltas.append)
+        elapsed = time.perf_counter() - started
+    finally:
+        llm_logger.removeHandler(capture)
+        llm_logger.setLevel(original_level)
+        llm_logger.propagate = True
+        client.close()
+    return content, deltas, capture.metrics, elapsed, len(stub.requests)
+
+def _cached_runs(stub, cache_path, runs, **settings):
+    """
+    스텁을 가리키는 환경 변수로 get_llm_suggestions_from_env 를 runs(소스 목록, 실행 전 대기 초) 순서대로 실행하고
+    실행별 (스텁이 받은 요청의 소스 목록들, 결과) 를 반환합니다. 환경 변수는 끝나면 되돌립니다.
+    """
+    env = {'GROK_API_KEY': 'stub-key', 'GROK_MODEL': 'stub-model', 'LLM_API_ENDPOINT': stub.endpoint,
+           'LLM_CONCURRENCY': '1', 'LLM_MAX_RETRIES': '0', 'LLM_STREAM': 'false',
+           'LLM_CACHE_TTL_HOURS': '168', 'LLM_CACHE_MAX_ENTRIES': '500', **settings}
+    original = {name: os.environ.get(name) for name in env}
+    os.environ.update(env)
+    outcomes = []
+    try:
+        for sources, wait in runs:
+            time.sleep(wait)
+            stub.reset()
+            # 오류 번호(영향도 순)가 주어진 순서와 같도록 앞 오류일수록 발생 횟수를 크게 줌
+            errors = [_error(source, i + 1, count=100 - i) for i, source in enumerate(sources)]
+            result = get_llm_suggestions_from_env(errors, cache_path=cache_path)
+            outcomes.append(([request[1] for request in stub.requests], result))
+    finally:
+        for name, value in original.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+    return outcomes
+
+def check_cache(stub, directory):
+    """캐시 시나리오별 실행마다 스텁이 받은 요청(소스 목록)과 결과."""
+    full = _cached_runs(stub, os.path.join(directory, 'full.json'), [(['SrcA', 'SrcB'], 0), (['SrcA', 'SrcB'], 0)])
+    partial = _cached_runs(stub, os.path.join(directory, 'partial.json'),
+                           [(['SrcA', 'SrcB'], 0), (['SrcA', 'SrcB', 'SrcC'], 0)])
+    ttl = _cached_runs(stub, os.path.join(directory, 'ttl.json'),
+                       [(['SrcA'], 0), (['SrcA'], 0), (['SrcA'], CACHE_TTL_WAIT)],
+                       LLM_CACHE_TTL_HOURS=str(CACHE_TTL_SECONDS / 3600))
+    lru = _cached_runs(stub, os.path.join(directory, 'lru.json'),
+                       [([source], 0) for source in ('SrcA', 'SrcB', 'SrcA', 'SrcC', 'SrcA', 'SrcB')],
+                       LLM_CACHE_MAX_ENTRIES='2')
+    return full, partial, ttl, lru
+
+def run_checks(stub):
+    """확인을 실행하고 기대값과 다른 확인 이름 목록을 반환합니다."""
+    sources, timings, results, max_in_flight = check_concurrency(stub)
+    expected = [f"{source} 조치 방법" for source in sources]
+    speedup = timings[1] / timings[CONCURRENCY]
+    print(f"sequential {timings[1]:.2f}s, concurrency {CONCURRENCY} {timings[CONCURRENCY]:.2f}s ({speedup:.1f}x)")
+
+    retry_result, retry_requests, retry_elapsed = check_retry(stub)
+    partial, partial_requests = check_partial_failure(stub)
+    sections = [section.strip() for section in re.split(r'^### .*$', partial, flags=re.MULTILINE)[1:]]
+    content, deltas, metrics, stream_elapsed, stream_requests = check_stream(stub)
+    ttft = [value for metric, value in metrics if metric == 'llm_time_to_first_token_seconds']
+    with tempfile.TemporaryDirectory() as directory:
+        full, partial_hit, ttl, lru = check_cache(stub, directory)
+
+    checks = [
+        ('sequential results in prompt order', results[1], expected),
+        ('concurrent results in prompt order', results[CONCURRENCY], expected),
+        (f"{CONCURRENCY} requests in flight at once", max_in_flight, CONCURRENCY),
+        (f"concurrency speedup >= {MIN_SPEEDUP:g}x", speedup >= MIN_SPEEDUP, True),
+        ('retry after 429 and 503 succeeds', (retry_result, retry_requests), ("SrcR 조치 방법", 3)),
+        (f"Retry-After ({stub.retry_after}s) is honoured", retry_elapsed >= float(stub.retry_after), True),
+        ('gives up after max_retries', check_retry_exhausted(stub), ('LlmRequestError', 3)),
+        ('partial failure keeps section order', _headings(partial),
+         [f"### 오류 #{i} 분석 ({source} / 이벤트 ID {i})" for i, source in enumerate(['SrcA', 'SrcF', 'SrcB', 'SrcC'], 1)]),
+        ('partial failure keeps the other results', [sections[0], sections[2], sections[3]] if len(sections) == 4 else sections,
+         ['SrcA 조치 방법', 'SrcB 조치 방법', 'SrcC 조치 방법']),
+        ('failed section carries the error', len(sections) == 4 and sections[1].startswith('오류:'), True),
+        ('failed request is not retried (400)', partial_requests, 4),
+        ('stream content (split lines/UTF-8, stops at [DONE])', (content, stream_requests), (''.join(STREAM_DELTAS), 1)),
+        ('stream on_delta progression', deltas,
+         [''.join(STREAM_DELTAS[:i]) for i in range(1, len(STREAM_DELTAS) + 1)]),
+        ('time-to-first-token logged once', len(ttft), 1),
+        (f"time-to-first-token >= first chunk delay ({FIRST_CHUNK_DELAY}s)",
+         bool(ttft) and FIRST_CHUNK_DELAY <= ttft[0] <= stream_elapsed, True),
+        ('cache: full-set hit sends no request', [requests for requests, _ in full], [[['SrcA', 'SrcB']], []]),
+        ('cache: full-set hit returns the same result', full[1][1], full[0][1]),
+        ('cache: partial hit requests only the new error', [requests for requests, _ in partial_hit],
+         [[['SrcA', 'SrcB']], [['SrcC']]]),
+        ('cache: partial hit keeps section order', _headings(partial_hit[1][1]),
+         [f"### 오류 #{i} 분석 ({source} / 이벤트 ID {i})" for i, source in enumerate(['SrcA', 'SrcB', 'SrcC'], 1)]),
+        ('cache: partial hit reuses cached sections', partial_hit[1][1].count('조치 방법'), 3),
+        (f"cache: TTL ({CACHE_TTL_SECONDS}s) expiry requests again", [len(requests) for requests, _ in ttl], [1, 0, 1]),
+        ('cache: LRU eviction (max 2; A B A C A B)', [len(requests) for requests, _ in lru], [1, 1, 0, 1, 0, 1]),
+    ]
+    failures = []
+    for name, actual, expected in checks:
+        passed = actual == expected
+        print(f"{name:<55} {'ok' if passed else 'FAIL'}")
+        if not passed:
+            failures.append(name)
+            print(f"    expected: {expected}")
+            print(f"    actual:   {actual}")
+    return failures
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('src').setLevel(logging.CRITICAL) # 재시도/실패 로그는 의도된 것이므로 숨김
+
+    with StubChatServer() as stub:
+        failures = run_checks(stub)
+    if failures:
+        print(f"{len(failures)} check(s) failed.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+감시 모드(src/main.py 의 _run_watch)를 고정 .evtx 파일과 고정 시각으로 확인하는 스크립트.
+
+benchmarks/fixtures/sample.evtx 를 감시 대상으로 하고, 윈도우 시계를 마지막 레코드 5분 뒤로 고정한 채
+주기를 세 번(+0, +6분, +2시간) 돌려 주기마다 윈도우별 오류 수를 기대값과 비교합니다.
+레코드 시각과 윈도우 시계의 기준(로컬 시각)이 어긋나면 UTC 와 다른 시간대에서 윈도우가 비거나
+만료되지 않으므로, 확인은 여러 시간대에서 실행합니다 (TZ 를 바꿀 수 있는 POSIX 에서만).
+
+사용 예:
+    python benchmarks/check_watch_mode.py   # 실패하면 종료 코드 1
+"""
+import calendar
+import datetime
+import logging
+import os
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+import src.main as main_module
+from benchmarks.check_evtx_reader import (CHECK_TIMEZONES, DEFAULT_FIXTURE, RECORD_COUNT, _local, _record_time,
+                                          _set_timezone, expected_events)
+from src.event_filter import parse_duration
+
+WATCH_WINDOWS = '10m,1h,24h'
+# 주기별 윈도우 시계 (마지막 레코드 기준 경과 시간)
+CYCLE_OFFSETS = (datetime.timedelta(minutes=5), datetime.timedelta(minutes=11), datetime.timedelta(hours=2, minutes=5))
+BUCKETS_PER_WINDOW = 60
+
+
+def _epoch(local_time):
+    """로컬 벽시계 시각의 epoch 초 (datetime_to_epoch 와 같은 기준)."""
+    return calendar.timegm(local_time.timetuple())
+
+def expected_window_counts(now):
+    """now(로컬 시각) 기준 윈도우별 오류 수. 윈도우는 구간 단위로 만료되므로 now 가 속한 구간부터 구간 수만큼 포함."""
+    epochs = [_epoch(event[1]) for event in expected_events()]
+    counts = {}
+    for name in WATCH_WINDOWS.split(','):
+        seconds = parse_duration(name)
+        bucket_seconds = max(1, -(-seconds // BUCKETS_PER_WINDOW))
+        oldest = _epoch(now) // bucket_seconds - (-(-seconds // bucket_seconds)) + 1
+        counts[name] = sum(1 for epoch in epochs if oldest <= epoch // bucket_seconds <= _epoch(now) // bucket_seconds)
+    return counts
+
+def run_watch(path):
+    """고정 시각으로 감시 주기를 돌려 주기별 {윈도우: 오류 수} 목록과 LLM 분석 요청 수를 반환합니다."""
+    newest = _record_time(RECORD_COUNT)
+    cycle_times = [_local(newest + offset) for offset in CYCLE_OFFSETS]
+    cycle = 0
+    statuses = []
+    reports = []
+
+    def sleep(_seconds):
+        nonlocal cycle
+        cycle += 1
+        if cycle == len(cycle_times):
+            raise KeyboardInterrupt
+
+    patches = {
+        'display_window_status': lambda rows: statuses.append({row['Window']: row['Errors'] for row in rows}),
+        '_report_recurring_errors': lambda *args, **kwargs: reports.append(args),
+        'display_progress': lambda *args, **kwargs: None,
+        'display_error': lambda *args, **kwargs: None,
+    }
+    originals = {name: getattr(main_module, name) for name in patches}
+    original_sleep = main_module.time.sleep
+    try:
+        for name, replacement in patches.items():
+            setattr(main_module, name, replacement)
+        main_module.time.sleep = sleep
+        main_module._run_watch([path], [], 1000, 1, 5, False, clock=lambda: cycle_times[cycle])
+    finally:
+        for name, original in originals.items():
+            setattr(main_module, name, original)
+        main_module.time.sleep = original_sleep
+    return cycle_times, statuses, len(reports)
+
+def run_checks(path):
+    """현재 시간대에서 감시 주기를 돌려 기대값과 비교하고 실패한 확인 이름 목록을 반환합니다."""
+    cycle_times, statuses, report_count = run_watch(path)
+    checks = [(f"cycle {i + 1} window counts (now {now:%H:%M:%S})", statuses[i] if i < len(statuses) else None,
+               expected_window_counts(now)) for i, now in enumerate(cycle_times)]
+    checks.append(('first cycle requests an analysis', report_count >= 1, True))
+    failures = []
+    for name, actual, expected in checks:
+        passed = actual == expected
+        print(f"{name:<50} {'ok' if passed else 'FAIL'}")
+        if not passed:
+            failures.append(name)
+            print(f"    expected: {expected}")
+            print(f"    actual:   {actual}")
+    return failures
+
+def main():
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('src').setLevel(logging.ERROR)
+    os.environ.update({'ANALYSIS_WATCH_WINDOWS': WATCH_WINDOWS, 'ANALYSIS_WATCH_INTERVAL_SECONDS': '0'})
+
+    failures = []
+    if hasattr(time, 'tzset'):
+        original = os.environ.get('TZ')
+        try:
+            for timezone in CHECK_TIMEZONES:
+                _set_timezone(timezone)
+                print(f"[TZ={timezone}]")
+                failures.extend(f"{name} (TZ={timezone})" for name in run_checks(DEFAULT_FIXTURE))
+        finally:
+            _set_timezone(original)
+    else:
+        failures = run_checks(DEFAULT_FIXTURE)
+    if failures:
+        print(f"{len(failures)} check(s) failed.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,391 @@
+"""
+합성 이벤트로 분석 파이프라인의 주요 함수를 측정하고 JSON 기준선과 비교하는 벤치마크.
+
+사용 예:
+    python benchmarks/run_benchmarks.py                      # 기준선과 비교 (느려지면 종료 코드 1)
+    python benchmarks/run_benchmarks.py --sizes 1000,1000000 # 측정할 이벤트 수 지정
+    python benchmarks/run_benchmarks.py --save-baseline      # 결과를 기준선으로 저장
+    python benchmarks/run_benchmarks.py --only import_main   # 시작 시간(import src.main)만 측정
+
+측정 시간은 같은 실행에서 잰 고정 보정 작업(_calibration_workload)의 시간으로 나눠 기준선과 비교하므로,
+기준선을 기록한 때와 기계 속도(클럭, 다른 작업의 부하)가 달라도 비율이 크게 흔들리지 않습니다.
+느려진 것으로 보이는 벤치마크는 --confirm 회까지 다시 측정해 가장 빠른 결과로 판정합니다.
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.insert(0, PROJECT_ROOT)
+
+from src.error_analyzer import find_recurring_errors, save_recurring_errors_to_json
+from src.event_log_processor import save_critical_logs_to_file
+from src.event_sources import EventRecord, SimulatedEventSource, iter_records
+from src.exporters import create_exporter, zstandard
+from src.prompt_builder import PromptBuilder
+from src.synthetic_events import SyntheticEventGenerator
+
+DEFAULT_BASELINE = os.path.join(PROJECT_ROOT, 'benchmarks', 'baseline.json')
+DEFAULT_SIZES = (10000, 100000)
+# 기준선 대비 최소 시간이 이 비율 이상 느려지면 회귀로 판단 (최소값이 중앙값보다 잡음에 덜 민감)
+DEFAULT_TOLERANCE = 0.5
+# 회귀로 보이는 벤치마크를 다시 측정하는 최대 횟수 (측정 중 일시적인 부하로 인한 오판 방지)
+DEFAULT_CONFIRM_RUNS = 2
+# 보정 작업은 벤치마크마다 이 횟수만큼 측정해 실행 전체의 최솟값을 사용
+CALIBRATION_ROUNDS = 3
+# 상세 데이터를 만드는 벤치마크(JSON 저장, 프롬프트)의 상위 오류 수
+DETAIL_TOP_N = 20
+# 시작 시 불러오지 않아야 하는 무거운 모듈 (필요한 경로에서만 불러옴)
+LAZY_MODULES = ('requests', 'rich', 'numpy', 'win32evtlog', 'sqlite3', 'multiprocessing')
+
+
+def _bench_find_recurring_errors(records, workdir):
+    return lambda: find_recurring_errors(records, top_n=DETAIL_TOP_N)
+
+def _bench_find_recurring_errors_compact(records, workdir):
+    compact_records = [EventRecord.from_dict(record) for record in records]
+    return lambda: find_recurring_errors(compact_records, top_n=DETAIL_TOP_N)
+
+def _bench_find_recurring_errors_templates(records, workdir):
+    return lambda: find_recurring_errors(records, top_n=DETAIL_TOP_N, group_by_template=True)
+
+def _bench_find_recurring_errors_trends(records, workdir):
+    return lambda: find_recurring_errors(records, top_n=DETAIL_TOP_N, group_by_template=True, trend_options={})
+
+def _bench_find_recurring_errors_near_duplicates(records, workdir):
+    return lambda: find_recurring_errors(records, top_n=DETAIL_TOP_N, near_duplicate_options={})
+
+def _bench_find_recurring_errors_correlation(records, workdir):
+    return lambda: find_recurring_errors(records, top_n=DETAIL_TOP_N, correlation_options={})
+
+def _bench_save_critical_logs(records, workdir):
+    filename = os.path.join(workdir, 'critical_errors.csv')
+    run = lambda: save_critical_logs_to_file(records, filename)
+    run.output_path = filename
+    return run
+
+def _bench_save_critical_logs_compact(records, workdir):
+    compact_records = [EventRecord.from_dict(record) for record in records]
+    filename = os.path.join(workdir, 'critical_errors.csv')
+    run = lambda: save_critical_logs_to_file(compact_records, filename)
+    run.output_path = filename
+    return run
+
+def _export_benchmark(export_format, compression=None):
+    """create_exporter 로 압축 레코드를 내보내는 벤치마크 준비 함수를 만듭니다 (출력 크기도 기록)."""
+    def prepare(records, workdir):
+        if compression == 'zstd' and zstandard is None:
+            return None # zstandard 미설치 시 건너뜀
+        compact_records = [EventRecord.from_dict(record) for record in records]
+        base_filename = os.path.join(workdir, f"export_{export_format}_{compression}")
+
+        def run():
+            with create_exporter(export_format, base_filename, compression=compression) as exporter:
+                for record in compact_records:
+                    exporter.write(record)
+            run.output_path = exporter.filename
+        return run
+    return prepare
+
+def _collect_benchmark(deferred):
+    """가상 소스 읽기 → 반복 오류 집계를 측정하는 준비 함수를 만듭니다 (메시지 포맷 호출 수도 기록)."""
+    def prepare(records, workdir):
+        def run():
+            source = SimulatedEventSource('System', len(records))
+            find_recurring_errors(iter_records([source], max_records=len(records), deferred=deferred), top_n=DETAIL_TOP_N)
+            run.format_calls = source.format_calls
+        return run
+    return prepare
+
+def _bench_save_recurring_errors_json(records, workdir):
+    _, details = find_recurring_errors(records, top_n=DETAIL_TOP_N, group_by_template=True, trend_options={})
+    filename = os.path.join(workdir, 'recurring_errors.json')
+    return lambda: save_recurring_errors_to_json(details, filename)
+
+def _bench_prompt_builder(records, workdir):
+    _, details = find_recurring_errors(records, top_n=DETAIL_TOP_N, group_by_template=True, trend_options={})
+    builder = PromptBuilder()
+    return lambda: builder.build(builder.prioritize(details))
+
+def _parse_importtime(output, module):
+    """
+    -X importtime 출력에서 module 의 누적 import 시간(초)과
+    module 이 직접 불러온 모듈별 누적 시간 [(이름, 초), ...] (느린 순) 을 반환합니다.
+    """
+    entries = [] # (깊이, 모듈 이름, 누적 마이크로초)
+    for line in output.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if not cumulative.strip().isdigit():
+            continue # 머리글 줄
+        entries.append(((len(name) - len(name.lstrip()) - 1) // 2, name.strip(), int(cumulative)))
+    for index, (level, name, cumulative) in enumerate(entries):
+        if name != module:
+            continue
+        children = []
+        for child_level, child_name, child_cumulative in reversed(entries[:index]):
+            if child_level <= level:
+                break
+            if child_level == level + 1:
+                children.append((child_name, child_cumulative / 1e6))
+        return cumulative / 1e6, sorted(children, key=lambda child: child[1], reverse=True)
+    raise ValueError(f"'{module}' not found in -X importtime output.")
+
+def _startup_benchmark(module):
+    """
+    새 인터프리터에서 module 을 import 하는 시간(인터프리터 시작 포함)을 측정하는 준비 함수를 만듭니다.
+    -X importtime 출력으로 module 자체의 누적 import 시간과 가장 느린 하위 모듈, 불러온 LAZY_MODULES 도 기록합니다.
+    """
+    def prepare(workdir):
+        code = (f"import {module}, sys; "
+                f"print(','.join(name for name in {LAZY_MODULES!r} if name in sys.modules))")
+
+        def run():
+            completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], cwd=PROJECT_ROOT,
+                                       capture_output=True, text=True, check=True)
+            import_seconds, children = _parse_importtime(completed.stderr, module)
+            if import_seconds < getattr(run, 'import_seconds', float('inf')):
+                run.import_seconds = import_seconds
+                run.slowest_imports = children[:5]
+            run.loaded_modules = [name for name in completed.stdout.strip().split(',') if name]
+        return run
+    return prepare
+
+# (이름, 준비 함수): 준비 함수는 측정할 호출(인자 없는 함수)을 반환하며(실행할 수 없으면 None), 준비 시간은 측정하지 않음
+BENCHMARKS = [
+    ('find_recurring_errors', _bench_find_recurring_errors),
+    ('find_recurring_errors_compact', _bench_find_recurring_errors_compact),
+    ('find_recurring_errors_templates', _bench_find_recurring_errors_templates),
+    ('find_recurring_errors_trends', _bench_find_recurring_errors_trends),
+    ('find_recurring_errors_near_duplicates', _bench_find_recurring_errors_near_duplicates),
+    ('find_recurring_errors_correlation', _bench_find_recurring_errors_correlation),
+    ('save_critical_logs_to_file', _bench_save_critical_logs),
+    ('save_critical_logs_to_file_compact', _bench_save_critical_logs_compact),
+    ('export_ndjson', _export_benchmark('ndjson', 'none')),
+    ('export_ndjson_gzip', _export_benchmark('ndjson', 'gzip')),
+    ('export_ndjson_zstd', _export_benchmark('ndjson', 'zstd')),
+    ('export_columnar', _export_benchmark('columnar')),
+    ('collect_simulated', _collect_benchmark(deferred=False)),
+    ('collect_simulated_deferred', _collect_benchmark(deferred=True)),
+    ('save_recurring_errors_to_json', _bench_save_recurring_errors_json),
+    ('prompt_builder', _bench_prompt_builder),
+]
+# 이벤트 수와 무관하게 한 번만 실행하는 시작 시간 벤치마크 (준비 함수는 작업 디렉토리만 받음)
+STARTUP_BENCHMARKS = [
+    ('import_main', _startup_benchmark('src.main')),
+]
+
+
+def _calibration_workload():
+    """기계 속도 보정용 고정 작업 (분석 코드와 비슷한 dict 집계, 문자열 포맷, 정렬)."""
+    counts = {}
+    labels = []
+    for i in range(20000):
+        key = ('Source', i % 97)
+        counts[key] = counts.get(key, 0) + 1
+        labels.append(f"{key[0]}-{i:08d}")
+    labels.sort(reverse=True)
+    return sorted(counts.items(), key=lambda item: item[1])
+
+def _measure(func, rounds, min_seconds, min_round_seconds=0.02):
+    """
+    func 를 최소 rounds 회, 총 min_seconds 초 이상 반복 측정해 호출 1회당 시간 목록을 반환합니다.
+    짧은 함수는 타이머 해상도와 잡음의 영향을 줄이도록 한 회차에서 min_round_seconds 이상 반복 호출합니다.
+    """
+    number = 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - t0 >= min_round_seconds or number >= 100000:
+            break
+        number *= 10
+    gc.collect()
+    timings = []
+    started = time.perf_counter()
+    while len(timings) < rounds or time.perf_counter() - started < min_seconds:
+        t0 = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - t0) / number)
+        if len(timings) >= rounds * 10:
+            break
+    return timings
+
+def run_benchmarks(sizes, selected=None, rounds=5, min_seconds=1.0, seed=0):
+    """
+    선택한 벤치마크를 이벤트 수별로(시작 시간 벤치마크는 한 번) 실행하고 {'이름[건수]' 또는 '이름': 결과} 를 반환합니다.
+    벤치마크마다 직전에 보정 작업을 측정하며, 실행 전체의 최소 보정 시간을 각 결과의 CalibrationSeconds 로 기록합니다.
+    """
+    results = {}
+    calibration = [float('inf')]
+
+    def measure(func):
+        calibration[0] = min(calibration[0], min(_measure(_calibration_workload, CALIBRATION_ROUNDS, 0)))
+        return _measure(func, rounds, min_seconds)
+
+    with tempfile.TemporaryDirectory(prefix='eventlog-bench-') as workdir:
+        for name, prepare in STARTUP_BENCHMARKS:
+            if selected and name not in selected:
+                continue
+            func = prepare(workdir)
+            timings = measure(func)
+            median = statistics.median(timings)
+            results[name] = {
+                'Rounds': len(timings),
+                'MinSeconds': round(min(timings), 6),
+                'MedianSeconds': round(median, 6),
+                'ImportSeconds': round(func.import_seconds, 6),
+                'SlowestImports': [[child, round(seconds, 6)] for child, seconds in func.slowest_imports],
+                'LazyModulesLoaded': func.loaded_modules
+            }
+            slowest = ', '.join(f"{child} {seconds * 1000:.1f} ms" for child, seconds in func.slowest_imports[:3])
+            print(f"{name:<50} median {median * 1000:10.2f} ms  min {min(timings) * 1000:10.2f} ms  "
+                  f"({len(timings)} rounds)  import {func.import_seconds * 1000:.1f} ms ({slowest})")
+            if func.loaded_modules:
+                print(f"{'':<50} warning: loaded at import time: {', '.join(func.loaded_modules)}")
+        for size in sizes:
+            records = SyntheticEventGenerator(seed=seed).generate_records(size)
+            for name, prepare in BENCHMARKS:
+                if selected and name not in selected:
+                    continue
+                key = f"{name}[{size}]"
+                func = prepare(records, workdir)
+                if func is None:
+                    print(f"{key:<50} (skipped)")
+                    continue
+                timings = measure(func)
+                median = statistics.median(timings)
+                results[key] = {
+                    'Events': size,
+                    'Rounds': len(timings),
+                    'MinSeconds': round(min(timings), 6),
+                    'MedianSeconds': round(median, 6),
+                    'EventsPerSecond': round(size / median, 1) if median > 0 else None
+                }
+                # 파일을 기록하는 벤치마크는 출력 크기도 비교
+                output_path = getattr(func, 'output_path', None)
+                size_text = ''
+                if output_path and os.path.exists(output_path):
+                    results[key]['OutputBytes'] = os.path.getsize(output_path)
+                    size_text = f"  {results[key]['OutputBytes'] / 1024 / 1024:8.2f} MB"
+                # 메시지 포맷 호출 수 (지연 포맷 비교용)
+                format_calls = getattr(func, 'format_calls', None)
+                if format_calls is not None:
+                    results[key]['FormatCalls'] = format_calls
+                    size_text += f"  {format_calls:,} format calls"
+                print(f"{key:<50} median {median * 1000:10.2f} ms  min {min(timings) * 1000:10.2f} ms  "
+                      f"({len(timings)} rounds){size_text}")
+    for result in results.values():
+        result['CalibrationSeconds'] = round(calibration[0], 6)
+    return results
+
+def _normalized_seconds(result):
+    """보정 작업 시간 대비 최소 시간 (보정값이 없는 이전 기준선은 최소 시간 그대로)."""
+    calibration = result.get('CalibrationSeconds')
+    return result['MinSeconds'] / calibration if calibration else result['MinSeconds']
+
+def _baseline_ratio(result, expected):
+    """기준선 대비 최소 시간 비율. 두 결과 모두 보정값이 있으면 기계 속도 차이를 보정한 비율입니다."""
+    if not expected['MinSeconds']:
+        return 1.0
+    if result.get('CalibrationSeconds') and expected.get('CalibrationSeconds'):
+        return _normalized_seconds(result) / _normalized_seconds(expected)
+    return result['MinSeconds'] / expected['MinSeconds']
+
+def compare_to_baseline(results, baseline, tolerance):
+    """기준선보다 (보정한) 최소 시간이 tolerance 비율 이상 느려진 벤치마크 목록을 반환합니다."""
+    regressions = []
+    for key, result in results.items():
+        expected = baseline.get('Benchmarks', {}).get(key)
+        if not expected:
+            print(f"{key:<50} (no baseline)")
+            continue
+        ratio = _baseline_ratio(result, expected)
+        status = 'REGRESSION' if ratio > 1 + tolerance else 'ok'
+        print(f"{key:<50} {ratio:6.2f}x baseline  {status}")
+        if status == 'REGRESSION':
+            regressions.append(key)
+    return regressions
+
+def _environment():
+    return {
+        'Python': platform.python_version(),
+        'Implementation': platform.python_implementation(),
+        'Machine': platform.machine(),
+        'System': platform.system()
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Event log analyzer benchmarks")
+    parser.add_argument('--sizes', default=','.join(str(size) for size in DEFAULT_SIZES),
+                        help="comma separated event counts (e.g. 1000,100000,10000000)")
+    parser.add_argument('--only', default='', help="comma separated benchmark names to run")
+    parser.add_argument('--rounds', type=int, default=5, help="minimum rounds per benchmark")
+    parser.add_argument('--min-seconds', type=float, default=1.0, help="minimum measuring time per benchmark")
+    parser.add_argument('--seed', type=int, default=0, help="synthetic event generator seed")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown ratio before a benchmark counts as a regression")
+    parser.add_argument('--confirm', type=int, default=DEFAULT_CONFIRM_RUNS,
+                        help="times to re-measure suspected regressions before reporting them")
+    parser.add_argument('--save-baseline', action='store_true', help="write the results to the baseline file")
+    args = parser.parse_args(argv)
+
+    # 측정 중 분석 모듈의 INFO 로그 출력 억제
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger('src').setLevel(logging.ERROR)
+
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+    selected = {name.strip() for name in args.only.split(',') if name.strip()}
+    results = run_benchmarks(sizes, selected, rounds=args.rounds, min_seconds=args.min_seconds, seed=args.seed)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        baseline.setdefault('Benchmarks', {}).update(results)
+        baseline['Environment'] = _environment()
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(baseline, f, indent=4, sort_keys=True)
+        print(f"Saved {len(results)} results to '{args.baseline}'.")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline file '{args.baseline}'. Run with --save-baseline to create one.")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('Environment') != _environment():
+        print("Warning: baseline was recorded in a different environment; ratios may not be comparable.")
+    regressions = compare_to_baseline(results, baseline, args.tolerance)
+    for attempt in range(args.confirm):
+        if not regressions:
+            break
+        print(f"Re-measuring {len(regressions)} suspected regression(s) ({attempt + 1}/{args.confirm}).")
+        retry = run_benchmarks(sorted({int(key[key.index('[') + 1:-1]) for key in regressions if '[' in key}),
+                               {key.split('[')[0] for key in regressions},
+                               rounds=args.rounds, min_seconds=args.min_seconds, seed=args.seed)
+        for key in regressions:
+            if key in retry and _normalized_seconds(retry[key]) < _normalized_seconds(results[key]):
+                results[key] = retry[key]
+        regressions = compare_to_baseline({key: results[key] for key in regressions}, baseline, args.tolerance)
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed by more than {args.tolerance:.0%}.")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
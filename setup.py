@@ -15,11 +15,12 @@ setup(
         'rich>=13.0.0',
         'python-dotenv>=1.0.0', # 추가
         'requests>=2.28.0',     # 추가
+        'numpy>=1.21.0',        # 급증/추세 분석
     ],
     entry_points={
         'console_scripts': [
-            # src 패키지 내 main 모듈의 run_analyzer 함수를 실행하는 명령어 'analyze-logs' 생성
-            'analyze-logs = main:run_analyzer',
+            # src 패키지 내 main 모듈의 main 함수(설정 로드 → 로깅 설정 → 분석 실행)를 실행하는 명령어 'analyze-logs' 생성
+            'analyze-logs = main:main',
         ],
     },
     author='[Your Name]', # !수정필요! 작성자 이름
@@ -0,0 +1,133 @@
+import logging
+import queue
+import threading
+import time
+
+from src.event_sources import DeferredEventRecord
+
+logger = logging.getLogger(__name__)
+
+# 대기할 수 있는 작업 수 상한. 가득 차면 제출하는 쪽이 기다리므로 기록이 계속 느려도 메모리 사용량이 제한됨
+DEFAULT_MAX_PENDING = 8
+# BackgroundExporter 가 기록 스레드로 한 번에 넘기는 레코드 수
+DEFAULT_BATCH_SIZE = 2048
+
+_STOP = object()
+
+
+class BackgroundWriter:
+    """
+    파일 기록 작업(함수 호출)을 크기가 제한된 큐로 받아 백그라운드 스레드 하나에서 제출 순서대로 실행합니다.
+    스레드는 첫 작업을 제출할 때 시작하며, close 는 남은 작업을 모두 실행한 뒤 반환합니다.
+    작업에서 예외가 발생하면 로깅하고 다음 작업을 계속 실행합니다.
+    큐가 가득 차 submit 이 기다린 시간은 wait_seconds 에 누적됩니다 (기록이 읽기보다 느린 정도).
+    """
+
+    def __init__(self, name='background-writer', max_pending=DEFAULT_MAX_PENDING):
+        self.name = name
+        self.wait_seconds = 0.0
+        self._queue = queue.Queue(maxsize=max(max_pending, 1))
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def submit(self, func, *args):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait((func, args))
+        except queue.Full:
+            started = time.perf_counter()
+            self._queue.put((func, args))
+            self.wait_seconds += time.perf_counter() - started
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            func, args = item
+            try:
+                func(*args)
+            except Exception as e:
+                logger.error(f"Background write failed in '{self.name}': {e}", exc_info=True)
+
+    def close(self):
+        """남은 작업을 모두 실행하고 스레드를 멈춥니다."""
+        if self._thread is None:
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        if self.wait_seconds >= 0.01:
+            logger.info(f"'{self.name}' queue was full for {self.wait_seconds:.2f}s (writing is slower than reading).")
+
+
+class BackgroundExporter:
+    """
+    exporter(create_exporter 결과)를 감싸 레코드를 batch_size 건씩 BackgroundWriter 스레드에서 기록합니다.
+    CriticalLogCsvWriter 와 같은 인터페이스(write, passthrough, close, count, bytes_written)를 제공하므로
+    단일 패스 파이프라인의 읽기/집계가 파일 기록을 기다리지 않으며, 메모리에는 최대
+    (max_pending + 2) × batch_size 건의 레코드만 보관합니다. bytes_written 은 close 이후에 유효합니다.
+    metrics(PipelineMetrics) 가 주어지면 기록 스레드의 기록 시간을 'export_write' 로 기록합니다.
+    지연 포맷 레코드(DeferredEventRecord)는 기록 스레드로 넘기기 전에 호출한 스레드에서 메시지를 포맷합니다.
+    지연 포맷은 스레드 안전하지 않으므로, 기록 스레드와 집계가 같은 레코드를 동시에 포맷하지 않게 하기 위함입니다.
+    """
+
+    def __init__(self, exporter, batch_size=DEFAULT_BATCH_SIZE, max_pending=DEFAULT_MAX_PENDING, metrics=None):
+        self.exporter = exporter
+        self.metrics = metrics
+        self.filename = getattr(exporter, 'filename', None)
+        self.batch_size = batch_size
+        self.count = 0 # 전달받은 레코드 수
+        self._batch = []
+        self._writer = BackgroundWriter('export-writer', max_pending=max_pending)
+
+    @property
+    def bytes_written(self):
+        return self.exporter.bytes_written
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write(self, record):
+        if type(record) is DeferredEventRecord and not record.formatted:
+            record.message # 기록 스레드에서는 포맷된 메시지를 읽기만 함
+        self.count += 1
+        self._batch.append(record)
+        if len(self._batch) >= self.batch_size:
+            self._writer.submit(self._write_batch, self._batch)
+            self._batch = []
+
+    def passthrough(self, records):
+        """레코드를 기록 스레드로 넘기면서 그대로 다시 내보냅니다 (단일 패스 파이프라인용)."""
+        for record in records:
+            self.write(record)
+            yield record
+
+    def _write_batch(self, batch):
+        write = self.exporter.write
+        if self.metrics is None:
+            for record in batch:
+                write(record)
+            return
+        with self.metrics.stage('export_write', items=len(batch)):
+            for record in batch:
+                write(record)
+
+    def close(self):
+        if self._batch:
+            self._writer.submit(self._write_batch, self._batch)
+            self._batch = []
+        self._writer.submit(self.exporter.close)
+        self._writer.close()
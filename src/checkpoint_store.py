@@ -0,0 +1,57 @@
+import json
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# 상태 파일 형식 버전 (형식이 바뀌면 이전 상태는 무시하고 처음부터 수집)
+CHECKPOINT_VERSION = 1
+
+class CheckpointStore:
+    """
+    증분 수집 상태를 JSON 파일로 보관합니다.
+    - bookmarks: 로그(채널) 또는 파일별 마지막으로 처리한 레코드 번호와 시각
+    - aggregate: 지금까지 누적된 반복 오류 집계 (RecurringErrorAggregator.to_dict)
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.bookmarks = {}
+        self.aggregate = None
+
+    def load(self):
+        """저장된 상태를 읽습니다. 파일이 없거나 손상된 경우 빈 상태로 시작합니다."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.info(f"No checkpoint found at '{self.path}'. Starting a full collection.")
+            return self
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load checkpoint '{self.path}': {e}. Starting a full collection.")
+            return self
+
+        if data.get('version') != CHECKPOINT_VERSION:
+            logger.warning(f"Checkpoint '{self.path}' has an unsupported version. Starting a full collection.")
+            return self
+
+        self.bookmarks = data.get('bookmarks') or {}
+        self.aggregate = data.get('aggregate')
+        logger.info(f"Loaded checkpoint '{self.path}' with {len(self.bookmarks)} bookmarks.")
+        return self
+
+    def save(self):
+        """상태를 임시 파일에 쓴 뒤 교체하여, 저장 도중 중단되어도 이전 상태가 보존되도록 합니다."""
+        temp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': CHECKPOINT_VERSION,
+                    'bookmarks': self.bookmarks,
+                    'aggregate': self.aggregate
+                }, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            logger.info(f"Saved checkpoint to '{self.path}'.")
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to save checkpoint '{self.path}': {e}", exc_info=True)
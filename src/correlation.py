@@ -0,0 +1,243 @@
+import collections
+import heapq
+import math
+
+# 뒤따르는 오류로 볼 시간 범위(초)
+DEFAULT_WINDOW_SECONDS = 300
+# 근사 빈도를 유지할 오류 쌍 / 순서(오류 3개) 수
+DEFAULT_MAX_PAIRS = 10000
+DEFAULT_MAX_SEQUENCES = 10000
+# 이벤트 하나당 짝지을 뒤따르는 오류 종류 수(가까운 순)와, 그중 순서를 만들 때 쓸 종류 수(지금까지 쌍 횟수가 많은 순)
+DEFAULT_MAX_FANOUT = 32
+DEFAULT_SEQUENCE_FANOUT = 4
+# 시간 범위 안에 보관하는 최대 이벤트 수 (오류 폭주 시 메모리 제한)
+DEFAULT_MAX_WINDOW_EVENTS = 10000
+# 결과에 포함할 최소 동시 발생 횟수(근사 오차를 뺀 하한 기준)와 최소 향상도
+MIN_CORRELATION_COUNT = 3
+MIN_CORRELATION_LIFT = 2.0
+
+
+class SpaceSavingCounter:
+    """
+    Space-Saving 알고리즘으로 최대 capacity 개 키의 빈도를 근사합니다.
+    가득 찬 상태에서 새 키가 오면 가장 작은 빈도의 키를 내보내고 그 빈도를 오차로 물려받으므로,
+    실제 빈도는 (count - error) 이상 count 이하이며 자주 나오는 키는 유지됩니다.
+    최솟값은 갱신을 미루는 힙으로 찾습니다 (증가할 때는 힙을 건드리지 않고, 내보낼 때 오래된 항목만 고침).
+    """
+
+    def __init__(self, capacity):
+        self.capacity = max(capacity, 1)
+        self._counts = {} # 키 -> [count, error]
+        self._heap = [] # (count, 키), count 는 실제보다 작을 수 있음
+
+    def __len__(self):
+        return len(self._counts)
+
+    def add(self, key, count=1):
+        entry = self._counts.get(key)
+        if entry is not None:
+            entry[0] += count
+            return
+        error = self._evict() if len(self._counts) >= self.capacity else 0
+        self._counts[key] = [error + count, error]
+        heapq.heappush(self._heap, (error + count, key))
+
+    def _evict(self):
+        """빈도가 가장 작은 키를 내보내고 그 빈도를 반환합니다."""
+        heap, counts = self._heap, self._counts
+        while True:
+            count, key = heapq.heappop(heap)
+            entry = counts[key]
+            if entry[0] != count:
+                heapq.heappush(heap, (entry[0], key))
+                continue
+            del counts[key]
+            return count
+
+    def get(self, key):
+        entry = self._counts.get(key)
+        return entry[0] if entry is not None else 0
+
+    def items(self):
+        """(키, count, error) 를 반환합니다."""
+        for key, (count, error) in self._counts.items():
+            yield key, count, error
+
+    def merge(self, other):
+        for key, count, _ in other.items():
+            self.add(key, count)
+        return self
+
+
+class ErrorCorrelator:
+    """
+    시간순으로 정렬된 오류 스트림 한 번의 순회로 "A 이후 window_seconds 안에 B 가 발생" 하는 오류 쌍과
+    "A 이후 B, 그다음 C" 순서의 동시 발생 횟수를 셉니다.
+    get_critical_errors 처럼 최신순 스트림을 받으며, 시간 범위 안의 최근 이벤트만 덱에 보관하고
+    이벤트마다 범위 안의 서로 다른 오류 종류(가까운 순 max_fanout 개)와 짝지어 SpaceSavingCounter(희소 행렬)에 더하고,
+    그중 지금까지 함께 발생한 횟수가 많은 sequence_fanout 개로 발생 순서대로 3개짜리 순서를 만듭니다
+    (연관이 없는 잦은 오류가 순서 후보를 밀어내지 않도록 함).
+    한 이벤트에 대해 같은 뒤따르는 오류는 한 번만 세므로 신뢰도(Confidence)는 1 을 넘지 않습니다.
+    시각이 window_seconds 넘게 거꾸로 뛰면(소스를 차례로 읽을 때 다음 소스의 시작) 범위를 비우고 새로 시작합니다.
+    메모리는 오류 종류 수, max_window_events, max_pairs, max_sequences 로 제한됩니다.
+    """
+
+    def __init__(self, window_seconds=DEFAULT_WINDOW_SECONDS, max_pairs=DEFAULT_MAX_PAIRS,
+                 max_sequences=DEFAULT_MAX_SEQUENCES, max_fanout=DEFAULT_MAX_FANOUT,
+                 sequence_fanout=DEFAULT_SEQUENCE_FANOUT, max_window_events=DEFAULT_MAX_WINDOW_EVENTS):
+        self.window_seconds = window_seconds
+        self.max_fanout = max_fanout
+        self.sequence_fanout = sequence_fanout
+        self.max_window_events = max(max_window_events, 1)
+        self.keys = [] # 정수 코드 -> 식별자
+        self._codes = {} # 식별자 -> 정수 코드
+        self.occurrences = [] # 정수 코드 -> 발생 횟수
+        self.total_count = 0
+        self.first_epoch = None
+        self.last_epoch = None
+        self.pairs = SpaceSavingCounter(max_pairs) # (A, B) -> A 이후 B 가 발생한 횟수
+        self.sequences = SpaceSavingCounter(max_sequences) # (A, B, C) -> A 이후 B, C 순서로 발생한 횟수
+        self._window = collections.deque() # (epoch, 코드), 왼쪽일수록 이른 시각 (최신순 스트림이므로 왼쪽에 추가)
+        self._window_counts = {} # 코드 -> 범위 안의 이벤트 수
+        self._window_first = {} # 코드 -> 범위 안에서 가장 이른 발생 시각
+        self._previous_epoch = None
+
+    def _code_for(self, identifier):
+        code = self._codes.get(identifier)
+        if code is None:
+            code = self._codes[identifier] = len(self.keys)
+            self.keys.append(identifier)
+            self.occurrences.append(0)
+        return code
+
+    def _reset_window(self):
+        self._window.clear()
+        self._window_counts.clear()
+        self._window_first.clear()
+
+    def add(self, identifier, epoch):
+        """epoch 초 시각의 오류 하나를 추가합니다 (최신순으로 호출)."""
+        code = self._code_for(identifier)
+        self.occurrences[code] += 1
+        self.total_count += 1
+        if self.first_epoch is None or epoch < self.first_epoch:
+            self.first_epoch = epoch
+        if self.last_epoch is None or epoch > self.last_epoch:
+            self.last_epoch = epoch
+
+        previous = self._previous_epoch
+        if previous is not None and epoch > previous:
+            if epoch - previous > self.window_seconds:
+                self._reset_window()
+            else:
+                epoch = previous # 작은 역전은 직전 시각으로 봄
+        self._previous_epoch = epoch
+
+        window, window_counts, window_first = self._window, self._window_counts, self._window_first
+        limit = epoch + self.window_seconds
+        while window and (window[-1][0] > limit or len(window) >= self.max_window_events):
+            _, old_code = window.pop()
+            remaining = window_counts[old_code] - 1
+            if remaining:
+                window_counts[old_code] = remaining
+            else:
+                del window_counts[old_code]
+                del window_first[old_code]
+
+        if window_counts:
+            followers = [other for other in window_counts if other != code]
+            if len(followers) > self.max_fanout:
+                followers = heapq.nsmallest(self.max_fanout, followers, key=window_first.__getitem__)
+            else:
+                followers.sort(key=window_first.__getitem__)
+            pairs = self.pairs
+            for follower in followers:
+                pairs.add((code, follower))
+            first = followers
+            if len(followers) > self.sequence_fanout:
+                counts = [pairs.get((code, follower)) for follower in followers]
+                cutoff = sorted(counts, reverse=True)[self.sequence_fanout - 1]
+                first = [follower for follower, count in zip(followers, counts) if count >= cutoff][:self.sequence_fanout]
+            if len(first) > 1:
+                sequences_add = self.sequences.add
+                for i, second in enumerate(first):
+                    for third in first[i + 1:]:
+                        sequences_add((code, second, third))
+
+        window.appendleft((epoch, code))
+        window_counts[code] = window_counts.get(code, 0) + 1
+        window_first[code] = epoch
+
+    def merge(self, other):
+        """다른 상관 분석 결과의 횟수를 합칩니다 (두 스트림 사이의 쌍은 세지 않음)."""
+        remap = [self._code_for(identifier) for identifier in other.keys]
+        for other_code, count in enumerate(other.occurrences):
+            self.occurrences[remap[other_code]] += count
+        self.total_count += other.total_count
+        for epoch in (other.first_epoch, other.last_epoch):
+            if epoch is not None:
+                self.first_epoch = epoch if self.first_epoch is None else min(self.first_epoch, epoch)
+                self.last_epoch = epoch if self.last_epoch is None else max(self.last_epoch, epoch)
+        for counter, other_counter in ((self.pairs, other.pairs), (self.sequences, other.sequences)):
+            for key, count, _ in other_counter.items():
+                counter.add(tuple(remap[code] for code in key), count)
+        return self
+
+    # --- 결과 ---
+    def _window_probability(self, code):
+        """오류가 임의의 window_seconds 구간에 한 번 이상 발생할 확률 (분석 기간의 평균 발생률, 포아송 가정)."""
+        span = max(self.last_epoch - self.first_epoch, self.window_seconds)
+        return 1.0 - math.exp(-self.occurrences[code] / span * self.window_seconds)
+
+    def _describe(self, key, count):
+        """
+        쌍(A, B)의 기대 비율은 B 가 임의의 구간에 발생할 확률, 순서(A, B, C)는 A 이후 B 가 뒤따른 비율 × C 의 발생 확률이므로
+        순서의 향상도는 A → B 가 일어났을 때 C 가 평소보다 얼마나 더 이어지는지를 나타냅니다.
+        """
+        antecedent = key[0]
+        occurrences = self.occurrences[antecedent]
+        expected = self._window_probability(key[-1])
+        if len(key) > 2:
+            prefix = self.pairs.get(key[:2])
+            expected *= prefix / occurrences if prefix else self._window_probability(key[1])
+        confidence = count / occurrences
+        return {
+            'Count': count,
+            'Support': round(count / self.total_count, 6),
+            'Confidence': round(confidence, 4),
+            'Lift': round(confidence / expected, 2) if expected else None
+        }
+
+    def _related(self, counter, identifier, top_n, min_count, min_lift):
+        code = self._codes.get(identifier)
+        if code is None:
+            return []
+        candidates = []
+        for key, count, error in counter.items():
+            if key[0] != code or count - error < min_count:
+                continue
+            stats = self._describe(key, count)
+            if stats['Lift'] is None or stats['Lift'] >= min_lift:
+                candidates.append((key, stats))
+        return heapq.nlargest(top_n, candidates, key=lambda item: (item[1]['Lift'] or 0.0, item[1]['Count']))
+
+    def _identity(self, code):
+        identifier = self.keys[code]
+        identity = {'Source': identifier[0], 'EventID': identifier[1]}
+        if len(identifier) > 2:
+            identity['TemplateID'] = identifier[2]
+        return identity
+
+    def followers(self, identifier, top_n=5, min_count=MIN_CORRELATION_COUNT, min_lift=MIN_CORRELATION_LIFT):
+        """
+        identifier 이후 window_seconds 안에 자주 발생한 오류를 향상도(Lift) 순으로 반환합니다.
+        Support 는 전체 오류 대비 동시 발생 비율, Confidence 는 identifier 발생 중 뒤따른 비율,
+        Lift 는 Confidence 를 그 오류가 임의의 같은 길이 구간에 발생할 확률로 나눈 값입니다.
+        """
+        return [dict(self._identity(key[1]), **stats)
+                for key, stats in self._related(self.pairs, identifier, top_n, min_count, min_lift)]
+
+    def sequences_from(self, identifier, top_n=3, min_count=MIN_CORRELATION_COUNT, min_lift=MIN_CORRELATION_LIFT):
+        """identifier 로 시작해 window_seconds 안에 이어진 오류 순서(오류 3개)를 향상도 순으로 반환합니다."""
+        return [dict(stats, Sequence=[self._identity(code) for code in key])
+                for key, stats in self._related(self.sequences, identifier, top_n, min_count, min_lift)]
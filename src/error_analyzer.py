@@ -1,64 +1,581 @@
-from collections import Counter
+import datetime
+import heapq
+import importlib.util
 import json
 import os
 import logging
 
+from src.correlation import ErrorCorrelator
+from src.event_sources import DeferredEventRecord, EventRecord, datetime_to_epoch, format_epoch
+from src.log_template_miner import LogTemplateMiner
+from src.near_duplicates import NearDuplicateClusterer
+
 logger = logging.getLogger(__name__)
 
-def find_recurring_errors(logs, top_n=5):
+# numpy 는 시계열 배열을 처음 만들 때 _load_numpy 로 불러옴 (오류가 없는 실행은 불러오지 않음).
+# numpy 가 없으면 시계열(급증/추세) 분석 단계만 비활성화
+np = None
+
+def _numpy_available():
+    return np is not None or importlib.util.find_spec('numpy') is not None
+
+def _load_numpy():
+    """numpy 를 불러와 반환합니다 (설치되어 있지 않으면 None)."""
+    global np
+    if np is None and _numpy_available():
+        import numpy
+        np = numpy
+    return np
+
+# 타임스탬프 문자열을 NumPy 배열로 일괄 변환하는 단위
+TIMELINE_CHUNK_SIZE = 65536
+# 급증 판단에 필요한 최소 이전 구간 수
+MIN_BURST_HISTORY = 3
+# 상세 데이터에 넣는 오류별 유사 메시지 군집 수
+MESSAGE_CLUSTERS_PER_ERROR = 5
+# 상세 데이터에 넣는 오류별 뒤따르는 오류 / 오류 순서 수
+CORRELATIONS_PER_ERROR = 5
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+def _to_epoch(timestamp):
+    """'YYYY-mm-dd HH:MM:SS' 문자열 또는 epoch 초 int 를 epoch 초로 변환합니다 (해석할 수 없으면 0)."""
+    if type(timestamp) is int:
+        return timestamp
+    try:
+        return datetime_to_epoch(datetime.datetime.fromisoformat(timestamp))
+    except (TypeError, ValueError):
+        return 0
+
+def _timestamp_property(slot):
+    """시각 슬롯을 항상 'YYYY-mm-dd HH:MM:SS' 문자열로 읽고 쓰는 속성."""
+    def getter(self):
+        value = getattr(self, slot)
+        return format_epoch(value) if type(value) is int else value
+
+    def setter(self, value):
+        setattr(self, slot, None if value is None else self._coerce(value))
+    return property(getter, setter)
+
+
+class ErrorStats:
     """
-    로그 목록에서 가장 빈번하게 발생하는 오류를 찾아 요약 텍스트와 상세 데이터를 반환합니다.
-    향후 개선: 단순 Source/EventID 외에 메시지 패턴 분석, 시간대별 군집화 등 심화 분석 가능.
+    (Source, EventID[, 템플릿 ID]) 하나에 대한 누적 통계.
+    시각은 들어온 형식(문자열 또는 압축 레코드의 epoch 초 int) 그대로 비교/보관하고
+    first/last/sample_timestamp 속성으로 읽을 때만 문자열로 변환합니다 (형식이 섞이면 epoch 초로 통일).
+    샘플 메시지 대신 지연 포맷 레코드(DeferredEventRecord)를 받으면 sample_message 를 읽을 때 그 레코드만 포맷합니다.
     """
-    if not logs:
-        logger.warning("No error logs provided for analysis.")
-        return "No errors found to analyze.", []
+    __slots__ = ('count', '_sample_message', '_sample', '_first', '_last', '_kind', 'log_type_counts', 'template')
+
+    sample_timestamp = _timestamp_property('_sample')
+    first_timestamp = _timestamp_property('_first')
+    last_timestamp = _timestamp_property('_last')
+
+    def __init__(self):
+        self.count = 0
+        self._sample_message = None
+        self._sample = None
+        self._first = None
+        self._last = None
+        self._kind = None # 보관 중인 시각 형식 (str 또는 int)
+        self.log_type_counts = {}
+        self.template = None # 템플릿 기준 그룹핑 시 메시지 템플릿
+
+    @property
+    def sample_message(self):
+        message = self._sample_message
+        if type(message) is DeferredEventRecord:
+            message = self._sample_message = message.message
+        return message
+
+    @sample_message.setter
+    def sample_message(self, value):
+        self._sample_message = value
+
+    def _coerce(self, timestamp):
+        """보관 중인 시각과 형식이 다르면 모두 epoch 초로 맞추고, 비교 가능한 값을 반환합니다."""
+        if type(timestamp) is self._kind:
+            return timestamp
+        if self._kind is None:
+            self._kind = type(timestamp)
+            return timestamp
+        if self._kind is not int:
+            self._sample, self._first, self._last = (
+                None if value is None else _to_epoch(value) for value in (self._sample, self._first, self._last))
+            self._kind = int
+        return _to_epoch(timestamp)
+
+    def add(self, log):
+        self.add_event(log.get('Timestamp') or '', log.get('Message', ''), log.get('LogType', 'Unknown'))
+
+    def add_event(self, timestamp, message, log_type):
+        """timestamp 는 'YYYY-mm-dd HH:MM:SS' 문자열 또는 epoch 초 int, message 는 문자열 또는 DeferredEventRecord."""
+        self.count += 1
+        if type(timestamp) is not self._kind:
+            timestamp = self._coerce(timestamp)
+        # 문자열은 'YYYY-mm-dd HH:MM:SS' 형식이므로 문자열 비교로 시간 순서를 판단
+        if self._first is None or timestamp < self._first:
+            self._first = timestamp
+        if self._last is None or timestamp > self._last:
+            self._last = timestamp
+        # 가장 최근 메시지를 샘플로 유지 (같은 시각이면 먼저 본 메시지 유지)
+        if self._sample is None or timestamp > self._sample:
+            self._sample = timestamp
+            self._sample_message = message
+        self.log_type_counts[log_type] = self.log_type_counts.get(log_type, 0) + 1
+
+    def to_dict(self):
+        return {
+            'Count': self.count,
+            'SampleMessage': self.sample_message,
+            'SampleTimestamp': self.sample_timestamp,
+            'FirstSeen': self.first_timestamp,
+            'LastSeen': self.last_timestamp,
+            'LogTypeCounts': dict(self.log_type_counts),
+            'Template': self.template
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.count = data.get('Count', 0)
+        stats.sample_message = data.get('SampleMessage')
+        stats.sample_timestamp = data.get('SampleTimestamp')
+        stats.first_timestamp = data.get('FirstSeen')
+        stats.last_timestamp = data.get('LastSeen')
+        stats.log_type_counts = dict(data.get('LogTypeCounts') or {})
+        stats.template = data.get('Template')
+        return stats
+
+    def merge(self, other):
+        self.count += other.count
+        if other._first is not None:
+            first = self._coerce(other._first)
+            if self._first is None or first < self._first:
+                self._first = first
+        if other._last is not None:
+            last = self._coerce(other._last)
+            if self._last is None or last > self._last:
+                self._last = last
+        if other._sample is not None:
+            sample = self._coerce(other._sample)
+            if self._sample is None or sample > self._sample:
+                self._sample = sample
+                self._sample_message = other._sample_message
+        for log_type, count in other.log_type_counts.items():
+            self.log_type_counts[log_type] = self.log_type_counts.get(log_type, 0) + count
+        if other.template is not None:
+            self.template = other.template
+
+
+def _parse_timestamps(timestamps):
+    """'YYYY-mm-dd HH:MM:SS' 문자열(또는 epoch 초 int) 목록을 epoch 초 int64 배열로 한 번에 변환합니다 (해석할 수 없는 값은 NaT)."""
+    try:
+        return np.array(timestamps, dtype='datetime64[s]').astype(np.int64)
+    except (ValueError, TypeError):
+        # 형식이 다른 값이 섞인 경우에만 개별 변환
+        return np.array([_parse_timestamp(timestamp) for timestamp in timestamps],
+                        dtype='datetime64[s]').astype(np.int64)
+
+def _parse_timestamp(timestamp):
+    try:
+        return np.datetime64(timestamp, 's')
+    except (ValueError, TypeError):
+        return np.datetime64('NaT', 's')
+
+def _format_epoch(epoch):
+    return (_EPOCH + datetime.timedelta(seconds=int(epoch))).strftime('%Y-%m-%d %H:%M:%S')
+
+
+class ErrorTimeline:
+    """
+    식별자별 오류 발생 시각을 모아 두는 시계열 버퍼 (급증/추세 분석용).
+    타임스탬프 문자열은 TIMELINE_CHUNK_SIZE 건씩 모아 NumPy int64(epoch 초) 배열로 한 번에 변환하므로
+    이벤트당 비용은 리스트 추가뿐이고, 변환된 이벤트는 건당 12바이트만 차지합니다.
+    """
+
+    def __init__(self):
+        if not _numpy_available():
+            raise ImportError("numpy is required for time-series analysis.")
+        self.keys = [] # 정수 코드 -> 식별자
+        self._codes = {} # 식별자 -> 정수 코드
+        self._pending_timestamps = []
+        self._pending_codes = []
+        self._timestamp_chunks = []
+        self._code_chunks = []
+
+    def __len__(self):
+        return sum(len(chunk) for chunk in self._code_chunks) + len(self._pending_codes)
+
+    def code(self, identifier):
+        """식별자의 정수 코드 (한 번도 추가되지 않았으면 None)."""
+        return self._codes.get(identifier)
+
+    def _code_for(self, identifier):
+        code = self._codes.get(identifier)
+        if code is None:
+            code = self._codes[identifier] = len(self.keys)
+            self.keys.append(identifier)
+        return code
+
+    def add(self, identifier, timestamp):
+        """timestamp 는 'YYYY-mm-dd HH:MM:SS' 문자열 또는 epoch 초 int."""
+        self._pending_timestamps.append(timestamp)
+        self._pending_codes.append(self._code_for(identifier))
+        if len(self._pending_codes) >= TIMELINE_CHUNK_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if not self._pending_codes:
+            return
+        _load_numpy()
+        timestamps = _parse_timestamps(self._pending_timestamps)
+        codes = np.array(self._pending_codes, dtype=np.int32)
+        valid = timestamps != np.iinfo(np.int64).min # NaT
+        self._timestamp_chunks.append(timestamps[valid])
+        self._code_chunks.append(codes[valid])
+        self._pending_timestamps = []
+        self._pending_codes = []
 
-    logger.info(f"Analyzing {len(logs)} error logs to find top {top_n} recurring errors...")
-    # 오류 식별자: (Source, EventID) 사용
-    error_identifiers = [(log.get('Source', 'Unknown'), log.get('EventID', 0)) for log in logs]
+    def arrays(self):
+        """(epoch 초 int64 배열, 식별자 코드 int32 배열) 을 반환합니다."""
+        self._flush()
+        if not self._code_chunks:
+            _load_numpy()
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+        if len(self._code_chunks) > 1:
+            self._timestamp_chunks = [np.concatenate(self._timestamp_chunks)]
+            self._code_chunks = [np.concatenate(self._code_chunks)]
+        return self._timestamp_chunks[0], self._code_chunks[0]
 
-    if not error_identifiers:
-         logger.warning("Could not extract error identifiers from logs.")
-         return "Could not identify errors.", []
+    def merge(self, other):
+        """다른 시계열의 이벤트를 합칩니다 (식별자 코드는 이 시계열 기준으로 다시 매김)."""
+        timestamps, codes = other.arrays()
+        if not len(codes):
+            return self
+        remap = np.array([self._code_for(identifier) for identifier in other.keys], dtype=np.int32)
+        self._flush()
+        self._timestamp_chunks.append(timestamps.copy())
+        self._code_chunks.append(remap[codes])
+        return self
 
+
+class RecurringErrorAggregator:
+    """
+    오류 레코드를 한 번의 순회로 (Source, EventID) 별로 집계합니다.
+    add/update 로 레코드나 배치를 도착하는 대로 점진적으로 추가할 수 있습니다.
+    template_miner 가 주어지면 메시지 템플릿 ID 까지 포함한 (Source, EventID, 템플릿 ID) 로 그룹핑하여,
+    같은 ID 를 공유하는 서로 다른 오류를 구분합니다 (병합은 같은 miner 를 공유하는 집계기끼리만 의미가 있음).
+    timeline(ErrorTimeline) 이 주어지면 급증/추세 분석을 위해 식별자별 발생 시각도 기록합니다
+    (시계열은 용량이 크므로 to_dict 상태에는 포함하지 않음).
+    near_duplicates(NearDuplicateClusterer) 가 주어지면 식별자별로 거의 같은 메시지를 군집화합니다
+    (모든 메시지가 필요하므로 지연 포맷 레코드도 포맷되며, 시계열처럼 to_dict 상태에는 포함하지 않음).
+    correlation(ErrorCorrelator) 이 주어지면 레코드 순서(최신순)대로 오류 간 동시 발생을 셉니다 (to_dict 상태에는 포함하지 않음).
+    """
+
+    def __init__(self, template_miner=None, timeline=None, near_duplicates=None, correlation=None):
+        self.total_count = 0
+        self.stats = {} # (Source, EventID[, 템플릿 ID]) -> ErrorStats
+        self.template_miner = template_miner
+        self.timeline = timeline
+        self.near_duplicates = near_duplicates
+        self.correlation = correlation
+
+    def add(self, log, cluster=None):
+        """레코드 한 건을 추가합니다. cluster(LogCluster) 가 주어지면 템플릿 추출 대신 그 군집으로 그룹핑합니다."""
+        record_type = type(log)
+        if record_type is EventRecord:
+            # 압축 레코드는 속성으로 바로 읽고, 시계열에는 epoch 초를 그대로 전달
+            source, event_id, message, log_type = log.source, log.event_id, log.message, log.log_type
+            timestamp = timeline_value = log.epoch
+        elif record_type is DeferredEventRecord:
+            # 지연 포맷 레코드는 메시지 대신 레코드를 샘플 후보로 넘겨, 샘플로 남은 레코드만 나중에 포맷
+            source, event_id, message, log_type = log.source, log.event_id, log, log.log_type
+            timestamp = timeline_value = log.epoch
+        else:
+            source, event_id = log.get('Source', 'Unknown'), log.get('EventID', 0)
+            message, log_type = log.get('Message', ''), log.get('LogType', 'Unknown')
+            timestamp = timeline_value = log.get('Timestamp')
+        if cluster is None and self.template_miner is not None:
+            cluster = self.template_miner.add_message((log.message if record_type is DeferredEventRecord else message) or '')
+        if cluster is not None:
+            identifier = (source, event_id, cluster.cluster_id)
+        else:
+            identifier = (source, event_id)
+        stats = self.stats.get(identifier)
+        if stats is None:
+            stats = self.stats[identifier] = ErrorStats()
+        stats.add_event('' if timestamp is None else timestamp, message, log_type)
+        if cluster is not None:
+            stats.template = cluster.template
+        if self.timeline is not None:
+            self.timeline.add(identifier, timeline_value)
+        if self.near_duplicates is not None:
+            self.near_duplicates.add(identifier, (log.message if record_type is DeferredEventRecord else message) or '')
+        if self.correlation is not None:
+            self.correlation.add(identifier, _to_epoch(timestamp))
+        self.total_count += 1
+
+    def update(self, logs):
+        """레코드 배치(또는 스트림)를 추가합니다."""
+        for log in logs:
+            self.add(log)
+        return self
+
+    def merge(self, other):
+        """다른 집계기의 결과를 합칩니다."""
+        for identifier, other_stats in other.stats.items():
+            stats = self.stats.get(identifier)
+            if stats is None:
+                stats = self.stats[identifier] = ErrorStats()
+            stats.merge(other_stats)
+        if self.timeline is not None and other.timeline is not None:
+            self.timeline.merge(other.timeline)
+        if self.near_duplicates is not None and other.near_duplicates is not None:
+            self.near_duplicates.merge(other.near_duplicates)
+        if self.correlation is not None and other.correlation is not None:
+            self.correlation.merge(other.correlation)
+        self.total_count += other.total_count
+        return self
+
+    def to_dict(self):
+        """JSON 으로 저장할 수 있는 형태로 변환합니다 (증분 분석 상태 저장용)."""
+        errors = []
+        for identifier, stats in self.stats.items():
+            entry = dict(stats.to_dict(), Source=identifier[0], EventID=identifier[1])
+            if len(identifier) > 2:
+                entry['TemplateID'] = identifier[2]
+            errors.append(entry)
+        data = {'TotalCount': self.total_count, 'Errors': errors}
+        if self.template_miner is not None:
+            data['TemplateMiner'] = self.template_miner.to_dict()
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        template_miner = None
+        if data.get('TemplateMiner'):
+            template_miner = LogTemplateMiner.from_dict(data['TemplateMiner'])
+        aggregator = cls(template_miner=template_miner)
+        aggregator.total_count = data.get('TotalCount', 0)
+        for entry in data.get('Errors', []):
+            identifier = (entry.get('Source', 'Unknown'), entry.get('EventID', 0))
+            if 'TemplateID' in entry:
+                identifier += (entry['TemplateID'],)
+            aggregator.stats[identifier] = ErrorStats.from_dict(entry)
+        return aggregator
+
+    def most_common(self, top_n):
+        """발생 횟수 기준 상위 N개 (식별자, ErrorStats) 를 힙 선택으로 반환합니다."""
+        return heapq.nlargest(top_n, self.stats.items(), key=lambda item: item[1].count)
+
+
+def find_recurring_errors(logs, top_n=5, group_by_template=False, trend_options=None, near_duplicate_options=None,
+                          correlation_options=None):
+    """
+    로그 목록에서 가장 빈번하게 발생하는 오류를 찾아 요약 텍스트와 상세 데이터를 반환합니다.
+    logs 는 한 번만 순회하므로 레코드를 하나씩 반환하는 제너레이터 스트림도 그대로 전달할 수 있습니다.
+    group_by_template 이 True 이면 Source/EventID 에 더해 메시지 템플릿(LogTemplateMiner)으로도 구분합니다.
+    trend_options 가 주어지면(빈 dict 포함) 상위 오류별 급증/추세 분석 결과도 붙입니다 (analyze_error_trends 인자).
+    near_duplicate_options 가 주어지면(빈 dict 포함) 상위 오류별 유사 메시지 군집도 붙입니다 (NearDuplicateClusterer 인자).
+    correlation_options 가 주어지면(빈 dict 포함) 상위 오류별로 뒤따르는 오류와 순서도 붙입니다 (ErrorCorrelator 인자, logs 는 최신순).
+    """
+    timeline = ErrorTimeline() if trend_options is not None and _numpy_available() else None
+    near_duplicates = NearDuplicateClusterer(**near_duplicate_options) if near_duplicate_options is not None else None
+    correlation = ErrorCorrelator(**correlation_options) if correlation_options is not None else None
+    aggregator = RecurringErrorAggregator(template_miner=LogTemplateMiner() if group_by_template else None,
+                                          timeline=timeline, near_duplicates=near_duplicates, correlation=correlation)
     try:
-        error_counts = Counter(error_identifiers)
-        most_common_errors = error_counts.most_common(top_n)
+        aggregator.update(logs)
     except Exception as e:
         logger.error(f"Failed to count recurring errors: {e}", exc_info=True)
         return "Error during error counting.", []
 
+    return summarize_recurring_errors(aggregator, top_n=top_n, trend_options=trend_options)
+
+def summarize_recurring_errors(aggregator, top_n=5, trend_options=None):
+    """
+    집계 결과에서 상위 N개 반복 오류의 요약 텍스트와 상세 데이터를 만듭니다.
+    aggregator.timeline 이 있으면 상위 오류에 대해 analyze_error_trends(**trend_options) 를 실행해
+    상세 데이터에 Bursts/Trend 를 추가하고, aggregator.near_duplicates 가 있으면 유사 메시지 군집 수와
+    크기 순 상위 군집(MessageClusters: 건수와 대표 메시지)을, aggregator.correlation 이 있으면 이후
+    CorrelationWindowSeconds 초 안에 자주 뒤따른 오류(FollowedBy)와 오류 순서(Sequences)를 Support/Confidence/Lift 와 함께 추가합니다.
+    """
+    if not aggregator.total_count:
+        logger.warning("No error logs provided for analysis.")
+        return "No errors found to analyze.", []
+
+    logger.info(f"Analyzed {aggregator.total_count} error logs to find top {top_n} recurring errors.")
+    most_common_errors = aggregator.most_common(top_n)
+
     if not most_common_errors:
         logger.info("No recurring errors found matching the criteria.")
         return "No recurring errors found.", []
 
     logger.info(f"Found {len(most_common_errors)} distinct recurring errors.")
+    trends = {}
+    if aggregator.timeline is not None:
+        try:
+            trends = analyze_error_trends(aggregator.timeline, identifiers=[identifier for identifier, _ in most_common_errors],
+                                          **(trend_options or {}))
+        except Exception as e:
+            logger.error(f"Failed to analyze error trends: {e}", exc_info=True)
+
     summary_lines = [f"--- Top {len(most_common_errors)} Recurring Errors ---"]
     detailed_errors = []
 
-    for (source, event_id), count in most_common_errors:
-        # 샘플 메시지 찾기 (가장 최근)
-        sample_message = "N/A"
-        for log in reversed(logs):
-            if log.get('Source') == source and log.get('EventID') == event_id:
-                msg = log.get('Message', '')
-                sample_message = msg[:200] + ('...' if len(msg) > 200 else '')
-                break
+    for identifier, stats in most_common_errors:
+        source, event_id = identifier[0], identifier[1]
+        sample_message = _truncate_message(stats.sample_message) or "N/A"
 
-        summary_line = f"Source: {source}, Event ID: {event_id}, Count: {count}"
-        summary_lines.append(summary_line)
-        detailed_errors.append({
+        summary_line = f"Source: {source}, Event ID: {event_id}, Count: {stats.count}"
+        detail = {
             'Source': source,
             'EventID': event_id,
-            'Count': count,
-            'SampleMessage': sample_message
-        })
+            'Count': stats.count,
+            'SampleMessage': sample_message,
+            'FirstSeen': stats.first_timestamp,
+            'LastSeen': stats.last_timestamp,
+            'LogTypeCounts': dict(stats.log_type_counts)
+        }
+        if len(identifier) > 2:
+            summary_line = f"Source: {source}, Event ID: {event_id}, Template #{identifier[2]}, Count: {stats.count}"
+            detail['TemplateID'] = identifier[2]
+            detail['Template'] = stats.template
+        if aggregator.near_duplicates is not None:
+            cluster_count, unclustered, clusters = aggregator.near_duplicates.summary(identifier, top_n=MESSAGE_CLUSTERS_PER_ERROR)
+            detail['MessageClusterCount'] = cluster_count
+            detail['MessageClusters'] = [{'Count': cluster.size, 'Representative': _truncate_message(cluster.representative)}
+                                         for cluster in clusters]
+            if unclustered:
+                detail['UnclusteredMessages'] = unclustered
+            summary_line += f", Message Variants: {cluster_count}" + ("+" if unclustered else "")
+        if aggregator.correlation is not None:
+            followers = aggregator.correlation.followers(identifier, top_n=CORRELATIONS_PER_ERROR)
+            sequences = aggregator.correlation.sequences_from(identifier, top_n=CORRELATIONS_PER_ERROR)
+            if followers or sequences:
+                detail['CorrelationWindowSeconds'] = aggregator.correlation.window_seconds
+                detail['FollowedBy'] = followers
+                detail['Sequences'] = sequences
+            if followers:
+                summary_line += (f", Followed by: {followers[0]['Source']} {followers[0]['EventID']} "
+                                 f"(lift {followers[0]['Lift']})")
+        trend = trends.get(identifier)
+        if trend is not None:
+            detail['Bursts'] = trend['Bursts']
+            detail['Trend'] = trend['Trend']
+            if trend['Bursts']:
+                summary_line += f", Bursts: {len(trend['Bursts'])} (peak {trend['PeakCount']}/{trend['IntervalSeconds']}s)"
+            if trend['Trend']['Rising']:
+                summary_line += ", Rising"
+        summary_lines.append(summary_line)
+        detailed_errors.append(detail)
         logger.debug(f"Recurring Error: {summary_line} | Sample: {sample_message}")
 
     summary_text = "\n".join(summary_lines)
     return summary_text, detailed_errors
 
+def _truncate_message(message, limit=200):
+    return message[:limit] + ('...' if len(message) > limit else '') if message else ''
+
+def analyze_error_trends(timeline, identifiers=None, interval_seconds=300, window=12, burst_threshold=4.0,
+                         burst_ratio=2.0, min_burst_count=10, trend_threshold=1.0, max_bins=10000, max_bursts=5):
+    """
+    식별자별 발생 시각을 interval_seconds 구간으로 나눈 (식별자 x 구간) 개수 행렬을 벡터 연산으로 만들고 다음을 찾습니다.
+    - 급증(Bursts): 직전 window 개 구간의 이동 평균보다 burst_threshold 배 표준편차(최소 sqrt(평균), 1) 이상 많으면서
+      이동 평균의 burst_ratio 배 이상, min_burst_count 건 이상인 연속 구간. 건수가 많은 순으로 최대 max_bursts 개를 시간순으로 반환.
+    - 증가 추세(Trend): 최소제곱 기울기로 본 전체 기간 동안의 변화량이 평균 구간 건수의 trend_threshold 배 이상.
+    identifiers 가 주어지면 해당 식별자만, 없으면 min_burst_count 건 이상 발생한 모든 식별자를 분석하며,
+    구간 수가 max_bins 를 넘으면 구간 길이를 분 단위로 늘립니다.
+    반환값: {식별자: {'IntervalSeconds', 'PeakCount', 'Bursts': [...], 'Trend': {...}}}
+    """
+    if _load_numpy() is None:
+        logger.warning("numpy is not installed. Skipping burst/trend analysis.")
+        return {}
+
+    timestamps, codes = timeline.arrays()
+    if identifiers is None:
+        totals = np.bincount(codes, minlength=len(timeline.keys))
+        selected = np.flatnonzero(totals >= min_burst_count)
+    else:
+        selected = np.array([code for code in map(timeline.code, identifiers) if code is not None], dtype=np.int64)
+    if not len(timestamps) or not len(selected):
+        return {}
+
+    # 분석 대상 식별자만 행 번호로 다시 매김 (-1: 제외)
+    row_of = np.full(len(timeline.keys), -1, dtype=np.int64)
+    row_of[selected] = np.arange(len(selected))
+    rows = row_of[codes]
+    included = rows >= 0
+    rows = rows[included]
+    timestamps = timestamps[included]
+    if not len(rows):
+        return {}
+
+    first, last = int(timestamps.min()), int(timestamps.max())
+    interval = max(int(interval_seconds), 1)
+    if (last - first) // interval + 1 > max_bins:
+        interval = -(-(last - first + 1) // max_bins)
+        interval = -(-interval // 60) * 60
+        logger.info(f"Time range too long for {interval_seconds}s buckets. Using {interval}s buckets.")
+    start = first // interval * interval
+    bin_count = (last - start) // interval + 1
+    row_count = len(selected)
+
+    counts = np.bincount(rows * bin_count + (timestamps - start) // interval,
+                         minlength=row_count * bin_count).reshape(row_count, bin_count).astype(np.float64)
+
+    # 직전 window 개 구간의 이동 평균/표준편차 (누적 합으로 계산, 현재 구간은 제외)
+    zeros = np.zeros((row_count, 1))
+    cumulative = np.concatenate([zeros, np.cumsum(counts, axis=1)], axis=1)
+    cumulative_sq = np.concatenate([zeros, np.cumsum(counts * counts, axis=1)], axis=1)
+    bin_index = np.arange(bin_count)
+    window_start = np.maximum(bin_index - window, 0)
+    history = bin_index - window_start
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = (cumulative[:, bin_index] - cumulative[:, window_start]) / history
+        variance = (cumulative_sq[:, bin_index] - cumulative_sq[:, window_start]) / history - mean * mean
+    scale = np.maximum(np.maximum(np.sqrt(np.maximum(variance, 0)), np.sqrt(np.maximum(mean, 0))), 1.0)
+    is_burst = ((history >= min(MIN_BURST_HISTORY, window)) & (counts >= min_burst_count)
+                & (counts > mean + burst_threshold * scale) & (counts >= mean * burst_ratio))
+
+    # 연속된 급증 구간을 하나로 묶음 (행마다 앞뒤를 False 로 채워 행 경계를 넘지 않게 함)
+    padded = np.zeros((row_count, bin_count + 2), dtype=np.int8)
+    padded[:, 1:-1] = is_burst
+    edges = np.diff(padded, axis=1)
+    run_rows, run_starts = np.nonzero(edges == 1)
+    _, run_ends = np.nonzero(edges == -1)
+    run_counts = cumulative[run_rows, run_ends] - cumulative[run_rows, run_starts]
+
+    # 전체 기간의 최소제곱 기울기 (구간당 건수 변화량)
+    centered = bin_index - (bin_count - 1) / 2.0
+    denominator = float(np.dot(centered, centered))
+    slopes = counts @ centered / denominator if denominator else np.zeros(row_count)
+    relative_change = slopes * (bin_count - 1) / counts.mean(axis=1)
+    rising = (bin_count >= MIN_BURST_HISTORY) & (slopes > 0) & (relative_change >= trend_threshold)
+    peaks = counts.max(axis=1)
+
+    bursts_by_row = {}
+    for row, run_start, run_end, run_count in zip(run_rows.tolist(), run_starts.tolist(), run_ends.tolist(), run_counts.tolist()):
+        bursts_by_row.setdefault(row, []).append({
+            'Start': _format_epoch(start + run_start * interval),
+            'End': _format_epoch(start + run_end * interval),
+            'Count': int(run_count),
+            'PeakCount': int(counts[row, run_start:run_end].max()),
+            'Baseline': round(float(mean[row, run_start]), 2)
+        })
+
+    results = {}
+    for row, code in enumerate(selected.tolist()):
+        bursts = heapq.nlargest(max_bursts, bursts_by_row.get(row, []), key=lambda burst: burst['Count'])
+        results[timeline.keys[code]] = {
+            'IntervalSeconds': interval,
+            'PeakCount': int(peaks[row]),
+            'Bursts': sorted(bursts, key=lambda burst: burst['Start']),
+            'Trend': {'RelativeChange': round(float(relative_change[row]), 2), 'Rising': bool(rising[row])}
+        }
+    return results
+
 def save_recurring_errors_to_json(error_details, filename):
     """분석된 반복 오류 상세 데이터를 JSON 파일에 저장합니다."""
     if not error_details:
@@ -0,0 +1,179 @@
+import datetime
+import re
+
+from src.event_sources import COMPACT_RECORD_TYPES, datetime_to_epoch
+
+# 이벤트 수준 이름 -> .evtx(Windows 이벤트 로그 XML)의 Level 값
+EVENT_LEVELS = {'critical': 1, 'error': 2, 'warning': 3, 'information': 4, 'verbose': 5}
+# 이벤트 수준 이름 -> 클래식 이벤트 로그 API 의 EventType (레코드의 LevelType 값, 심각/오류는 구분되지 않음)
+EVENT_TYPES = {'critical': 1, 'error': 1, 'warning': 2, 'information': 4, 'verbose': 4}
+DEFAULT_LEVELS = ('critical', 'error')
+# 클래식 API 의 EventID 상위 비트(심각도/고객 플래그 등)를 제외한 값
+_EVENT_ID_MASK = 0xFFFF
+_DURATION_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+
+
+def parse_duration(text):
+    """'90s', '15m', '1h', '7d' 같은 기간 문자열(단위가 없으면 초)을 초 단위 정수로 변환합니다."""
+    text = text.strip().lower()
+    if text and text[-1] in _DURATION_UNITS:
+        value = int(text[:-1]) * _DURATION_UNITS[text[-1]]
+    else:
+        value = int(text)
+    if value <= 0:
+        raise ValueError(f"Duration must be positive: '{text}'")
+    return value
+
+def parse_time_bound(value):
+    """
+    시각 경계를 datetime(절대 시각) 또는 int(지금으로부터 몇 초 전)로 변환합니다.
+    'YYYY-mm-dd HH:MM:SS'(또는 날짜만) 문자열, '6h' 같은 기간 문자열, datetime 을 받습니다.
+    """
+    if value is None or isinstance(value, (datetime.datetime, int)):
+        return value
+    text = str(value).strip()
+    if not text:
+        return None
+    try:
+        return datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return parse_duration(text)
+
+def _split(values):
+    if values is None:
+        return ()
+    if isinstance(values, str):
+        values = values.split(',')
+    return tuple(str(value).strip() for value in values if str(value).strip())
+
+
+class EventFilter:
+    """
+    선언적 이벤트 필터. from_spec 의 dict(또는 같은 이름의 인자)로 구성합니다.
+    - levels: 'critical', 'error', 'warning', 'information', 'verbose' 중 선택 (기본: critical, error)
+    - since / until: 시각 범위. 절대 시각이나 '6h' 같은 상대 기간(지금으로부터)이며, 이벤트 시각과 같은 로컬 시각으로
+      비교합니다 (.evtx 리더도 로컬 시각으로 바꿔 반환).
+    - include_sources / exclude_sources: Source 이름 (대소문자 무시)
+    - include_event_ids / exclude_event_ids: EventID (클래식 API 의 상위 플래그 비트를 뺀 값도 일치로 봄)
+    - message_regex: 포맷된 메시지에 대한 정규식 (메시지가 필요하므로 다른 조건을 모두 통과한 이벤트에만 적용)
+
+    조건은 생성 시 한 번 컴파일되며, 이벤트 소스는 읽는 즉시 수준/시각/Source·EventID 를 값싼 순서로 확인하고
+    최신순으로 읽다가 since 보다 오래된 이벤트를 만나면 읽기를 멈춥니다.
+    """
+
+    def __init__(self, levels=DEFAULT_LEVELS, since=None, until=None, include_sources=(), exclude_sources=(),
+                 include_event_ids=(), exclude_event_ids=(), message_regex=None):
+        levels = tuple(level.lower() for level in _split(levels)) or DEFAULT_LEVELS
+        unknown = [level for level in levels if level not in EVENT_LEVELS]
+        if unknown:
+            raise ValueError(f"Unknown event level(s): {', '.join(unknown)} (expected {', '.join(EVENT_LEVELS)})")
+        self.levels = levels
+        self.since = parse_time_bound(since)
+        self.until = parse_time_bound(until)
+        self.include_sources = frozenset(source.lower() for source in _split(include_sources))
+        self.exclude_sources = frozenset(source.lower() for source in _split(exclude_sources))
+        self.include_event_ids = frozenset(int(event_id) for event_id in _split(include_event_ids))
+        self.exclude_event_ids = frozenset(int(event_id) for event_id in _split(exclude_event_ids))
+        self.message_regex = message_regex or None
+
+        # .evtx Level 값 / 클래식 API EventType 집합
+        self.evtx_levels = frozenset(EVENT_LEVELS[level] for level in levels)
+        self.event_types = frozenset(EVENT_TYPES[level] for level in levels)
+        self.header_predicate = self._compile_header_predicate()
+        try:
+            self.message_predicate = re.compile(self.message_regex).search if self.message_regex else None
+        except re.error as e:
+            raise ValueError(f"Invalid message regex '{self.message_regex}': {e}") from e
+
+    @classmethod
+    def from_spec(cls, spec):
+        """{'levels', 'since', 'until', 'include_sources', ...} dict 로 필터를 만듭니다 (없는 키는 기본값)."""
+        return cls(**{key: value for key, value in spec.items() if value not in (None, '', ())})
+
+    def to_spec(self):
+        return {
+            'levels': list(self.levels),
+            'since': self.since.isoformat(sep=' ') if isinstance(self.since, datetime.datetime) else self.since,
+            'until': self.until.isoformat(sep=' ') if isinstance(self.until, datetime.datetime) else self.until,
+            'include_sources': sorted(self.include_sources),
+            'exclude_sources': sorted(self.exclude_sources),
+            'include_event_ids': sorted(self.include_event_ids),
+            'exclude_event_ids': sorted(self.exclude_event_ids),
+            'message_regex': self.message_regex
+        }
+
+    def __reduce__(self):
+        # 컴파일된 조건(클로저)은 피클할 수 없으므로 명세로 다시 만듦 (프로세스 풀 전달용)
+        return (EventFilter.from_spec, (self.to_spec(),))
+
+    def __repr__(self):
+        return f"EventFilter({ {key: value for key, value in self.to_spec().items() if value} })"
+
+    def _compile_header_predicate(self):
+        """Source/EventID 조건을 하나의 함수로 컴파일합니다 (조건이 없으면 None). Source 판정은 이름별로 캐시."""
+        include_sources, exclude_sources = self.include_sources, self.exclude_sources
+        include_ids, exclude_ids = self.include_event_ids, self.exclude_event_ids
+        if not (include_sources or exclude_sources or include_ids or exclude_ids):
+            return None
+
+        source_cache = {}
+        def source_allowed(source):
+            allowed = source_cache.get(source)
+            if allowed is None:
+                name = (source or '').lower()
+                allowed = source_cache[source] = ((not include_sources or name in include_sources)
+                                                  and name not in exclude_sources)
+            return allowed
+
+        def event_id_allowed(event_id):
+            event_id = event_id or 0
+            if include_ids and event_id not in include_ids and (event_id & _EVENT_ID_MASK) not in include_ids:
+                return False
+            return not exclude_ids or (event_id not in exclude_ids and (event_id & _EVENT_ID_MASK) not in exclude_ids)
+
+        if not (include_ids or exclude_ids):
+            return lambda source, event_id: source_allowed(source)
+        if not (include_sources or exclude_sources):
+            return lambda source, event_id: event_id_allowed(event_id)
+        return lambda source, event_id: source_allowed(source) and event_id_allowed(event_id)
+
+    @property
+    def has_time_bounds(self):
+        return self.since is not None or self.until is not None
+
+    def time_bounds(self):
+        """(since, until) 을 절대 로컬 시각(naive datetime, 없으면 None)으로 반환합니다. 상대 기간은 지금 기준."""
+        now = None
+        bounds = []
+        for bound in (self.since, self.until):
+            if isinstance(bound, int):
+                if now is None:
+                    now = datetime.datetime.now()
+                bound = now - datetime.timedelta(seconds=bound)
+            bounds.append(bound)
+        return tuple(bounds)
+
+    def record_predicate(self):
+        """
+        이미 만들어진 레코드(EventRecord 또는 dict)에 모든 조건을 적용하는 함수를 만듭니다
+        (내보낸 파일처럼 소스 단계에서 거를 수 없는 경우). LevelType 은 클래식 API EventType 값으로 비교하며,
+        상대 시각 경계는 이 함수를 만든 시점 기준으로 고정됩니다.
+        """
+        event_types, header_predicate, message_predicate = self.event_types, self.header_predicate, self.message_predicate
+        since, until = (None if bound is None else datetime_to_epoch(bound) for bound in self.time_bounds())
+
+        def predicate(record):
+            if type(record) in COMPACT_RECORD_TYPES:
+                level_type, epoch, source, event_id = record.level_type, record.epoch, record.source, record.event_id
+            else:
+                level_type, source, event_id = record.get('LevelType'), record.get('Source'), record.get('EventID')
+                epoch = datetime_to_epoch(datetime.datetime.fromisoformat(record['Timestamp'])) if (
+                    since is not None or until is not None) else None
+            if level_type is not None and level_type not in event_types:
+                return False
+            if (since is not None and epoch < since) or (until is not None and epoch > until):
+                return False
+            if header_predicate is not None and not header_predicate(source, event_id):
+                return False
+            return message_predicate is None or bool(message_predicate(record.get('Message') or ''))
+        return predicate
@@ -1,20 +1,83 @@
-import win32evtlog
-import win32evtlogutil
-import win32api
-import winerror
 import datetime
 import os
 import csv
+import platform
+import types
 import logging # logging 모듈 임포트
+from src.event_filter import EventFilter
+from src.event_sources import COMPACT_RECORD_TYPES, EventRecord, EventSource, RawEvent, iter_records
 
 logger = logging.getLogger(__name__) # 모듈 레벨 로거 생성
 
-def get_critical_errors(log_types=['System'], max_records=1000):
-    """지정된 Windows 이벤트 로그에서 심각/오류 이벤트를 읽어옵니다."""
-    all_errors = []
+# CSV 출력 컬럼 (get_critical_errors 레코드 키와 동일)
+CSV_FIELDNAMES = list(EventRecord.FIELDS)
+
+# pywin32 모듈은 라이브 이벤트 로그를 읽을 때 _load_pywin32 로 불러옴
+# (.evtx 파일 분석이나 CSV 내보내기만 하는 실행은 불러오지 않음)
+win32evtlog = win32evtlogutil = win32api = winerror = None
+
+def _load_pywin32():
+    """pywin32 를 불러오고 사용 가능 여부를 반환합니다 (pywin32 가 없는 환경(예: Linux 분석 서버)에서는 .evtx 파일 분석만 가능)."""
+    global win32evtlog, win32evtlogutil, win32api, winerror
+    if win32evtlog is None:
+        try:
+            import win32evtlog as _win32evtlog
+            import win32evtlogutil as _win32evtlogutil
+            import win32api as _win32api
+            import winerror as _winerror
+        except ImportError:
+            return False
+        win32evtlog, win32evtlogutil, win32api, winerror = _win32evtlog, _win32evtlogutil, _win32api, _winerror
+    return True
+
+def get_critical_errors(log_types=['System'], max_records=1000, read_workers=1, bookmarks=None, metrics=None,
+                        deferred=False, event_filter=None):
+    """지정된 Windows 이벤트 로그에서 심각/오류 이벤트를 읽어 목록으로 반환합니다."""
+    return list(iter_critical_errors(log_types=log_types, max_records=max_records, read_workers=read_workers,
+                                     bookmarks=bookmarks, metrics=metrics, deferred=deferred, event_filter=event_filter))
+
+def iter_critical_errors(log_types=['System'], max_records=1000, read_workers=1, bookmarks=None, metrics=None,
+                         deferred=False, event_filter=None):
+    """
+    지정된 Windows 이벤트 로그에서 심각/오류 이벤트를 하나씩 반환하는 제너레이터.
+    전체 목록을 만들지 않으므로 max_records 가 커져도 메모리 사용량이 일정합니다.
+    read_workers 가 2 이상이면 로그별 병렬 읽기 + 메시지 포맷 스레드 풀을 사용하고,
+    bookmarks 가 주어지면 로그별 북마크 이후의 새 이벤트만 읽고, metrics 가 주어지면 읽기/포맷 시간을 기록하며,
+    deferred 가 True 이면 SafeFormatMessage 를 메시지가 필요한 레코드에 대해서만, (Source, EventID) 별 템플릿으로 한 번씩 호출합니다
+    (event_sources.iter_records 참고). event_filter(EventFilter) 가 주어지면 수준/시각/Source/EventID 를 읽는 단계에서 거르며,
+    기본값은 오류 수준(EVENTLOG_ERROR_TYPE)만 읽습니다.
+    """
+    total_count = 0
+    if not _load_pywin32():
+        logger.error("pywin32 is not available. Live event logs can only be read on Windows (use ANALYSIS_EVTX_FILES for exported .evtx files).")
+        return
     logger.info(f"Attempting to read logs from: {', '.join(log_types)}")
 
-    for log_type in log_types:
+    sources = [WindowsEventLogSource(log_type, event_filter=event_filter) for log_type in log_types]
+    for record in iter_records(sources, max_records=max_records, read_workers=read_workers,
+                               bookmarks=bookmarks, metrics=metrics, deferred=deferred, event_filter=event_filter):
+        total_count += 1
+        yield record
+
+    logger.info(f"Total critical/error events collected: {total_count}")
+
+class WindowsEventLogSource(EventSource):
+    """
+    pywin32 로 로컬 Windows 이벤트 로그 하나를 최신순으로 읽는 이벤트 소스.
+    event_filter 의 수준(EventType), 시각(TimeGenerated, 로컬 시각), Source/EventID 조건을 메시지 포맷 전에 적용하고,
+    since 보다 오래된 이벤트를 만나면 읽기를 멈춥니다.
+    """
+
+    def __init__(self, log_type, event_filter=None):
+        self.name = log_type
+        self.log_type = log_type
+        # 레코드 번호는 호스트의 채널마다 따로 매겨짐
+        self.origin = f"{platform.node()}/{log_type}"
+        self.event_filter = event_filter or EventFilter()
+        _load_pywin32()
+
+    def iter_raw_events(self, max_records, after_record=None):
+        log_type = self.log_type
         handle = None # 핸들 초기화
         try:
             handle = win32evtlog.OpenEventLog(None, log_type)
@@ -24,19 +87,35 @@ def get_critical_errors(log_types=['System'], max_records=1000):
                 logger.error(f"Access denied when opening '{log_type}' log. Ensure script is run as Administrator.")
             else:
                 logger.error(f"Failed to open '{log_type}' log: {e}")
-            continue # 다음 로그 타입으로 진행
+            return # 다음 로그 타입으로 진행
 
         flags = win32evtlog.EVENTLOG_BACKWARDS_READ | win32evtlog.EVENTLOG_SEQUENTIAL_READ
         try:
             total_records = win32evtlog.GetNumberOfEventLogRecords(handle)
-            logger.info(f"Found {total_records} records in '{log_type}'. Reading up to {max_records} recent error events.")
+            if max_records is None:
+                logger.info(f"Found {total_records} records in '{log_type}'. Reading all new error events.")
+            else:
+                logger.info(f"Found {total_records} records in '{log_type}'. Reading up to {max_records} recent error events.")
+            if after_record is not None:
+                newest_record = win32evtlog.GetOldestEventLogRecord(handle) + total_records - 1
+                if newest_record < after_record:
+                    # 북마크보다 최신 레코드 번호가 작으면 로그가 초기화된 것이므로 처음부터 읽음
+                    logger.warning(f"'{log_type}' log appears to have been cleared since the last run. Ignoring bookmark (record {after_record}).")
+                    after_record = None
+                else:
+                    logger.info(f"Reading '{log_type}' events newer than record {after_record}.")
         except Exception as e:
              logger.error(f"Could not get number of records for '{log_type}': {e}")
              win32evtlog.CloseEventLog(handle)
-             continue
+             return
 
         events_read_count = 0
         processed_count = 0
+        event_types = self.event_filter.event_types
+        header_predicate = self.event_filter.header_predicate
+        since, until = self.event_filter.time_bounds()
+        reached_since = False
+        limit = max_records if max_records is not None else float('inf')
 
         try:
             while True:
@@ -49,31 +128,45 @@ def get_critical_errors(log_types=['System'], max_records=1000):
                 if not events:
                     break
 
+                reached_bookmark = False
                 for event in events:
+                    if after_record is not None and event.RecordNumber <= after_record:
+                        reached_bookmark = True
+                        break
                     processed_count += 1
-                    if event.EventType == win32evtlog.EVENTLOG_ERROR_TYPE:
-                        try:
-                            message = win32evtlogutil.SafeFormatMessage(event, log_type)
-                        except Exception as format_err:
-                            # 메시지 포맷 실패 시 경고 로깅 후 계속 진행
-                            logger.warning(f"Could not format message for Event ID {event.EventID} in '{log_type}': {format_err}")
-                            message = f"Raw Data: {event.Data}" if event.Data else "[Message Formatting Failed]"
-
-                        record = {
-                            'Timestamp': event.TimeGenerated.strftime('%Y-%m-%d %H:%M:%S'),
-                            'Source': event.SourceName,
-                            'EventID': event.EventID,
-                            'LevelType': event.EventType,
-                            'Message': message.strip() if message else "N/A"
-                        }
-                        all_errors.append(record)
+                    if since is not None or until is not None:
+                        time_generated = event.TimeGenerated.replace(tzinfo=None)
+                        if since is not None and time_generated < since:
+                            # 최신순으로 읽으므로 이후 이벤트는 모두 since 이전
+                            reached_since = True
+                            break
+                        if until is not None and time_generated > until:
+                            continue
+                    if event.EventType not in event_types:
+                        continue
+                    if header_predicate is None or header_predicate(event.SourceName, event.EventID):
+                        # 메시지 포맷은 비용이 크므로 format_message 에서 따로 수행 (병렬 포맷 가능)
+                        yield RawEvent(
+                            timestamp=event.TimeGenerated,
+                            source=event.SourceName,
+                            event_id=event.EventID,
+                            level_type=event.EventType,
+                            log_type=log_type,
+                            record_number=event.RecordNumber,
+                            insertion_strings=event.StringInserts or (),
+                            native=event
+                        )
                         events_read_count += 1
-                        # 디버그 레벨에서 개별 오류 로그 기록 (너무 많을 수 있으므로 주의)
-                        # logger.debug(f"Found error event: {record['Source']} / {record['EventID']}")
 
-                    if events_read_count >= max_records:
+                    if events_read_count >= limit:
                         break
-                if events_read_count >= max_records:
+                if reached_bookmark:
+                    logger.info(f"Reached bookmark (record {after_record}) for '{log_type}'.")
+                    break
+                if reached_since:
+                    logger.info(f"Reached events older than {since} in '{log_type}'. Stopping.")
+                    break
+                if events_read_count >= limit:
                     logger.info(f"Reached max_records limit ({max_records}) for '{log_type}'.")
                     break
         except Exception as loop_err:
@@ -85,25 +178,100 @@ def get_critical_errors(log_types=['System'], max_records=1000):
 
         logger.info(f"Finished reading '{log_type}'. Found {events_read_count} error events out of {processed_count} processed.")
 
-    logger.info(f"Total critical/error events collected: {len(all_errors)}")
-    return all_errors
+    def format_message(self, raw_event):
+        event = raw_event.native
+        try:
+            message = win32evtlogutil.SafeFormatMessage(event, self.log_type)
+        except Exception as format_err:
+            # 메시지 포맷 실패 시 경고 로깅 후 계속 진행
+            logger.warning(f"Could not format message for Event ID {event.EventID} in '{self.log_type}': {format_err}")
+            message = f"Raw Data: {event.Data}" if event.Data else "[Message Formatting Failed]"
+        return message
+
+    def format_with_inserts(self, raw_event, insertion_strings):
+        # SafeFormatMessage 는 레코드의 SourceName/EventID/StringInserts 만 사용하므로 삽입 문자열만 바꾼 대리 객체로 포맷
+        event = raw_event.native
+        proxy = types.SimpleNamespace(SourceName=event.SourceName, EventID=event.EventID,
+                                      StringInserts=tuple(insertion_strings), Data=None)
+        try:
+            # 메시지 파일을 찾지 못하면 빈 문자열이 반환되므로, 이 경우에도 이벤트마다 SafeFormatMessage 사용
+            return win32evtlogutil.FormatMessage(proxy, self.log_type) or None
+        except Exception as format_err:
+            logger.debug(f"Could not build message template for Event ID {event.EventID} in '{self.log_type}': {format_err}")
+            return None
 
-def save_critical_logs_to_file(logs, filename):
-    """추출된 심각/오류 로그 목록을 CSV 파일에 저장합니다."""
-    if not logs:
-        logger.warning("No critical logs found to save.")
-        return
+class CriticalLogCsvWriter:
+    """
+    심각/오류 레코드를 한 건씩 CSV 파일에 기록하는 스트리밍 writer.
+    첫 레코드가 들어올 때 파일을 열며, 레코드 목록을 메모리에 보관하지 않습니다.
+    """
 
+    def __init__(self, filename):
+        self.filename = filename
+        self.count = 0 # 전달받은 레코드 수
+        self.bytes_written = 0 # 닫은 뒤의 파일 크기
+        self._file = None
+        self._writer = None
+        self._failed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def _open(self):
+        try:
+            os.makedirs(os.path.dirname(self.filename), exist_ok=True)
+            logger.info(f"Saving critical logs to '{self.filename}'...")
+            self._file = open(self.filename, 'w', newline='', encoding='utf-8')
+            self._writer = csv.writer(self._file, quoting=csv.QUOTE_ALL)
+            self._writer.writerow(CSV_FIELDNAMES)
+        except IOError as e:
+            logger.error(f"Failed to save critical logs to file '{self.filename}': {e}", exc_info=True) # 에러 상세 정보 포함
+            self._failed = True
+
+    def write(self, record):
+        """레코드 한 건을 기록합니다. 파일 오류가 발생해도 분석이 계속되도록 예외를 전파하지 않습니다."""
+        self.count += 1
+        if self._writer is None and not self._failed:
+            self._open()
+        if self._failed:
+            return
+        try:
+            if type(record) in COMPACT_RECORD_TYPES:
+                self._writer.writerow(record.to_row())
+            else:
+                self._writer.writerow([record.get(field, '') for field in CSV_FIELDNAMES])
+        except IOError as e:
+            logger.error(f"Failed to save critical logs to file '{self.filename}': {e}", exc_info=True)
+            self._failed = True
+
+    def passthrough(self, records):
+        """레코드를 CSV 에 기록하면서 그대로 다시 내보냅니다 (단일 패스 파이프라인용)."""
+        for record in records:
+            self.write(record)
+            yield record
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self.bytes_written = self._file.tell()
+            except (OSError, ValueError):
+                pass
+            self._file.close()
+            self._file = None
+            if not self._failed:
+                logger.info(f"Successfully saved {self.count} critical logs to '{self.filename}'.")
+        elif self.count == 0:
+            logger.warning("No critical logs found to save.")
+
+def save_critical_logs_to_file(logs, filename):
+    """추출된 심각/오류 로그 목록(또는 레코드 이터러블)을 CSV 파일에 저장합니다."""
     try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        logger.info(f"Saving {len(logs)} critical logs to '{filename}'...")
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            fieldnames = ['Timestamp', 'Source', 'EventID', 'LevelType', 'Message']
-            writer = csv.DictWriter(f, fieldnames=fieldnames, quoting=csv.QUOTE_ALL)
-            writer.writeheader()
-            writer.writerows(logs)
-        logger.info(f"Successfully saved critical logs to '{filename}'.")
-    except IOError as e:
-        logger.error(f"Failed to save critical logs to file '{filename}': {e}", exc_info=True) # 에러 상세 정보 포함
+        with CriticalLogCsvWriter(filename) as writer:
+            for record in logs:
+                writer.write(record)
     except Exception as e:
         logger.error(f"An unexpected error occurred while saving critical logs: {e}", exc_info=True)
\ No newline at end of file
@@ -0,0 +1,540 @@
+import datetime
+import functools
+import heapq
+import logging
+import queue
+import re
+import sys
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+# 읽기 스레드 → 병합 단계로 넘기는 배치 크기와 채널별 대기열 길이 (메모리 상한)
+READ_BATCH_SIZE = 256
+READ_QUEUE_BATCHES = 8
+# 포맷 스레드 하나당 동시에 대기시킬 이벤트 수
+FORMAT_PENDING_PER_WORKER = 64
+
+# 같은 메시지 문자열을 하나의 객체로 공유하는 풀의 최대 크기 (넘으면 비움)
+MESSAGE_POOL_SIZE = 65536
+# 소스별로 보관하는 메시지 템플릿 수 (넘으면 비움)
+MESSAGE_TEMPLATE_CACHE_SIZE = 4096
+
+_END_OF_STREAM = object()
+_EPOCH = datetime.datetime(1970, 1, 1)
+_ONE_SECOND = datetime.timedelta(seconds=1)
+_message_pool = {}
+# 메시지 템플릿을 만들 때 삽입 문자열 대신 넣는 자리 표식 (포맷 결과에 그대로 남아 위치를 알려 줌)
+_TEMPLATE_MARKER = '\u27ea{}\u27eb'
+_TEMPLATE_MARKER_REGEX = re.compile('\u27ea(\\d+)\u27eb')
+
+
+class RawEvent:
+    """
+    메시지 포맷 전의 이벤트.
+    포맷(비용이 큰 작업)에 필요한 원본 객체(native)를 함께 보관합니다.
+    """
+    __slots__ = ('timestamp', 'source', 'event_id', 'level_type', 'log_type',
+                 'record_number', 'insertion_strings', 'native')
+
+    def __init__(self, timestamp, source, event_id, level_type, log_type,
+                 record_number=None, insertion_strings=(), native=None):
+        self.timestamp = timestamp # datetime
+        self.source = source
+        self.event_id = event_id
+        self.level_type = level_type
+        self.log_type = log_type
+        self.record_number = record_number
+        self.insertion_strings = insertion_strings
+        self.native = native
+
+
+class EventSource:
+    """
+    이벤트 소스 인터페이스. 로그 채널 또는 파일 하나를 나타냅니다.
+    iter_raw_events 는 심각/오류 이벤트를 최신순으로 반환하고, format_message 는 메시지 문자열을 만듭니다.
+    after_record 가 주어지면 그 레코드 번호 이하(이전 실행에서 이미 처리한 이벤트)에 도달할 때 읽기를 멈춥니다.
+    max_records 가 None 이면 건수 제한 없이 읽습니다.
+    origin 은 레코드 번호가 유일한 범위(파일 경로 또는 호스트/채널)를 나타내며, 없으면 name 을 사용합니다.
+    """
+    name = 'Unknown'
+    origin = None
+
+    def iter_raw_events(self, max_records, after_record=None):
+        raise NotImplementedError
+
+    def format_message(self, raw_event):
+        raise NotImplementedError
+
+    def format_with_inserts(self, raw_event, insertion_strings):
+        """
+        raw_event 를 insertion_strings 를 삽입 문자열로 사용해 포맷합니다 (MessageTemplateCache 용).
+        삽입 문자열을 바꿔 포맷할 수 없는 소스는 None 을 반환하며, 이 경우 이벤트마다 format_message 를 사용합니다.
+        """
+        return None
+
+
+class SimulatedEventSource(EventSource):
+    """
+    pywin32 없이 파이프라인을 시험하기 위한 가상 소스.
+    결정적인 이벤트를 생성하고, format_delay 초 만큼 메시지 포맷 지연을 흉내냅니다.
+    """
+
+    def __init__(self, name, event_count, format_delay=0.0, start_time=None, interval_seconds=1,
+                 sources=('Disk', 'Ntfs', 'Service Control Manager'), event_ids=(7, 55, 7031)):
+        self.name = name
+        self.event_count = event_count
+        self.format_delay = format_delay
+        self.start_time = start_time or datetime.datetime(2026, 1, 1)
+        self.interval_seconds = interval_seconds
+        self.sources = sources
+        self.event_ids = event_ids
+        self.format_calls = 0
+        self._lock = threading.Lock()
+
+    def iter_raw_events(self, max_records, after_record=None):
+        if after_record is not None and self.event_count < after_record:
+            after_record = None # 로그가 초기화된 경우 처음부터 읽음
+        count = self.event_count if max_records is None else min(self.event_count, max_records)
+        for i in range(count):
+            source = self.sources[i % len(self.sources)]
+            event_id = self.event_ids[(i // len(self.sources)) % len(self.event_ids)]
+            record_number = self.event_count - i
+            if after_record is not None and record_number <= after_record:
+                return
+            yield RawEvent(
+                timestamp=self.start_time - datetime.timedelta(seconds=i * self.interval_seconds),
+                source=source,
+                event_id=event_id,
+                level_type=1,
+                log_type=self.name,
+                record_number=record_number,
+                insertion_strings=(f"{self.name}-{record_number}",),
+            )
+
+    def format_message(self, raw_event):
+        return self.format_with_inserts(raw_event, raw_event.insertion_strings)
+
+    def format_with_inserts(self, raw_event, insertion_strings):
+        # format_calls: 실제 포맷(비용이 큰 작업) 호출 수 (지연 포맷/템플릿 캐시 시험용)
+        with self._lock:
+            self.format_calls += 1
+        if self.format_delay:
+            time.sleep(self.format_delay)
+        return f"Simulated {raw_event.source} error {raw_event.event_id}: {', '.join(insertion_strings)}"
+
+
+class MessageTemplateCache:
+    """
+    소스 하나의 메시지를 (Source, EventID, 삽입 문자열 수) 별 템플릿으로 메모이즈하는 포맷터 (지연 포맷 모드).
+    처음 보는 종류만 삽입 문자열 자리에 표식을 넣어 source.format_with_inserts 로 실제 포맷하고 템플릿으로 보관하며,
+    이후 같은 종류는 템플릿의 표식을 이벤트의 삽입 문자열로 바꾸기만 합니다.
+    템플릿을 만들 수 없는 종류(소스가 지원하지 않거나, 포맷 결과에 표식이 없는 경우)는 이벤트마다 format_message 로 포맷합니다.
+    """
+
+    def __init__(self, source, max_templates=MESSAGE_TEMPLATE_CACHE_SIZE):
+        self.source = source
+        self.max_templates = max_templates
+        self.hits = 0
+        self.misses = 0
+        self._templates = {} # (Source, EventID, 삽입 문자열 수) -> (문자열 조각 목록, 삽입 문자열 번호 목록) 또는 None
+        self._lock = threading.Lock()
+
+    def _build_template(self, raw_event, insert_count):
+        text = self.source.format_with_inserts(raw_event, [_TEMPLATE_MARKER.format(i) for i in range(insert_count)])
+        if text is None:
+            return None
+        parts = _TEMPLATE_MARKER_REGEX.split(text)
+        indexes = [int(index) for index in parts[1::2]]
+        if insert_count and not indexes:
+            # 포맷 실패 시의 대체 메시지 등 삽입 문자열이 쓰이지 않은 결과는 템플릿으로 재사용하지 않음
+            return None
+        if any(index >= insert_count for index in indexes):
+            return None
+        return parts[0::2], indexes
+
+    def format(self, raw_event):
+        insertion_strings = raw_event.insertion_strings or ()
+        key = (raw_event.source, raw_event.event_id, len(insertion_strings))
+        try:
+            template = self._templates[key]
+            self.hits += 1
+        except KeyError:
+            template = self._build_template(raw_event, len(insertion_strings))
+            with self._lock:
+                if len(self._templates) >= self.max_templates:
+                    self._templates.clear()
+                self._templates[key] = template
+                self.misses += 1
+        if template is None:
+            return self.source.format_message(raw_event)
+        literals, indexes = template
+        if not indexes:
+            return literals[0]
+        out = [literals[0]]
+        for index, literal in zip(indexes, literals[1:]):
+            out.append(str(insertion_strings[index]))
+            out.append(literal)
+        return ''.join(out)
+
+
+@functools.lru_cache(maxsize=1024)
+def _format_day(day):
+    return (_EPOCH + datetime.timedelta(days=day)).strftime('%Y-%m-%d')
+
+def format_epoch(epoch):
+    """epoch 초를 'YYYY-mm-dd HH:MM:SS' 문자열로 변환합니다 (시간대 변환 없음, 날짜 부분은 캐시)."""
+    day, seconds = divmod(epoch, 86400)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{_format_day(day)} {hours:02d}:{minutes:02d}:{seconds:02d}"
+
+def datetime_to_epoch(timestamp):
+    """datetime 의 벽시계 시각을 epoch 초로 변환합니다 (시간대 정보는 무시, format_epoch 의 역변환)."""
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.replace(tzinfo=None)
+    return (timestamp - _EPOCH) // _ONE_SECOND
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+def _pool_message(message):
+    """같은 메시지 문자열은 하나의 객체를 공유하도록 풀에서 찾아 반환합니다."""
+    pooled = _message_pool.get(message)
+    if pooled is None:
+        if len(_message_pool) >= MESSAGE_POOL_SIZE:
+            _message_pool.clear()
+        pooled = _message_pool[message] = message
+    return pooled
+
+
+class EventRecord(Mapping):
+    """
+    심각/오류 이벤트 레코드의 압축 표현.
+    시각은 epoch 초 int 로, Source/LogType 은 intern 된 문자열로, 메시지는 풀에서 공유되는 문자열로 보관하여
+    레코드당 dict 와 타임스탬프 문자열을 만들지 않습니다.
+    기존 코드와의 호환을 위해 읽기 전용 dict 처럼 record['Timestamp'], record.get('Message') 로도 접근할 수 있습니다.
+    origin 은 이벤트를 읽은 소스의 식별자(EventSource.origin)로, 이벤트 저장소의 중복 제거에만 쓰이며 FIELDS 에는 없습니다.
+    """
+    __slots__ = ('epoch', 'source', 'event_id', 'level_type', 'message', 'log_type', 'record_number', 'origin')
+
+    FIELDS = ('Timestamp', 'Source', 'EventID', 'LevelType', 'Message', 'LogType', 'RecordNumber')
+
+    def __init__(self, epoch, source, event_id, level_type, message, log_type, record_number=None, origin=None):
+        self.epoch = epoch
+        self.source = _intern(source)
+        self.event_id = event_id
+        self.level_type = level_type
+        self.message = _pool_message(message)
+        self.log_type = _intern(log_type)
+        self.record_number = record_number
+        self.origin = origin
+
+    @classmethod
+    def from_dict(cls, record):
+        """get_critical_errors 형식의 dict 를 EventRecord 로 변환합니다."""
+        timestamp = record.get('Timestamp')
+        epoch = datetime_to_epoch(datetime.datetime.fromisoformat(timestamp)) if timestamp else 0
+        return cls(epoch, record.get('Source', 'Unknown'), record.get('EventID', 0), record.get('LevelType'),
+                   record.get('Message') or "N/A", record.get('LogType', 'Unknown'), record.get('RecordNumber'))
+
+    @property
+    def timestamp(self):
+        return format_epoch(self.epoch)
+
+    def __getitem__(self, key):
+        if key == 'Timestamp':
+            return format_epoch(self.epoch)
+        if key == 'Source':
+            return self.source
+        if key == 'EventID':
+            return self.event_id
+        if key == 'LevelType':
+            return self.level_type
+        if key == 'Message':
+            return self.message
+        if key == 'LogType':
+            return self.log_type
+        if key == 'RecordNumber':
+            return self.record_number
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+    def __repr__(self):
+        return f"EventRecord({self.to_dict()!r})"
+
+    def to_row(self):
+        """FIELDS 순서의 값 목록 (CSV 한 행)."""
+        return [format_epoch(self.epoch), self.source, self.event_id, self.level_type, self.message,
+                self.log_type, self.record_number]
+
+    def to_dict(self):
+        return dict(zip(self.FIELDS, self.to_row()))
+
+
+_MESSAGE_SLOT = EventRecord.__dict__['message']
+
+
+class DeferredEventRecord(EventRecord):
+    """
+    메시지 포맷을 처음 읽을 때까지 미루는 EventRecord (지연 포맷 모드).
+    시각/Source/EventID/레코드 번호 같은 싼 필드만으로 집계하다가, 샘플이나 내보내기처럼 메시지가 실제로 필요할 때
+    formatter(raw_event) 로 한 번만 포맷하고 원본 이벤트 참조를 놓습니다.
+    포맷은 잠금 없이 이루어지므로 다른 스레드로 넘기는 레코드는 넘기기 전에 포맷해야 합니다 (BackgroundExporter 참고).
+    """
+    __slots__ = ('_raw_event', '_formatter')
+
+    def __init__(self, raw_event, formatter, origin=None):
+        self.epoch = datetime_to_epoch(raw_event.timestamp)
+        self.source = _intern(raw_event.source)
+        self.event_id = raw_event.event_id
+        self.level_type = raw_event.level_type
+        self.log_type = _intern(raw_event.log_type)
+        self.record_number = raw_event.record_number
+        self.origin = origin
+        _MESSAGE_SLOT.__set__(self, None)
+        self._raw_event = raw_event
+        self._formatter = formatter
+
+    @property
+    def message(self):
+        if self._formatter is not None:
+            message = self._formatter(self._raw_event)
+            _MESSAGE_SLOT.__set__(self, _pool_message(message.strip() if message else "N/A"))
+            self._raw_event = self._formatter = None
+        return _MESSAGE_SLOT.__get__(self)
+
+    @message.setter
+    def message(self, value):
+        _MESSAGE_SLOT.__set__(self, value)
+        self._raw_event = self._formatter = None
+
+    @property
+    def formatted(self):
+        """메시지가 이미 포맷되었는지 여부."""
+        return self._formatter is None
+
+
+# 속성으로 바로 읽을 수 있는 압축 레코드 타입 (type(record) in COMPACT_RECORD_TYPES 로 빠른 경로 선택)
+COMPACT_RECORD_TYPES = (EventRecord, DeferredEventRecord)
+
+
+def build_record(raw_event, message, origin=None):
+    """포맷된 메시지와 함께 get_critical_errors 레코드(EventRecord)를 만듭니다."""
+    return EventRecord(
+        epoch=datetime_to_epoch(raw_event.timestamp),
+        source=raw_event.source,
+        event_id=raw_event.event_id,
+        level_type=raw_event.level_type,
+        message=message.strip() if message else "N/A",
+        log_type=raw_event.log_type,
+        record_number=raw_event.record_number,
+        origin=origin
+    )
+
+
+def source_origin(source):
+    """레코드 번호가 유일한 범위를 나타내는 소스 식별자 (EventSource.origin, 없으면 name)."""
+    return source.origin or source.name
+
+
+def iter_records(sources, max_records=1000, read_workers=1, bookmarks=None, metrics=None, deferred=False,
+                 event_filter=None):
+    """
+    이벤트 소스 목록에서 레코드 dict 를 하나씩 반환합니다 (소스당 최대 max_records 건).
+    read_workers <= 1 이면 소스를 순서대로 읽고, 2 이상이면 소스(채널)마다 읽기 스레드를 두고
+    read_workers 개의 스레드 풀로 메시지를 포맷하며, 결과는 시간 역순으로 병합된 하나의 스트림이 됩니다.
+    bookmarks({소스 이름: {'record_number', 'timestamp'}})가 주어지면 북마크 이후의 새 이벤트만 읽고,
+    소스를 끝까지 읽은 뒤 가장 최신 이벤트로 북마크를 갱신합니다. 북마크가 있는 소스는 max_records 와 관계없이
+    북마크까지 모두 읽습니다 (_iter_source_events 참고).
+    metrics(PipelineMetrics) 가 주어지면 이벤트 읽기('read')와 메시지 포맷('format') 시간을 기록합니다.
+    deferred 가 True 이면 메시지를 포맷하지 않은 DeferredEventRecord 를 반환하며, 메시지는 처음 읽을 때
+    소스별 MessageTemplateCache 를 거쳐 포맷됩니다 (read_workers 가 2 이상이어도 포맷 스레드 풀은 사용하지 않음).
+    event_filter(EventFilter) 의 메시지 정규식은 메시지가 포맷된 레코드에 적용됩니다. 나머지 조건은 소스가 읽는 단계에서
+    적용하며, max_records 는 정규식을 적용하기 전 건수입니다.
+    """
+    message_predicate = event_filter.message_predicate if event_filter is not None else None
+    records = _iter_unfiltered_records(sources, max_records, read_workers, bookmarks, metrics, deferred)
+    if message_predicate is None:
+        yield from records
+        return
+    for record in records:
+        if message_predicate(record.message or ''):
+            yield record
+
+
+def _iter_unfiltered_records(sources, max_records, read_workers, bookmarks, metrics, deferred):
+    if deferred:
+        yield from _iter_deferred_records(sources, max_records, read_workers, bookmarks, metrics)
+        return
+
+    if read_workers <= 1:
+        for source in sources:
+            events = _iter_source_events(source, max_records, bookmarks)
+            format_message = source.format_message
+            origin = source_origin(source)
+            if metrics is not None:
+                events = metrics.timed_iter('read', events)
+                format_message = metrics.timed_call('format', format_message)
+            for raw_event in events:
+                yield build_record(raw_event, format_message(raw_event), origin)
+        return
+
+    yield from _iter_records_parallel(sources, max_records, read_workers, bookmarks, metrics)
+
+
+def _iter_source_events(source, max_records, bookmarks):
+    """
+    북마크를 적용해 소스의 이벤트를 읽고, 끝까지 읽으면 북마크를 갱신합니다.
+    북마크가 있으면 max_records 를 적용하지 않고 북마크까지 모두 읽습니다. 최신 max_records 건에서 멈춘 채 북마크를
+    가장 최신 레코드로 옮기면 그 사이의 이벤트는 다음 실행에서도 읽지 못하기 때문입니다 (넘으면 경고).
+    북마크가 없는 첫 실행은 최신 max_records 건만 읽습니다.
+    """
+    if bookmarks is None:
+        yield from source.iter_raw_events(max_records)
+        return
+
+    bookmark = bookmarks.get(source.name) or {}
+    after_record = bookmark.get('record_number')
+    newest_event = None
+    count = 0
+    for raw_event in source.iter_raw_events(max_records if after_record is None else None, after_record=after_record):
+        if raw_event.record_number is not None and (
+                newest_event is None or raw_event.record_number > newest_event.record_number):
+            newest_event = raw_event
+        count += 1
+        if max_records is not None and count == max_records + 1:
+            logger.warning(f"More than {max_records} new events since the bookmark (record {after_record}) in "
+                           f"'{source.name}'. Reading all of them so that none are skipped.")
+        yield raw_event
+
+    if newest_event is not None:
+        bookmarks[source.name] = {
+            'record_number': newest_event.record_number,
+            'timestamp': newest_event.timestamp.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+
+class _ChannelReader(threading.Thread):
+    """소스 하나를 백그라운드에서 읽어 제한된 크기의 대기열에 배치 단위로 넣는 스레드."""
+
+    def __init__(self, source, max_records, stop_event, bookmarks, metrics=None):
+        super().__init__(name=f"event-reader-{source.name}", daemon=True)
+        self.source = source
+        self.max_records = max_records
+        self.bookmarks = bookmarks
+        self.metrics = metrics
+        self._stop_event = stop_event
+        self._queue = queue.Queue(maxsize=READ_QUEUE_BATCHES)
+
+    def _put(self, item):
+        # 소비자가 중단되면 대기 중인 put 도 빠져나오도록 주기적으로 stop 이벤트를 확인
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def run(self):
+        events = _iter_source_events(self.source, self.max_records, self.bookmarks)
+        if self.metrics is not None:
+            events = self.metrics.timed_iter('read', events)
+        batch = []
+        try:
+            for raw_event in events:
+                batch.append((raw_event, self.source))
+                if len(batch) >= READ_BATCH_SIZE:
+                    if not self._put(batch):
+                        return
+                    batch = []
+            if batch:
+                self._put(batch)
+        except Exception as e:
+            logger.error(f"Unexpected error while reading '{self.source.name}': {e}", exc_info=True)
+        finally:
+            events.close()
+            self._put(_END_OF_STREAM)
+
+    def iter_events(self):
+        while True:
+            batch = self._queue.get()
+            if batch is _END_OF_STREAM:
+                return
+            yield from batch
+
+
+def _iter_merged_events(sources, max_records, bookmarks, metrics=None):
+    """소스(채널)마다 읽기 스레드를 두고 (raw_event, source) 를 시간 역순으로 병합해 반환합니다."""
+    stop_event = threading.Event()
+    readers = [_ChannelReader(source, max_records, stop_event, bookmarks, metrics) for source in sources]
+    for reader in readers:
+        reader.start()
+    try:
+        # 각 채널은 최신순이므로 타임스탬프 역순으로 병합
+        yield from heapq.merge(*(reader.iter_events() for reader in readers),
+                               key=lambda item: item[0].timestamp, reverse=True)
+    finally:
+        stop_event.set()
+        for reader in readers:
+            reader.join()
+
+def _iter_records_parallel(sources, max_records, format_workers, bookmarks, metrics=None):
+    # 소스별 포맷 함수 (metrics 가 있으면 포맷 스레드에서의 시간을 기록하는 래퍼)
+    format_functions = {id(source): (metrics.timed_call('format', source.format_message) if metrics is not None
+                                     else source.format_message) for source in sources}
+    origins = {id(source): source_origin(source) for source in sources}
+    logger.info(f"Reading {len(sources)} sources in parallel with {format_workers} format workers.")
+    merged = _iter_merged_events(sources, max_records, bookmarks, metrics)
+    max_pending = format_workers * FORMAT_PENDING_PER_WORKER
+    try:
+        with ThreadPoolExecutor(max_workers=format_workers, thread_name_prefix='event-format') as executor:
+            pending = deque()
+            for raw_event, source in merged:
+                pending.append((raw_event, executor.submit(format_functions[id(source)], raw_event),
+                                origins[id(source)]))
+                if len(pending) >= max_pending:
+                    done_event, future, origin = pending.popleft()
+                    yield build_record(done_event, future.result(), origin)
+            while pending:
+                done_event, future, origin = pending.popleft()
+                yield build_record(done_event, future.result(), origin)
+    finally:
+        merged.close()
+
+def _iter_deferred_records(sources, max_records, read_workers, bookmarks, metrics=None):
+    # 소스별 템플릿 캐시 포맷 함수 (포맷은 레코드의 메시지를 처음 읽을 때 실행되므로 'format' 시간도 그때 기록됨)
+    formatters = {}
+    for source in sources:
+        formatter = MessageTemplateCache(source).format
+        formatters[id(source)] = metrics.timed_call('format', formatter) if metrics is not None else formatter
+
+    if read_workers <= 1:
+        for source in sources:
+            events = _iter_source_events(source, max_records, bookmarks)
+            if metrics is not None:
+                events = metrics.timed_iter('read', events)
+            formatter = formatters[id(source)]
+            origin = source_origin(source)
+            for raw_event in events:
+                yield DeferredEventRecord(raw_event, formatter, origin)
+        return
+
+    logger.info(f"Reading {len(sources)} sources in parallel with deferred message formatting.")
+    origins = {id(source): source_origin(source) for source in sources}
+    merged = _iter_merged_events(sources, max_records, bookmarks, metrics)
+    try:
+        for raw_event, source in merged:
+            yield DeferredEventRecord(raw_event, formatters[id(source)], origins[id(source)])
+    finally:
+        merged.close()
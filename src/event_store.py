@@ -0,0 +1,222 @@
+import datetime
+import logging
+import os
+import sqlite3
+
+from src.error_analyzer import ErrorStats, RecurringErrorAggregator
+from src.event_sources import COMPACT_RECORD_TYPES, EventRecord
+
+logger = logging.getLogger(__name__)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+_EPOCH = datetime.datetime(1970, 1, 1)
+# 한 트랜잭션에 넣을 이벤트 수
+INSERT_BATCH_SIZE = 5000
+# 메시지 사전 조회 결과를 메모리에 보관할 최대 개수
+MESSAGE_CACHE_SIZE = 100000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY,
+    text TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    log_type TEXT NOT NULL,
+    source TEXT NOT NULL,
+    event_id INTEGER NOT NULL,
+    level_type INTEGER,
+    record_number INTEGER,
+    message_id INTEGER NOT NULL REFERENCES messages(id),
+    origin TEXT NOT NULL DEFAULT ''
+);
+"""
+
+_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_events_key_ts ON events (source, event_id, ts);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts, source, event_id, log_type);
+CREATE INDEX IF NOT EXISTS idx_events_log_type_ts ON events (log_type, ts);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_events_origin_record ON events (origin, log_type, record_number);
+"""
+
+def timestamp_to_epoch(timestamp):
+    """'YYYY-mm-dd HH:MM:SS' 문자열을 초 단위 정수로 변환합니다 (시간대 변환 없음)."""
+    return int((datetime.datetime.fromisoformat(timestamp) - _EPOCH).total_seconds())
+
+def epoch_to_timestamp(epoch):
+    return (_EPOCH + datetime.timedelta(seconds=epoch)).strftime(TIMESTAMP_FORMAT)
+
+
+class EventStore:
+    """
+    SQLite 기반 append-only 이벤트 저장소.
+    메시지 본문은 messages 사전 테이블로 중복 제거하고, (Source, EventID), 시각, 로그 종류에 인덱스를 둡니다.
+    같은 (소스 식별자, 로그 종류, 레코드 번호) 이벤트는 한 번만 저장되므로 같은 로그를 다시 읽어도 중복되지 않습니다.
+    소스 식별자(EventRecord.origin)는 .evtx 파일 경로 또는 호스트/채널이므로, 여러 파일이나 호스트의 같은 채널에서
+    레코드 번호가 겹쳐도 모두 저장됩니다. 이미 저장되어 건너뛴 이벤트 수는 ignored_count 로 셉니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.inserted_count = 0
+        self.ignored_count = 0
+        self._message_ids = {}
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._migrate()
+        self._conn.executescript(_INDEXES)
+
+    def _migrate(self):
+        """소스 식별자 열이 없던 저장소에 열을 추가하고 (로그 종류, 레코드 번호) 유일 인덱스를 제거합니다."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(events)")}
+        if 'origin' in columns:
+            return
+        logger.info(f"Upgrading event store '{self.path}': events are now unique per source (file or host/channel).")
+        with self._conn:
+            self._conn.execute("ALTER TABLE events ADD COLUMN origin TEXT NOT NULL DEFAULT ''")
+            self._conn.execute("DROP INDEX IF EXISTS idx_events_record")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    # --- 쓰기 ---
+    def _message_id(self, cursor, text):
+        message_id = self._message_ids.get(text)
+        if message_id is None:
+            cursor.execute("INSERT OR IGNORE INTO messages (text) VALUES (?)", (text,))
+            if cursor.rowcount == 1:
+                message_id = cursor.lastrowid
+            else:
+                message_id = cursor.execute("SELECT id FROM messages WHERE text = ?", (text,)).fetchone()[0]
+            if len(self._message_ids) >= MESSAGE_CACHE_SIZE:
+                self._message_ids.clear()
+            self._message_ids[text] = message_id
+        return message_id
+
+    def _insert(self, records):
+        with self._conn:
+            cursor = self._conn.cursor()
+            rows = [(
+                record.epoch,
+                record.log_type or 'Unknown',
+                record.source or 'Unknown',
+                record.event_id,
+                record.level_type,
+                record.record_number,
+                self._message_id(cursor, record.message or 'N/A'),
+                record.origin or ''
+            ) if type(record) in COMPACT_RECORD_TYPES else (
+                timestamp_to_epoch(record['Timestamp']),
+                record.get('LogType') or 'Unknown',
+                record.get('Source') or 'Unknown',
+                record.get('EventID', 0),
+                record.get('LevelType'),
+                record.get('RecordNumber'),
+                self._message_id(cursor, record.get('Message') or 'N/A'),
+                ''
+            ) for record in records]
+            cursor.executemany(
+                "INSERT OR IGNORE INTO events (ts, log_type, source, event_id, level_type, record_number, message_id, origin) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self.inserted_count += cursor.rowcount
+            self.ignored_count += len(rows) - cursor.rowcount
+
+    def append(self, records):
+        """레코드(이터러블)를 배치 단위로 저장합니다."""
+        batch = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= INSERT_BATCH_SIZE:
+                self._insert(batch)
+                batch = []
+        if batch:
+            self._insert(batch)
+
+    def passthrough(self, records):
+        """레코드를 저장소에 기록하면서 그대로 다시 내보냅니다 (단일 패스 파이프라인용)."""
+        batch = []
+        try:
+            for record in records:
+                batch.append(record)
+                if len(batch) >= INSERT_BATCH_SIZE:
+                    self._insert(batch)
+                    batch = []
+                yield record
+        finally:
+            if batch:
+                self._insert(batch)
+
+    # --- 조회 ---
+    @staticmethod
+    def _where(since=None, until=None, sources=None, event_ids=None, log_types=None):
+        clauses = []
+        params = []
+        if since:
+            clauses.append("e.ts >= ?")
+            params.append(timestamp_to_epoch(since))
+        if until:
+            clauses.append("e.ts <= ?")
+            params.append(timestamp_to_epoch(until))
+        for column, values in (('e.source', sources), ('e.event_id', event_ids), ('e.log_type', log_types)):
+            if values:
+                clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+                params.extend(values)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def query(self, since=None, until=None, sources=None, event_ids=None, log_types=None, limit=None):
+        """조건에 맞는 이벤트를 최신순으로 get_critical_errors 레코드 형태로 반환합니다."""
+        where, params = self._where(since, until, sources, event_ids, log_types)
+        sql = ("SELECT e.ts, e.source, e.event_id, e.level_type, m.text, e.log_type, e.record_number, e.origin "
+               "FROM events e JOIN messages m ON m.id = e.message_id" + where + " ORDER BY e.ts DESC")
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        for ts, source, event_id, level_type, message, log_type, record_number, origin in self._conn.execute(sql, params):
+            yield EventRecord(ts, source, event_id, level_type, message, log_type, record_number, origin or None)
+
+    def aggregate(self, since=None, until=None, log_types=None, top_n=None):
+        """
+        시간 구간의 반복 오류 집계를 SQL 로 계산해 RecurringErrorAggregator 로 반환합니다.
+        샘플 메시지는 상위 top_n 개(None 이면 전체) 식별자에 대해서만 인덱스로 조회합니다.
+        """
+        where, params = self._where(since, until, log_types=log_types)
+        sql = ("SELECT e.source, e.event_id, e.log_type, COUNT(*), MIN(e.ts), MAX(e.ts) FROM events e"
+               + where + " GROUP BY e.source, e.event_id, e.log_type")
+        aggregator = RecurringErrorAggregator()
+        for source, event_id, log_type, count, first_ts, last_ts in self._conn.execute(sql, params):
+            stats = aggregator.stats.get((source, event_id))
+            if stats is None:
+                stats = aggregator.stats[(source, event_id)] = ErrorStats()
+            first_seen = epoch_to_timestamp(first_ts)
+            last_seen = epoch_to_timestamp(last_ts)
+            stats.count += count
+            stats.log_type_counts[log_type] = stats.log_type_counts.get(log_type, 0) + count
+            if stats.first_timestamp is None or first_seen < stats.first_timestamp:
+                stats.first_timestamp = first_seen
+            if stats.last_timestamp is None or last_seen > stats.last_timestamp:
+                stats.last_timestamp = last_seen
+            aggregator.total_count += count
+
+        sample_keys = aggregator.most_common(top_n) if top_n is not None else aggregator.stats.items()
+        for (source, event_id), stats in sample_keys:
+            key_where, key_params = self._where(since, until, sources=[source], event_ids=[event_id], log_types=log_types)
+            row = self._conn.execute(
+                "SELECT e.ts, m.text FROM events e JOIN messages m ON m.id = e.message_id"
+                + key_where + " ORDER BY e.ts DESC LIMIT 1", key_params).fetchone()
+            if row:
+                stats.sample_timestamp = epoch_to_timestamp(row[0])
+                stats.sample_message = row[1]
+        return aggregator
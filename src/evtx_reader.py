@@ -0,0 +1,667 @@
+import datetime
+import logging
+import mmap
+import os
+import struct
+import uuid
+
+from src.event_sources import EventSource, RawEvent, build_record, iter_records
+
+logger = logging.getLogger(__name__)
+
+# --- EVTX 파일 구조 상수 ---
+EVTX_FILE_MAGIC = b'ElfFile\x00'
+EVTX_CHUNK_MAGIC = b'ElfChnk\x00'
+EVTX_RECORD_MAGIC = b'\x2a\x2a\x00\x00'
+FILE_HEADER_SIZE = 0x1000
+CHUNK_SIZE = 0x10000
+CHUNK_RECORDS_OFFSET = 0x200
+RECORD_HEADER_SIZE = 24
+
+# EVTX Level 값 (1: Critical, 2: Error, 3: Warning, 4: Information)
+LEVEL_CRITICAL = 1
+LEVEL_ERROR = 2
+# get_critical_errors 가 반환하는 LevelType 값과 동일 (win32evtlog.EVENTLOG_ERROR_TYPE)
+EVENTLOG_ERROR_TYPE = 1
+# .evtx Level -> 클래식 API EventType (LevelType). 심각/오류는 오류, 경고는 경고, 나머지는 정보
+_LEVEL_EVENT_TYPES = {LEVEL_CRITICAL: EVENTLOG_ERROR_TYPE, LEVEL_ERROR: EVENTLOG_ERROR_TYPE, 3: 2}
+EVENTLOG_INFORMATION_TYPE = 4
+
+# --- BinXML 토큰 ---
+TOKEN_EOF = 0x00
+TOKEN_OPEN_START_ELEMENT = 0x01
+TOKEN_CLOSE_START_ELEMENT = 0x02
+TOKEN_CLOSE_EMPTY_ELEMENT = 0x03
+TOKEN_END_ELEMENT = 0x04
+TOKEN_VALUE = 0x05
+TOKEN_ATTRIBUTE = 0x06
+TOKEN_CDATA_SECTION = 0x07
+TOKEN_CHAR_REF = 0x08
+TOKEN_ENTITY_REF = 0x09
+TOKEN_PI_TARGET = 0x0A
+TOKEN_PI_DATA = 0x0B
+TOKEN_TEMPLATE_INSTANCE = 0x0C
+TOKEN_NORMAL_SUBSTITUTION = 0x0D
+TOKEN_OPTIONAL_SUBSTITUTION = 0x0E
+TOKEN_FRAGMENT_HEADER = 0x0F
+TOKEN_MORE_BIT = 0x40
+
+# --- BinXML 값 타입 ---
+TYPE_NULL = 0x00
+TYPE_WSTRING = 0x01
+TYPE_STRING = 0x02
+TYPE_BINARY = 0x0E
+TYPE_GUID = 0x0F
+TYPE_SIZE_T = 0x10
+TYPE_FILETIME = 0x11
+TYPE_SYSTEMTIME = 0x12
+TYPE_SID = 0x13
+TYPE_HEX32 = 0x14
+TYPE_HEX64 = 0x15
+TYPE_BINXML = 0x21
+TYPE_ARRAY_BIT = 0x80
+
+# 고정 길이 숫자 타입 → struct 포맷
+_NUMERIC_FORMATS = {
+    0x03: 'b', 0x04: 'B', 0x05: 'h', 0x06: 'H', 0x07: 'i', 0x08: 'I',
+    0x09: 'q', 0x0A: 'Q', 0x0B: 'f', 0x0C: 'd', 0x0D: 'I',
+}
+_XML_ENTITIES = {'amp': '&', 'lt': '<', 'gt': '>', 'quot': '"', 'apos': "'"}
+_FILETIME_EPOCH = datetime.datetime(1601, 1, 1)
+
+
+class EvtxFormatError(Exception):
+    """EVTX 파일 구조가 예상과 다를 때 발생하는 예외."""
+
+
+class _Substitution:
+    """템플릿 안의 치환 자리 (레코드마다 값이 채워짐)."""
+    __slots__ = ('index', 'value_type', 'optional')
+
+    def __init__(self, index, value_type, optional):
+        self.index = index
+        self.value_type = value_type
+        self.optional = optional
+
+
+class _Element:
+    """파싱된 BinXML 요소. 텍스트/속성 값은 문자열 또는 _Substitution 조각의 목록."""
+    __slots__ = ('name', 'attrs', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.attrs = {}
+        self.children = []
+
+    def find(self, name):
+        for child in self.children:
+            if isinstance(child, _Element) and child.name == name:
+                return child
+        return None
+
+    def text_parts(self):
+        return [child for child in self.children if not isinstance(child, _Element)]
+
+
+class _CompiledTemplate:
+    """레코드 필드 추출에 필요한 경로를 미리 계산해 둔 템플릿."""
+    __slots__ = ('root', 'provider', 'event_id', 'qualifiers', 'level', 'time_created',
+                 'record_id', 'channel', 'event_data', 'user_data')
+
+    def __init__(self, root):
+        self.root = root
+        system = root.find('System') if root is not None else None
+        provider = system.find('Provider') if system is not None else None
+        event_id = system.find('EventID') if system is not None else None
+        time_created = system.find('TimeCreated') if system is not None else None
+
+        def _text(name):
+            element = system.find(name) if system is not None else None
+            return element.text_parts() if element is not None else []
+
+        self.provider = []
+        if provider is not None:
+            self.provider = provider.attrs.get('Name') or provider.attrs.get('EventSourceName') or []
+        self.event_id = event_id.text_parts() if event_id is not None else []
+        self.qualifiers = event_id.attrs.get('Qualifiers', []) if event_id is not None else []
+        self.level = _text('Level')
+        self.time_created = time_created.attrs.get('SystemTime', []) if time_created is not None else []
+        self.record_id = _text('EventRecordID')
+        self.channel = _text('Channel')
+
+        # EventData/Data 요소 목록: (Name 속성 조각, 값 조각)
+        self.event_data = []
+        self.user_data = None
+        if root is not None:
+            event_data = root.find('EventData')
+            if event_data is not None:
+                for child in event_data.children:
+                    if isinstance(child, _Element):
+                        self.event_data.append((child.attrs.get('Name', []), _flatten_parts(child)))
+                    else:
+                        self.event_data.append(([], [child]))
+            user_data = root.find('UserData')
+            if user_data is not None:
+                self.user_data = _flatten_parts(user_data)
+
+
+def _flatten_parts(element):
+    """요소 하위의 모든 텍스트 조각을 문서 순서대로 모은다."""
+    parts = []
+    for child in element.children:
+        if isinstance(child, _Element):
+            parts.extend(_flatten_parts(child))
+        else:
+            parts.append(child)
+    return parts
+
+
+def _filetime_to_datetime(filetime):
+    return _FILETIME_EPOCH + datetime.timedelta(microseconds=filetime // 10)
+
+
+class _SubstitutionValues:
+    """레코드의 치환 값 배열. 실제로 필요한 값만 지연 디코딩한다."""
+    __slots__ = ('_parser', '_decls', '_offsets', '_cache')
+
+    def __init__(self, parser, decls, offsets):
+        self._parser = parser
+        self._decls = decls
+        self._offsets = offsets
+        self._cache = {}
+
+    def get(self, index):
+        if index >= len(self._decls):
+            return None
+        if index not in self._cache:
+            size, value_type = self._decls[index]
+            self._cache[index] = self._parser.decode_value(self._offsets[index], size, value_type)
+        return self._cache[index]
+
+
+class _ChunkParser:
+    """청크 하나의 BinXML 파서. 이름/템플릿은 청크 단위로 캐시된다."""
+
+    def __init__(self, buf, chunk_offset):
+        self._buf = buf
+        self._base = chunk_offset
+        self._names = {}
+        self._templates = {}
+
+    # --- 공통 구조 ---
+    def _read_name(self, string_offset):
+        name = self._names.get(string_offset)
+        if name is None:
+            pos = self._base + string_offset
+            length = struct.unpack_from('<H', self._buf, pos + 6)[0]
+            name = bytes(self._buf[pos + 8:pos + 8 + length * 2]).decode('utf-16-le', 'replace')
+            self._names[string_offset] = name
+        return name
+
+    def _name_at(self, pos, string_offset):
+        """이름 참조를 해석하고, 이름이 인라인으로 정의된 경우 그 뒤 위치를 반환한다."""
+        name = self._read_name(string_offset)
+        if string_offset == pos - self._base:
+            length = struct.unpack_from('<H', self._buf, pos + 6)[0]
+            pos += 10 + length * 2
+        return name, pos
+
+    def _read_utf16(self, pos):
+        length = struct.unpack_from('<H', self._buf, pos)[0]
+        end = pos + 2 + length * 2
+        return bytes(self._buf[pos + 2:end]).decode('utf-16-le', 'replace'), end
+
+    # --- 요소/노드 파싱 ---
+    def _parse_element(self, pos):
+        buf = self._buf
+        token = buf[pos]
+        string_offset = struct.unpack_from('<I', buf, pos + 7)[0]
+        pos += 11
+        has_attributes = bool(token & TOKEN_MORE_BIT)
+        if has_attributes:
+            pos += 4  # 속성 목록 크기
+        name, pos = self._name_at(pos, string_offset)
+        element = _Element(name)
+
+        if has_attributes:
+            while True:
+                attr_token = buf[pos]
+                if attr_token & 0x0F != TOKEN_ATTRIBUTE:
+                    break
+                attr_offset = struct.unpack_from('<I', buf, pos + 1)[0]
+                attr_name, pos = self._name_at(pos + 5, attr_offset)
+                value, pos = self._parse_attribute_value(pos)
+                element.attrs[attr_name] = value
+                if not attr_token & TOKEN_MORE_BIT:
+                    break
+
+        close_token = buf[pos]
+        pos += 1
+        if close_token == TOKEN_CLOSE_EMPTY_ELEMENT:
+            return element, pos
+        if close_token != TOKEN_CLOSE_START_ELEMENT:
+            raise EvtxFormatError(f"Unexpected token 0x{close_token:02x} after element '{name}'")
+        pos = self._parse_content(pos, element.children)
+        return element, pos
+
+    def _parse_attribute_value(self, pos):
+        parts = []
+        token = self._buf[pos] & 0x0F
+        if token == TOKEN_VALUE:
+            text, pos = self._parse_value_node(pos)
+            parts.append(text)
+        elif token in (TOKEN_NORMAL_SUBSTITUTION, TOKEN_OPTIONAL_SUBSTITUTION):
+            sub, pos = self._parse_substitution_node(pos)
+            parts.append(sub)
+        elif token == TOKEN_CHAR_REF or token == TOKEN_ENTITY_REF:
+            text, pos = self._parse_reference(pos)
+            parts.append(text)
+        else:
+            raise EvtxFormatError(f"Unexpected attribute value token 0x{token:02x}")
+        return parts, pos
+
+    def _parse_value_node(self, pos):
+        value_type = self._buf[pos + 1]
+        if value_type != TYPE_WSTRING:
+            raise EvtxFormatError(f"Unsupported inline value type 0x{value_type:02x}")
+        return self._read_utf16(pos + 2)
+
+    def _parse_substitution_node(self, pos):
+        token = self._buf[pos] & 0x0F
+        index, value_type = struct.unpack_from('<HB', self._buf, pos + 1)
+        return _Substitution(index, value_type, token == TOKEN_OPTIONAL_SUBSTITUTION), pos + 4
+
+    def _parse_reference(self, pos):
+        token = self._buf[pos] & 0x0F
+        if token == TOKEN_CHAR_REF:
+            return chr(struct.unpack_from('<H', self._buf, pos + 1)[0]), pos + 3
+        string_offset = struct.unpack_from('<I', self._buf, pos + 1)[0]
+        name, pos = self._name_at(pos + 5, string_offset)
+        return _XML_ENTITIES.get(name, f'&{name};'), pos
+
+    def _parse_content(self, pos, children):
+        """EndElement(또는 EOF) 토큰까지 자식 노드를 읽어 children 에 추가한다."""
+        buf = self._buf
+        while True:
+            token = buf[pos] & 0x0F
+            if token == TOKEN_END_ELEMENT:
+                return pos + 1
+            if token == TOKEN_EOF:
+                return pos
+            if token == TOKEN_OPEN_START_ELEMENT:
+                child, pos = self._parse_element(pos)
+                children.append(child)
+            elif token == TOKEN_VALUE:
+                text, pos = self._parse_value_node(pos)
+                children.append(text)
+            elif token in (TOKEN_NORMAL_SUBSTITUTION, TOKEN_OPTIONAL_SUBSTITUTION):
+                sub, pos = self._parse_substitution_node(pos)
+                children.append(sub)
+            elif token == TOKEN_CDATA_SECTION:
+                text, pos = self._read_utf16(pos + 1)
+                children.append(text)
+            elif token in (TOKEN_CHAR_REF, TOKEN_ENTITY_REF):
+                text, pos = self._parse_reference(pos)
+                children.append(text)
+            elif token == TOKEN_PI_TARGET:
+                string_offset = struct.unpack_from('<I', buf, pos + 1)[0]
+                _, pos = self._name_at(pos + 5, string_offset)
+            elif token == TOKEN_PI_DATA:
+                _, pos = self._read_utf16(pos + 1)
+            else:
+                raise EvtxFormatError(f"Unexpected BinXML token 0x{buf[pos]:02x} at offset {pos}")
+
+    # --- 템플릿 / 프래그먼트 ---
+    def _template(self, template_offset):
+        template = self._templates.get(template_offset)
+        if template is None:
+            # 템플릿 정의: next_offset(4) + GUID(16) + data_length(4) + BinXML 데이터
+            pos = self._base + template_offset + 24
+            if self._buf[pos] == TOKEN_FRAGMENT_HEADER:
+                pos += 4
+            root = None
+            if self._buf[pos] & 0x0F == TOKEN_OPEN_START_ELEMENT:
+                root, _ = self._parse_element(pos)
+            template = _CompiledTemplate(root)
+            self._templates[template_offset] = template
+        return template
+
+    def parse_fragment(self, pos):
+        """레코드(또는 BinXML 치환 값)의 프래그먼트를 (템플릿, 치환 값) 으로 해석한다."""
+        buf = self._buf
+        if buf[pos] == TOKEN_FRAGMENT_HEADER:
+            pos += 4
+        if buf[pos] != TOKEN_TEMPLATE_INSTANCE:
+            # 템플릿 없이 요소가 직접 기록된 경우 (드묾)
+            root, _ = self._parse_element(pos)
+            return _CompiledTemplate(root), _SubstitutionValues(self, [], [])
+
+        template_offset = struct.unpack_from('<I', buf, pos + 6)[0]
+        pos += 10
+        template = self._template(template_offset)
+        if template_offset == pos - self._base:
+            data_length = struct.unpack_from('<I', buf, pos + 20)[0]
+            pos += 24 + data_length
+
+        count = struct.unpack_from('<I', buf, pos)[0]
+        pos += 4
+        raw_decls = struct.unpack_from('<' + 'HBx' * count, buf, pos)
+        pos += 4 * count
+        decls = []
+        offsets = []
+        for i in range(count):
+            size, value_type = raw_decls[2 * i], raw_decls[2 * i + 1]
+            decls.append((size, value_type))
+            offsets.append(pos)
+            pos += size
+        return template, _SubstitutionValues(self, decls, offsets)
+
+    def decode_value(self, pos, size, value_type):
+        buf = self._buf
+        if value_type == TYPE_NULL or size == 0:
+            return None
+        if value_type == TYPE_WSTRING:
+            return bytes(buf[pos:pos + size]).decode('utf-16-le', 'replace').rstrip('\x00')
+        if value_type == TYPE_STRING:
+            return bytes(buf[pos:pos + size]).decode('latin-1').rstrip('\x00')
+        if value_type in _NUMERIC_FORMATS:
+            return struct.unpack_from('<' + _NUMERIC_FORMATS[value_type], buf, pos)[0]
+        if value_type == TYPE_FILETIME:
+            return _filetime_to_datetime(struct.unpack_from('<Q', buf, pos)[0])
+        if value_type == TYPE_SYSTEMTIME:
+            year, month, _, day, hour, minute, second, msec = struct.unpack_from('<8H', buf, pos)
+            return datetime.datetime(year, month, day, hour, minute, second, msec * 1000)
+        if value_type == TYPE_GUID:
+            return '{' + str(uuid.UUID(bytes_le=bytes(buf[pos:pos + 16]))).upper() + '}'
+        if value_type == TYPE_HEX32 or (value_type == TYPE_SIZE_T and size == 4):
+            return f"0x{struct.unpack_from('<I', buf, pos)[0]:08x}"
+        if value_type == TYPE_HEX64 or value_type == TYPE_SIZE_T:
+            return f"0x{struct.unpack_from('<Q', buf, pos)[0]:016x}"
+        if value_type == TYPE_SID:
+            revision, sub_count = buf[pos], buf[pos + 1]
+            authority = int.from_bytes(bytes(buf[pos + 2:pos + 8]), 'big')
+            subs = struct.unpack_from(f'<{sub_count}I', buf, pos + 8)
+            return f"S-{revision}-{authority}" + ''.join(f"-{s}" for s in subs)
+        if value_type == TYPE_BINXML:
+            template, values = self.parse_fragment(pos)
+            if template.root is None:
+                return ''
+            texts = (self.render([part], values).strip() for part in _flatten_parts(template.root))
+            return '; '.join(text for text in texts if text)
+        if value_type == (TYPE_WSTRING | TYPE_ARRAY_BIT):
+            raw = bytes(buf[pos:pos + size]).decode('utf-16-le', 'replace')
+            return ', '.join(item for item in raw.split('\x00') if item)
+        if value_type & TYPE_ARRAY_BIT and (value_type & 0x7F) in _NUMERIC_FORMATS:
+            fmt = _NUMERIC_FORMATS[value_type & 0x7F]
+            item_count = size // struct.calcsize(fmt)
+            return ', '.join(str(v) for v in struct.unpack_from(f'<{item_count}{fmt}', buf, pos))
+        # 그 밖의 타입(Binary 등)은 16진 문자열로 표시
+        return bytes(buf[pos:pos + size]).hex().upper()
+
+    def record_filetime(self, pos):
+        """레코드 헤더에 기록된 FILETIME 정수 (시각 범위 비교용, datetime 변환 없음)."""
+        return struct.unpack_from('<Q', self._buf, pos + 16)[0]
+
+    def record_timestamp(self, pos):
+        """레코드 헤더에 기록된 FILETIME (TimeCreated 가 없을 때 사용)."""
+        return _filetime_to_datetime(struct.unpack_from('<Q', self._buf, pos + 16)[0])
+
+    def record_number(self, pos):
+        return struct.unpack_from('<Q', self._buf, pos + 8)[0]
+
+    def value(self, parts, values):
+        """조각이 치환 하나뿐이면 디코딩된 원본 값을, 아니면 렌더링된 문자열을 반환."""
+        if len(parts) == 1 and isinstance(parts[0], _Substitution):
+            return values.get(parts[0].index)
+        return self.render(parts, values)
+
+    def render(self, parts, values):
+        pieces = []
+        for part in parts:
+            if isinstance(part, _Substitution):
+                value = values.get(part.index)
+                if value is not None:
+                    pieces.append(str(value))
+            else:
+                pieces.append(part)
+        return ''.join(pieces)
+
+
+def _iter_chunk_offsets(buf, file_size):
+    """유효한 청크 오프셋을 첫 레코드 번호 순으로 반환한다."""
+    chunks = []
+    offset = FILE_HEADER_SIZE
+    while offset + CHUNK_SIZE <= file_size:
+        if buf[offset:offset + 8] == EVTX_CHUNK_MAGIC:
+            first_record = struct.unpack_from('<Q', buf, offset + 8)[0]
+            chunks.append((first_record, offset))
+        offset += CHUNK_SIZE
+    chunks.sort()
+    return [offset for _, offset in chunks]
+
+
+def _chunk_last_record_id(buf, chunk_offset):
+    return struct.unpack_from('<Q', buf, chunk_offset + 32)[0]
+
+
+def _iter_chunk_records(buf, chunk_offset):
+    """청크 안의 레코드 (오프셋, 크기) 목록. 레코드 헤더만 읽으므로 비용이 적다."""
+    records = []
+    free_space = struct.unpack_from('<I', buf, chunk_offset + 48)[0]
+    end = chunk_offset + min(max(free_space, CHUNK_RECORDS_OFFSET), CHUNK_SIZE)
+    pos = chunk_offset + CHUNK_RECORDS_OFFSET
+    while pos + RECORD_HEADER_SIZE <= end:
+        if buf[pos:pos + 4] != EVTX_RECORD_MAGIC:
+            break
+        size = struct.unpack_from('<I', buf, pos + 4)[0]
+        if size < RECORD_HEADER_SIZE + 4 or pos + size > end:
+            break
+        records.append((pos, size))
+        pos += size
+    return records
+
+
+def _datetime_to_filetime(value):
+    return (value - _FILETIME_EPOCH) // datetime.timedelta(microseconds=1) * 10
+
+def _utc_to_local(timestamp):
+    """UTC 시각(naive)을 로컬 시각(naive)으로 바꿉니다. 서머타임은 시각마다 적용하며, 변환할 수 없는 시각은 그대로 둡니다."""
+    try:
+        return timestamp.replace(tzinfo=datetime.timezone.utc).astimezone().replace(tzinfo=None)
+    except (OverflowError, OSError, ValueError):
+        return timestamp
+
+def _local_to_utc(timestamp):
+    """로컬 시각(naive)을 UTC 시각(naive)으로 바꿉니다 (_utc_to_local 의 역변환)."""
+    try:
+        return timestamp.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+    except (OverflowError, OSError, ValueError):
+        return timestamp
+
+
+def _build_raw_event(parser, pos, template, values, levels, default_log_type, header_predicate=None):
+    """레코드 필드를 추출해 RawEvent 로 만든다.
+    Level 이 대상이 아니거나 Source/EventID 가 header_predicate 를 통과하지 못하면
+    나머지 필드(삽입 문자열 등)를 디코딩하지 않고 None 을 반환한다."""
+    level = parser.value(template.level, values)
+    try:
+        level = int(level)
+    except (TypeError, ValueError):
+        return None
+    if level not in levels:
+        return None
+
+    event_id = parser.value(template.event_id, values)
+    try:
+        event_id = int(event_id)
+    except (TypeError, ValueError):
+        event_id = 0
+    source = parser.render(template.provider, values) or 'Unknown'
+    if header_predicate is not None and not header_predicate(source, event_id):
+        return None
+
+    timestamp = parser.value(template.time_created, values)
+    if not isinstance(timestamp, datetime.datetime):
+        timestamp = parser.record_timestamp(pos)
+    # 파일에는 UTC 로 기록되어 있으므로 라이브 로그(WindowsEventLogSource)와 같은 로컬 시각으로 맞춤
+    timestamp = _utc_to_local(timestamp)
+
+    # 메시지 DLL 없이 포맷할 수 없으므로 삽입 문자열(EventData/UserData)로 메시지를 구성
+    insertion_strings = []
+    for name_parts, data_parts in template.event_data:
+        text = parser.render(data_parts, values).strip()
+        if text:
+            name = parser.render(name_parts, values)
+            insertion_strings.append(f"{name}: {text}" if name else text)
+    if not insertion_strings and template.user_data is not None:
+        text = parser.render(template.user_data, values).strip()
+        if text:
+            insertion_strings.append(text)
+
+    return RawEvent(
+        timestamp=timestamp,
+        source=source,
+        event_id=event_id,
+        level_type=_LEVEL_EVENT_TYPES.get(level, EVENTLOG_INFORMATION_TYPE),
+        log_type=parser.render(template.channel, values) or default_log_type,
+        record_number=parser.record_number(pos),
+        insertion_strings=insertion_strings,
+    )
+
+
+class EvtxFileSource(EventSource):
+    """
+    내보낸 .evtx 파일 하나를 최신순으로 읽는 이벤트 소스.
+    파일은 mmap 으로 열고 청크 단위로 필요할 때만 파싱하므로 전체를 메모리에 올리지 않습니다.
+    Timestamp 는 파일의 UTC 시각을 라이브 로그와 같은 로컬 시각으로 바꾼 값이며, 메시지는 삽입 문자열로 구성됩니다 (메시지 DLL 미사용).
+    event_filter(EventFilter) 가 주어지면 levels 대신 필터의 수준을 사용하고, 시각 범위(로컬 시각)는 UTC 로 바꿔
+    BinXML 을 파싱하기 전에 레코드 헤더의 기록 시각으로, Source/EventID 는 삽입 문자열을 디코딩하기 전에 확인합니다.
+    """
+
+    def __init__(self, evtx_path, levels=(LEVEL_CRITICAL, LEVEL_ERROR), event_filter=None):
+        self.name = evtx_path
+        self.evtx_path = evtx_path
+        # 내보낸 파일마다 레코드 번호가 따로 매겨지므로 (여러 호스트의 같은 채널) 파일 경로로 구분
+        self.origin = os.path.abspath(evtx_path)
+        self.event_filter = event_filter
+        self.levels = event_filter.evtx_levels if event_filter is not None else levels
+
+    def iter_raw_events(self, max_records, after_record=None):
+        evtx_path = self.evtx_path
+        try:
+            file_size = os.path.getsize(evtx_path)
+        except OSError as e:
+            logger.error(f"Failed to open evtx file '{evtx_path}': {e}")
+            return
+        if file_size < FILE_HEADER_SIZE:
+            logger.error(f"'{evtx_path}' is too small to be an evtx file.")
+            return
+
+        with open(evtx_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+            if buf[:8] != EVTX_FILE_MAGIC:
+                logger.error(f"'{evtx_path}' is not a valid evtx file (bad signature).")
+                return
+
+            # Channel 요소가 없는 레코드는 파일 이름을 로그 종류로 사용
+            default_log_type = os.path.splitext(os.path.basename(evtx_path))[0]
+            chunk_offsets = _iter_chunk_offsets(buf, file_size)
+            if max_records is None:
+                logger.info(f"Found {len(chunk_offsets)} chunks in '{evtx_path}'. Reading all new error events.")
+            else:
+                logger.info(f"Found {len(chunk_offsets)} chunks in '{evtx_path}'. Reading up to {max_records} recent error events.")
+            if after_record is not None and chunk_offsets:
+                newest_record = max(_chunk_last_record_id(buf, offset) for offset in chunk_offsets)
+                if newest_record < after_record:
+                    logger.warning(f"'{evtx_path}' does not continue the bookmarked records. Ignoring bookmark (record {after_record}).")
+                    after_record = None
+            events_read_count = 0
+            processed_count = 0
+            header_predicate = None
+            since = until = None
+            if self.event_filter is not None:
+                header_predicate = self.event_filter.header_predicate
+                since, until = (None if bound is None else _datetime_to_filetime(_local_to_utc(bound))
+                                for bound in self.event_filter.time_bounds())
+
+            reached_bookmark = False
+            reached_since = False
+            reached_limit = False
+            for chunk_offset in reversed(chunk_offsets):
+                if after_record is not None and _chunk_last_record_id(buf, chunk_offset) <= after_record:
+                    reached_bookmark = True
+                    break
+                parser = _ChunkParser(buf, chunk_offset)
+                for pos, _size in reversed(_iter_chunk_records(buf, chunk_offset)):
+                    # 레코드 번호는 헤더에 있으므로 BinXML 을 파싱하기 전에 북마크를 확인
+                    if after_record is not None and parser.record_number(pos) <= after_record:
+                        reached_bookmark = True
+                        break
+                    processed_count += 1
+                    if since is not None or until is not None:
+                        filetime = parser.record_filetime(pos)
+                        if since is not None and filetime < since:
+                            # 최신순으로 읽으므로 이후 레코드는 모두 since 이전
+                            reached_since = True
+                            break
+                        if until is not None and filetime > until:
+                            continue
+                    try:
+                        template, values = parser.parse_fragment(pos + RECORD_HEADER_SIZE)
+                        raw_event = _build_raw_event(parser, pos, template, values, self.levels, default_log_type,
+                                                     header_predicate)
+                    except (EvtxFormatError, struct.error, ValueError, IndexError) as parse_err:
+                        logger.warning(f"Could not parse record at offset {pos} in '{evtx_path}': {parse_err}")
+                        continue
+                    if raw_event is None:
+                        continue
+                    yield raw_event
+                    events_read_count += 1
+                    if max_records is not None and events_read_count >= max_records:
+                        logger.info(f"Reached max_records limit ({max_records}) for '{evtx_path}'.")
+                        reached_limit = True
+                        break
+                if reached_limit or reached_bookmark or reached_since:
+                    break
+            if reached_bookmark:
+                logger.info(f"Reached bookmark (record {after_record}) for '{evtx_path}'.")
+            if reached_since:
+                logger.info(f"Reached records older than the filter start time in '{evtx_path}'. Stopping.")
+
+            logger.info(f"Finished reading '{evtx_path}'. Found {events_read_count} error events out of {processed_count} processed.")
+
+    def format_message(self, raw_event):
+        return self.format_with_inserts(raw_event, raw_event.insertion_strings)
+
+    def format_with_inserts(self, raw_event, insertion_strings):
+        return '; '.join(insertion_strings) if insertion_strings else "N/A"
+
+
+def iter_evtx_errors(evtx_path, max_records=1000, levels=(LEVEL_CRITICAL, LEVEL_ERROR)):
+    """내보낸 .evtx 파일에서 심각/오류 이벤트를 최신순으로 하나씩 반환하는 제너레이터."""
+    source = EvtxFileSource(evtx_path, levels=levels)
+    for raw_event in source.iter_raw_events(max_records):
+        yield build_record(raw_event, source.format_message(raw_event), source.origin)
+
+
+def get_critical_errors_from_evtx(evtx_paths, max_records=1000, read_workers=1, bookmarks=None, metrics=None,
+                                 deferred=False, event_filter=None):
+    """여러 .evtx 파일에서 심각/오류 이벤트를 읽어 get_critical_errors 와 같은 목록으로 반환합니다."""
+    return list(iter_critical_errors_from_evtx(evtx_paths, max_records=max_records, read_workers=read_workers,
+                                               bookmarks=bookmarks, metrics=metrics, deferred=deferred,
+                                               event_filter=event_filter))
+
+
+def iter_critical_errors_from_evtx(evtx_paths, max_records=1000, read_workers=1, bookmarks=None, metrics=None,
+                                   deferred=False, event_filter=None):
+    """
+    여러 .evtx 파일의 심각/오류 이벤트를 하나씩 반환하는 제너레이터 (파일당 max_records 건).
+    deferred, event_filter 는 iter_records 와 EvtxFileSource 참고 (필터가 없으면 심각/오류 수준만 읽음).
+    """
+    total_count = 0
+    logger.info(f"Attempting to read evtx files: {', '.join(evtx_paths)}")
+    sources = [EvtxFileSource(evtx_path, event_filter=event_filter) for evtx_path in evtx_paths]
+    for record in iter_records(sources, max_records=max_records, read_workers=read_workers,
+                               bookmarks=bookmarks, metrics=metrics, deferred=deferred, event_filter=event_filter):
+        total_count += 1
+        yield record
+    logger.info(f"Total critical/error events collected: {total_count}")
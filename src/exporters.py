@@ -0,0 +1,331 @@
+import gzip
+import importlib.util
+import io
+import json
+import logging
+import os
+import zipfile
+
+# numpy 는 열 기반(columnar) 형식을 쓸 때 _load_numpy 로 불러옴. 없으면 해당 형식만 비활성화
+np = None
+
+try:
+    import zstandard
+except ImportError:
+    # zstandard 가 없으면 zstd 압축 대신 gzip 사용
+    zstandard = None
+
+from src.background_writer import BackgroundExporter
+from src.event_log_processor import CSV_FIELDNAMES, CriticalLogCsvWriter
+from src.event_sources import COMPACT_RECORD_TYPES, EventRecord
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = ('csv', 'ndjson', 'columnar', 'none')
+NDJSON_COMPRESSIONS = ('gzip', 'zstd', 'none')
+# 한 번에 인코딩/기록하는 레코드 수 (열 기반 형식에서는 청크 하나 = 행 그룹 하나)
+EXPORT_CHUNK_SIZE = 8192
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+# 열 기반 형식 버전과 정수 열의 빈 값(None) 표시
+COLUMNAR_VERSION = 1
+COLUMNAR_NULL = -1
+# 열 기반 형식의 열 구성: 사전 인코딩 열(코드 + 청크별 사전)과 정수 열
+_DICTIONARY_COLUMNS = ('Source', 'Message', 'LogType')
+_INTEGER_COLUMNS = ('Timestamp', 'EventID', 'LevelType', 'RecordNumber')
+
+
+def _load_numpy():
+    """numpy 를 불러와 반환합니다 (설치되어 있지 않으면 None)."""
+    global np
+    if np is None and importlib.util.find_spec('numpy') is not None:
+        import numpy
+        np = numpy
+    return np
+
+def _as_event_record(record):
+    return record if type(record) in COMPACT_RECORD_TYPES else EventRecord.from_dict(record)
+
+
+class _ChunkedExporter:
+    """
+    레코드를 EXPORT_CHUNK_SIZE 건씩 모아 한 번에 기록하는 exporter 의 공통 부분.
+    CriticalLogCsvWriter 와 같은 인터페이스(write, passthrough, close, count, bytes_written)를 제공하며,
+    첫 청크를 기록할 때 파일을 열고 청크 하나 이상의 레코드를 메모리에 보관하지 않습니다.
+    """
+
+    def __init__(self, filename, chunk_size=EXPORT_CHUNK_SIZE):
+        self.filename = filename
+        self.chunk_size = chunk_size
+        self.count = 0 # 전달받은 레코드 수
+        self.bytes_written = 0 # 닫은 뒤의 파일 크기
+        self._chunk = []
+        self._opened = False
+        self._failed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False
+
+    def write(self, record):
+        """레코드 한 건을 추가합니다. 파일 오류가 발생해도 분석이 계속되도록 예외를 전파하지 않습니다."""
+        self.count += 1
+        if self._failed:
+            return
+        self._chunk.append(record)
+        if len(self._chunk) >= self.chunk_size:
+            self._flush()
+
+    def passthrough(self, records):
+        """레코드를 기록하면서 그대로 다시 내보냅니다 (단일 패스 파이프라인용)."""
+        for record in records:
+            self.write(record)
+            yield record
+
+    def _flush(self):
+        chunk, self._chunk = self._chunk, []
+        if not chunk or self._failed:
+            return
+        try:
+            if not self._opened:
+                os.makedirs(os.path.dirname(self.filename) or '.', exist_ok=True)
+                logger.info(f"Saving critical logs to '{self.filename}'...")
+                self._open()
+                self._opened = True
+            self._write_chunk(chunk)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to save critical logs to file '{self.filename}': {e}", exc_info=True)
+            self._failed = True
+
+    def close(self):
+        self._flush()
+        if self._opened:
+            try:
+                self._close()
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed to save critical logs to file '{self.filename}': {e}", exc_info=True)
+                self._failed = True
+            self._opened = False
+            try:
+                self.bytes_written = os.path.getsize(self.filename)
+            except OSError:
+                pass
+            if not self._failed:
+                logger.info(f"Successfully saved {self.count} critical logs to '{self.filename}'.")
+        elif self.count == 0:
+            logger.warning("No critical logs found to save.")
+
+    def _open(self):
+        raise NotImplementedError
+
+    def _write_chunk(self, chunk):
+        raise NotImplementedError
+
+    def _close(self):
+        raise NotImplementedError
+
+
+class NdjsonExporter(_ChunkedExporter):
+    """레코드를 한 줄에 JSON 객체 하나씩(NDJSON) gzip/zstd 스트림으로 압축해 기록합니다."""
+
+    def __init__(self, filename, compression='gzip', chunk_size=EXPORT_CHUNK_SIZE):
+        super().__init__(filename, chunk_size)
+        self.compression = compression
+        self._encoder = json.JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+        self._raw = None
+        self._stream = None
+
+    def _open(self):
+        self._raw = open(self.filename, 'wb')
+        if self.compression == 'gzip':
+            self._stream = gzip.GzipFile(fileobj=self._raw, mode='wb', compresslevel=GZIP_LEVEL)
+        elif self.compression == 'zstd':
+            self._stream = zstandard.ZstdCompressor(level=ZSTD_LEVEL).stream_writer(self._raw)
+        else:
+            self._stream = self._raw
+
+    def _write_chunk(self, chunk):
+        encode = self._encoder.encode
+        lines = [encode(record.to_dict() if type(record) in COMPACT_RECORD_TYPES
+                        else {field: record.get(field) for field in CSV_FIELDNAMES}) for record in chunk]
+        lines.append('')
+        self._stream.write('\n'.join(lines).encode('utf-8'))
+
+    def _close(self):
+        try:
+            self._stream.close()
+        finally:
+            if not self._raw.closed:
+                self._raw.close()
+
+
+class ColumnarExporter(_ChunkedExporter):
+    """
+    레코드를 청크(행 그룹) 단위의 열 배열로 기록하는 열 기반 형식 (Parquet 와 비슷한 구조, numpy 필요).
+    파일은 압축된 zip 이며, 청크마다 'chunk_000000/<열>.npy' 배열과 사전 인코딩 열의
+    'chunk_000000/<열>.dict.json' 사전(코드 -> 값)을 두고, 마지막에 'manifest.json' 을 기록합니다.
+    Timestamp 는 epoch 초, 정수 열의 빈 값은 COLUMNAR_NULL 입니다.
+    """
+
+    def __init__(self, filename, chunk_size=EXPORT_CHUNK_SIZE):
+        if _load_numpy() is None:
+            raise ImportError("numpy is required for columnar export.")
+        super().__init__(filename, chunk_size)
+        self._zip = None
+        self._chunk_count = 0
+
+    def _open(self):
+        self._zip = zipfile.ZipFile(self.filename, 'w', compression=zipfile.ZIP_DEFLATED)
+
+    def _write_array(self, name, array):
+        with self._zip.open(name, 'w', force_zip64=True) as f:
+            np.lib.format.write_array(f, array, allow_pickle=False)
+
+    def _write_chunk(self, chunk):
+        records = [_as_event_record(record) for record in chunk]
+        prefix = f"chunk_{self._chunk_count:06d}"
+        null = COLUMNAR_NULL
+        integer_columns = {
+            'Timestamp': [record.epoch for record in records],
+            'EventID': [null if record.event_id is None else record.event_id for record in records],
+            'LevelType': [null if record.level_type is None else record.level_type for record in records],
+            'RecordNumber': [null if record.record_number is None else record.record_number for record in records],
+        }
+        for column in _INTEGER_COLUMNS:
+            self._write_array(f"{prefix}/{column}.npy", np.array(integer_columns[column], dtype=np.int64))
+
+        for column, attribute in zip(_DICTIONARY_COLUMNS, ('source', 'message', 'log_type')):
+            dictionary = {}
+            codes = [dictionary.setdefault(getattr(record, attribute), len(dictionary)) for record in records]
+            self._write_array(f"{prefix}/{column}.npy", np.array(codes, dtype=np.int32))
+            self._zip.writestr(f"{prefix}/{column}.dict.json", json.dumps(list(dictionary), ensure_ascii=False))
+        self._chunk_count += 1
+
+    def _close(self):
+        manifest = {
+            'Format': 'event-columnar',
+            'Version': COLUMNAR_VERSION,
+            'Rows': self.count,
+            'Chunks': self._chunk_count,
+            'Columns': CSV_FIELDNAMES,
+            'DictionaryColumns': list(_DICTIONARY_COLUMNS),
+            'NullValue': COLUMNAR_NULL
+        }
+        try:
+            self._zip.writestr('manifest.json', json.dumps(manifest))
+        finally:
+            self._zip.close()
+
+
+class NullExporter:
+    """
+    파일을 기록하지 않고 레코드 수만 세는 exporter ('none' 형식).
+    지연 포맷 모드와 함께 쓰면 메시지 포맷이 반복 오류 샘플로 남는 레코드로 한정됩니다.
+    """
+    filename = None
+
+    def __init__(self):
+        self.count = 0
+        self.bytes_written = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def write(self, record):
+        self.count += 1
+
+    def passthrough(self, records):
+        for record in records:
+            self.count += 1
+            yield record
+
+    def close(self):
+        pass
+
+
+def iter_ndjson_records(filename):
+    """NdjsonExporter 가 기록한 파일(.ndjson, .ndjson.gz, .ndjson.zst)의 레코드 dict 를 하나씩 반환합니다."""
+    if filename.endswith('.gz'):
+        f = gzip.open(filename, 'rt', encoding='utf-8')
+    elif filename.endswith('.zst'):
+        if zstandard is None:
+            raise ImportError("zstandard is required to read .zst files.")
+        f = io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(filename, 'rb'), closefd=True),
+                             encoding='utf-8')
+    else:
+        f = open(filename, 'r', encoding='utf-8')
+    with f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_columnar_records(filename):
+    """ColumnarExporter 가 기록한 파일의 레코드를 청크 단위로 읽어 EventRecord 로 하나씩 반환합니다."""
+    if _load_numpy() is None:
+        raise ImportError("numpy is required to read columnar files.")
+    with zipfile.ZipFile(filename) as archive:
+        manifest = json.loads(archive.read('manifest.json'))
+        if manifest.get('Version') != COLUMNAR_VERSION:
+            raise ValueError(f"Unsupported columnar file version: {manifest.get('Version')}")
+        null = manifest.get('NullValue', COLUMNAR_NULL)
+        for index in range(manifest['Chunks']):
+            prefix = f"chunk_{index:06d}"
+            columns = {}
+            for column in _INTEGER_COLUMNS + _DICTIONARY_COLUMNS:
+                with archive.open(f"{prefix}/{column}.npy") as f:
+                    columns[column] = np.lib.format.read_array(f, allow_pickle=False).tolist()
+            for column in _DICTIONARY_COLUMNS:
+                dictionary = json.loads(archive.read(f"{prefix}/{column}.dict.json"))
+                columns[column] = [dictionary[code] for code in columns[column]]
+            for epoch, event_id, level_type, record_number, source, message, log_type in zip(
+                    *(columns[column] for column in _INTEGER_COLUMNS + _DICTIONARY_COLUMNS)):
+                yield EventRecord(epoch, source, event_id, None if level_type == null else level_type, message,
+                                  log_type, None if record_number == null else record_number)
+
+
+def create_exporter(export_format, base_filename, compression='gzip', background=False, metrics=None):
+    """
+    내보내기 형식에 맞는 exporter 를 만듭니다 (base_filename 에 형식별 확장자를 붙임).
+    export_format: 'csv'(기본), 'ndjson'(compression: gzip/zstd/none), 'columnar', 'none'(기록하지 않음).
+    사용할 수 없는 형식/압축은 경고 후 CSV/gzip 으로 대체합니다.
+    background 가 True 이면 파일에 기록하는 exporter 를 BackgroundExporter 로 감싸 별도 스레드에서 기록합니다.
+    """
+    exporter = _create_exporter(export_format, base_filename, compression)
+    if background and not isinstance(exporter, NullExporter):
+        return BackgroundExporter(exporter, metrics=metrics)
+    return exporter
+
+def _create_exporter(export_format, base_filename, compression):
+    export_format = (export_format or 'csv').strip().lower()
+    if export_format not in EXPORT_FORMATS:
+        logger.warning(f"Unknown export format '{export_format}'. Falling back to csv.")
+        export_format = 'csv'
+
+    if export_format == 'none':
+        logger.info("Export disabled (export format 'none'). Collected events are not saved to a file.")
+        return NullExporter()
+
+    if export_format == 'ndjson':
+        compression = (compression or 'none').strip().lower()
+        if compression not in NDJSON_COMPRESSIONS:
+            logger.warning(f"Unknown export compression '{compression}'. Falling back to gzip.")
+            compression = 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            logger.warning("zstandard is not installed. Falling back to gzip compression.")
+            compression = 'gzip'
+        extension = {'gzip': '.ndjson.gz', 'zstd': '.ndjson.zst', 'none': '.ndjson'}[compression]
+        return NdjsonExporter(base_filename + extension, compression=compression)
+
+    if export_format == 'columnar':
+        if _load_numpy() is not None:
+            return ColumnarExporter(base_filename + '.columnar.zip')
+        logger.warning("numpy is not installed. Falling back to csv export.")
+
+    return CriticalLogCsvWriter(base_filename + '.csv')
@@ -0,0 +1,248 @@
+import csv
+import heapq
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from src.error_analyzer import ErrorStats, RecurringErrorAggregator, summarize_recurring_errors
+from src.event_sources import EventRecord, format_epoch
+from src.evtx_reader import iter_critical_errors_from_evtx
+from src.exporters import iter_columnar_records, iter_ndjson_records
+from src.log_template_miner import LogTemplateMiner
+
+logger = logging.getLogger(__name__)
+
+# 호스트별 내보내기 파일 확장자 -> 형식 (긴 확장자를 먼저 비교)
+FLEET_FILE_FORMATS = (
+    ('.ndjson.gz', 'ndjson'),
+    ('.ndjson.zst', 'ndjson'),
+    ('.columnar.zip', 'columnar'),
+    ('.ndjson', 'ndjson'),
+    ('.evtx', 'evtx'),
+    ('.csv', 'csv'),
+)
+# 오류별 발생 시각 히스토그램 구간 (초)
+DEFAULT_HISTOGRAM_SECONDS = 3600
+# 오류별 상세 정보에 싣는 발생 횟수 상위 호스트 수
+DEFAULT_TOP_HOSTS = 10
+
+
+def _export_format(filename):
+    lowered = filename.lower()
+    for extension, file_format in FLEET_FILE_FORMATS:
+        if lowered.endswith(extension):
+            return file_format, filename[:-len(extension)]
+    return None, None
+
+def discover_fleet_exports(root):
+    """
+    root 아래의 호스트별 내보내기 파일을 찾아 (호스트, 경로, 형식) 목록을 반환합니다.
+    호스트 이름은 root 바로 아래 디렉토리 이름이며 (root/<호스트>/.../*.evtx),
+    root 에 바로 있는 파일은 확장자를 뺀 파일 이름을 호스트 이름으로 사용합니다.
+    """
+    exports = []
+    for directory, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        relative = os.path.relpath(directory, root)
+        for filename in sorted(filenames):
+            file_format, stem = _export_format(filename)
+            if file_format is None:
+                continue
+            host = stem if relative == '.' else relative.split(os.sep)[0]
+            exports.append((host, os.path.join(directory, filename), file_format))
+    return exports
+
+def _optional_int(value):
+    return int(value) if value not in (None, '') else None
+
+def _iter_csv_records(path):
+    """CriticalLogCsvWriter 가 기록한 CSV 의 행을 EventRecord 로 반환합니다."""
+    with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+        for row in csv.DictReader(f):
+            yield EventRecord.from_dict(dict(row, EventID=_optional_int(row.get('EventID')) or 0,
+                                             LevelType=_optional_int(row.get('LevelType')),
+                                             RecordNumber=_optional_int(row.get('RecordNumber'))))
+
+def _iter_export_records(path, file_format, max_records, event_filter=None):
+    if file_format == 'evtx':
+        return iter_critical_errors_from_evtx([path], max_records=max_records, event_filter=event_filter)
+    if file_format == 'csv':
+        records = _iter_csv_records(path)
+    elif file_format == 'ndjson':
+        records = (EventRecord.from_dict(record) for record in iter_ndjson_records(path))
+    else:
+        records = iter_columnar_records(path)
+    if event_filter is not None:
+        # 내보낸 파일은 이미 만들어진 레코드이므로 레코드 단위로 거름 (Timestamp 는 .evtx 와 같은 로컬 시각)
+        records = filter(event_filter.record_predicate(), records)
+    return (record for _, record in zip(range(max_records), records))
+
+def analyze_export_file(host, path, file_format, group_by_template=False, max_records=1000,
+                        histogram_seconds=DEFAULT_HISTOGRAM_SECONDS, event_filter=None):
+    """
+    내보내기 파일 하나를 집계해 병합 가능한 부분 집계를 반환합니다 (프로세스 풀 작업 단위).
+    반환값은 프로세스 사이로 작게 전달되도록 오류 종류별 통계(ErrorStats.to_dict)와
+    발생 시각 히스토그램({구간 번호: 건수})만 담은 dict 입니다. 읽기 실패 시 'Error' 에 사유를 담습니다.
+    event_filter(EventFilter) 가 주어지면 .evtx 는 읽는 단계에서, 다른 형식은 레코드 단위로 거릅니다.
+    """
+    started = time.perf_counter()
+    template_miner = LogTemplateMiner() if group_by_template else None
+    aggregator = RecurringErrorAggregator()
+    histograms = {} # 식별자 -> {구간 번호: 건수}
+    error = None
+    try:
+        for record in _iter_export_records(path, file_format, max_records, event_filter):
+            cluster = template_miner.add_message(record.message or '') if template_miner is not None else None
+            aggregator.add(record, cluster=cluster)
+            identifier = (record.source, record.event_id) if cluster is None else (
+                record.source, record.event_id, cluster.cluster_id)
+            histogram = histograms.get(identifier)
+            if histogram is None:
+                histogram = histograms[identifier] = {}
+            bucket = record.epoch // histogram_seconds
+            histogram[bucket] = histogram.get(bucket, 0) + 1
+    except Exception as e:
+        # 손상된 파일 하나로 전체 분석을 중단하지 않음 (그때까지 읽은 레코드는 집계에 포함)
+        logger.error(f"Failed to read fleet export '{path}': {e}", exc_info=True)
+        error = str(e)
+
+    errors = []
+    for identifier, stats in aggregator.stats.items():
+        errors.append(dict(stats.to_dict(), Source=identifier[0], EventID=identifier[1],
+                           Histogram=histograms[identifier]))
+    return {
+        'Host': host,
+        'Path': path,
+        'Events': aggregator.total_count,
+        'Seconds': time.perf_counter() - started,
+        'Error': error,
+        'Errors': errors
+    }
+
+
+class FleetAggregator:
+    """
+    파일(호스트)별 부분 집계를 합쳐 전체 상위 N개 반복 오류와 오류별 호스트 분포/시각 히스토그램을 만듭니다.
+    템플릿 기준 그룹핑 시 템플릿 ID 는 파일마다 따로 매겨지므로, 부분 집계의 템플릿 문자열을
+    공용 LogTemplateMiner 에 다시 넣어 전체에서 같은 템플릿 ID 로 맞춥니다.
+    """
+
+    def __init__(self, group_by_template=False, histogram_seconds=DEFAULT_HISTOGRAM_SECONDS):
+        self.template_miner = LogTemplateMiner() if group_by_template else None
+        self.histogram_seconds = histogram_seconds
+        self.aggregator = RecurringErrorAggregator(template_miner=self.template_miner)
+        self.host_counts = {} # 식별자 -> {호스트: 건수}
+        self.histograms = {} # 식별자 -> {구간 번호: 건수}
+        self.hosts = {} # 호스트 -> {'Files', 'Events', 'FailedFiles', 'Seconds'}
+
+    @property
+    def total_count(self):
+        return self.aggregator.total_count
+
+    def add_partial(self, partial):
+        """analyze_export_file 의 부분 집계 하나를 합칩니다."""
+        host = partial['Host']
+        host_summary = self.hosts.get(host)
+        if host_summary is None:
+            host_summary = self.hosts[host] = {'Files': 0, 'Events': 0, 'FailedFiles': 0, 'Seconds': 0.0}
+        host_summary['Files'] += 1
+        host_summary['Events'] += partial['Events']
+        host_summary['Seconds'] += partial['Seconds']
+        if partial.get('Error'):
+            host_summary['FailedFiles'] += 1
+
+        for entry in partial['Errors']:
+            identifier = (entry['Source'], entry['EventID'])
+            cluster = None
+            if self.template_miner is not None and entry.get('Template') is not None:
+                cluster = self.template_miner.add_message(entry['Template'])
+                identifier += (cluster.cluster_id,)
+            stats = self.aggregator.stats.get(identifier)
+            if stats is None:
+                stats = self.aggregator.stats[identifier] = ErrorStats()
+            stats.merge(ErrorStats.from_dict(entry))
+            if cluster is not None:
+                stats.template = cluster.template
+
+            counts = self.host_counts.setdefault(identifier, {})
+            counts[host] = counts.get(host, 0) + entry['Count']
+            histogram = self.histograms.setdefault(identifier, {})
+            for bucket, count in entry['Histogram'].items():
+                histogram[bucket] = histogram.get(bucket, 0) + count
+        self.aggregator.total_count += partial['Events']
+        return self
+
+    def summarize(self, top_n=5, top_hosts=DEFAULT_TOP_HOSTS):
+        """
+        summarize_recurring_errors 결과에 오류별 영향 호스트 수(HostCount), 상위 호스트(TopHosts),
+        발생 시각 히스토그램(Histogram)을 더해 (요약 텍스트, 상세 데이터) 를 반환합니다.
+        """
+        summary_text, details = summarize_recurring_errors(self.aggregator, top_n=top_n)
+        if not details:
+            return summary_text, details
+
+        summary_lines = summary_text.split('\n')
+        for index, detail in enumerate(details):
+            identifier = (detail['Source'], detail['EventID'])
+            if 'TemplateID' in detail:
+                identifier += (detail['TemplateID'],)
+            counts = self.host_counts.get(identifier, {})
+            detail['HostCount'] = len(counts)
+            detail['TopHosts'] = [{'Host': host, 'Count': count}
+                                  for host, count in heapq.nlargest(top_hosts, counts.items(), key=lambda item: item[1])]
+            detail['Histogram'] = {
+                'IntervalSeconds': self.histogram_seconds,
+                'Counts': {format_epoch(bucket * self.histogram_seconds): count
+                           for bucket, count in sorted(self.histograms.get(identifier, {}).items())}
+            }
+            summary_lines[index + 1] += f", Hosts: {len(counts)}"
+        return "\n".join(summary_lines), details
+
+    def host_rows(self):
+        """호스트별 처리 현황 (이벤트 수가 많은 순)."""
+        return [dict(summary, Host=host)
+                for host, summary in sorted(self.hosts.items(), key=lambda item: (-item[1]['Events'], item[0]))]
+
+
+def analyze_fleet(root, workers=None, group_by_template=False, max_records=1000,
+                  histogram_seconds=DEFAULT_HISTOGRAM_SECONDS, metrics=None, event_filter=None):
+    """
+    root 아래 호스트별 내보내기 파일을 프로세스 풀(workers 개, 기본 CPU 수)에서 파일 단위로 집계하고,
+    완료되는 순서대로 부분 집계를 FleetAggregator 에 합쳐 반환합니다.
+    큰 파일부터 제출하여 마지막에 큰 작업 하나만 남아 코어가 노는 시간을 줄이며, workers 가 1 이면 현재 프로세스에서 순서대로 처리합니다.
+    event_filter 는 파일마다 적용됩니다 (analyze_export_file 참고).
+    """
+    exports = discover_fleet_exports(root)
+    logger.info(f"Found {len(exports)} export files for {len({host for host, _, _ in exports})} hosts under '{root}'.")
+    exports.sort(key=lambda export: _file_size(export[1]), reverse=True)
+    fleet = FleetAggregator(group_by_template=group_by_template, histogram_seconds=histogram_seconds)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(exports) <= 1:
+        for host, path, file_format in exports:
+            _add_partial(fleet, analyze_export_file(host, path, file_format, group_by_template, max_records,
+                                                   histogram_seconds, event_filter), metrics)
+        return fleet
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(exports))) as executor:
+        futures = [executor.submit(analyze_export_file, host, path, file_format, group_by_template, max_records,
+                                   histogram_seconds, event_filter)
+                   for host, path, file_format in exports]
+        for future in as_completed(futures):
+            _add_partial(fleet, future.result(), metrics)
+    return fleet
+
+def _add_partial(fleet, partial, metrics):
+    logger.info(f"Aggregated {partial['Events']} events from '{partial['Path']}' ({partial['Host']}) "
+                f"in {partial['Seconds']:.2f}s.")
+    if metrics is not None:
+        with metrics.stage('fleet_merge', items=partial['Events']):
+            fleet.add_partial(partial)
+    else:
+        fleet.add_partial(partial)
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
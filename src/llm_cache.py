@@ -0,0 +1,113 @@
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# 캐시 파일 형식 버전 (형식이 바뀌면 이전 캐시는 무시)
+CACHE_VERSION = 1
+
+
+def make_cache_key(errors, model, prompt_version):
+    """
+    오류 목록의 (Source, EventID, 템플릿) 과 모델, 프롬프트 버전으로 내용 기반 캐시 키(SHA-256)를 만듭니다.
+    발생 횟수나 샘플 메시지처럼 실행마다 달라지는 값은 키에 포함하지 않습니다.
+    응답의 오류 번호가 순서를 따르므로 오류 순서는 키에 포함됩니다.
+    """
+    identities = [
+        [str(error.get('Source', '')), str(error.get('EventID', '')), error.get('Template') or '']
+        for error in errors
+    ]
+    payload = json.dumps({'errors': identities, 'model': model, 'prompt_version': prompt_version},
+                         ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class LlmResponseCache:
+    """
+    LLM 응답을 내용 기반 키로 보관하는 JSON 파일 캐시.
+    항목은 ttl_seconds 가 지나면 만료되고, max_entries 를 넘으면 가장 오래 사용되지 않은 항목부터 제거됩니다.
+    """
+
+    def __init__(self, path, ttl_seconds=7 * 24 * 3600, max_entries=500):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict() # 키 -> {'created', 'last_used', 'response'} (LRU 순서)
+        self._dirty = False
+
+    def __len__(self):
+        return len(self._entries)
+
+    def load(self):
+        """저장된 캐시를 읽습니다. 파일이 없거나 손상된 경우 빈 캐시로 시작합니다."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return self
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load LLM cache '{self.path}': {e}. Starting with an empty cache.")
+            return self
+
+        if data.get('version') != CACHE_VERSION:
+            logger.warning(f"LLM cache '{self.path}' has an unsupported version. Starting with an empty cache.")
+            return self
+
+        now = time.time()
+        entries = sorted((data.get('entries') or {}).items(), key=lambda item: item[1].get('last_used', 0))
+        for key, entry in entries:
+            if not self._is_expired(entry, now):
+                self._entries[key] = entry
+        self._dirty = len(self._entries) != len(entries)
+        self._evict()
+        logger.info(f"Loaded {len(self._entries)} LLM cache entries from '{self.path}'.")
+        return self
+
+    def _is_expired(self, entry, now):
+        return self.ttl_seconds is not None and now - entry.get('created', 0) > self.ttl_seconds
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._dirty = True
+
+    def get(self, key):
+        """캐시된 응답을 반환합니다 (없거나 만료되었으면 None)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = time.time()
+        if self._is_expired(entry, now):
+            del self._entries[key]
+            self._dirty = True
+            return None
+        entry['last_used'] = now
+        self._entries.move_to_end(key)
+        self._dirty = True
+        return entry['response']
+
+    def put(self, key, response):
+        now = time.time()
+        self._entries[key] = {'created': now, 'last_used': now, 'response': response}
+        self._entries.move_to_end(key)
+        self._dirty = True
+        self._evict()
+
+    def save(self):
+        """변경 사항이 있으면 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        if not self._dirty:
+            return
+        temp_path = f"{self.path}.tmp"
+        try:
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'entries': self._entries}, f, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+            self._dirty = False
+            logger.info(f"Saved {len(self._entries)} LLM cache entries to '{self.path}'.")
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to save LLM cache '{self.path}': {e}", exc_info=True)
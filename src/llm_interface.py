@@ -1,25 +1,81 @@
 import os
+import re
+import time
+import random
 import logging
-import requests # requests 라이브러리 사용
 import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.llm_cache import LlmResponseCache, make_cache_key
+from src.prompt_builder import PromptBuilder
 
 logger = logging.getLogger(__name__)
 
-# X.AI Grok API 엔드포인트
+# X.AI Grok API 엔드포인트 (LLM_API_ENDPOINT 환경 변수로 변경 가능, 예: 로컬 테스트 서버)
 XAI_API_ENDPOINT = "https://api.x.ai/v1/chat/completions"
+# 프롬프트 형식 버전. 프롬프트를 바꾸면 올려서 이전 캐시 응답을 재사용하지 않도록 함
+PROMPT_VERSION = 3
+
+# 응답의 오류별 분석 제목 ("### 오류 #N 분석")
+_SECTION_HEADING = re.compile(r'^[#*\s]*오류\s*#\s*(\d+)\s*분석[^\n]*$', re.MULTILINE)
+# 재시도할 HTTP 상태 코드 (요청 한도 초과, 일시적인 서버 오류)
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class LlmRequestError(Exception):
+    """LLM API 요청 실패. 메시지는 사용자에게 보여줄 '오류: ...' 문자열입니다."""
+
+
+def is_streaming_enabled():
+    """LLM_STREAM 환경 변수로 스트리밍(SSE) 응답 사용 여부를 확인합니다."""
+    return os.getenv('LLM_STREAM', 'false').strip().lower() in ('1', 'true', 'yes')
 
-def get_llm_suggestions_from_env(error_details):
-    """환경 변수에서 설정을 읽어 LLM(X.AI Grok)에게 해결 방안을 요청합니다."""
+
+def get_llm_suggestions_from_env(error_details, cache_path=None, on_progress=None):
+    """
+    환경 변수에서 설정을 읽어 LLM(X.AI Grok)에게 해결 방안을 요청합니다.
+    cache_path 가 주어지면 응답을 (Source, EventID, 템플릿) + 모델 + 프롬프트 버전 기반 키로 캐시하여,
+    같은 오류 목록은 요청 없이 재사용하고 일부만 바뀐 경우 캐시에 없는 오류만 요청합니다.
+    LLM_CONCURRENCY 가 2 이상이면 오류를 LLM_BATCH_SIZE 개씩 나눠 keep-alive 세션으로 동시에 요청하고,
+    일부 요청이 실패해도 성공한 오류의 분석은 원래 순서대로 반환합니다.
+    LLM_STREAM 이 설정되면 응답을 SSE 스트림으로 받으며, on_progress(지금까지 받은 전체 텍스트) 가
+    주어지면 조각이 도착할 때마다 호출합니다 (동시 요청 모드에서는 여러 스레드에서 호출될 수 있음).
+    """
 
     # 환경 변수에서 설정 읽기
     provider = os.getenv('LLM_PROVIDER', 'grok').lower()
     api_key = os.getenv('GROK_API_KEY') # X.AI Grok API 키
     model = os.getenv('GROK_MODEL', 'grok-3-mini-beta')
+    endpoint = os.getenv('LLM_API_ENDPOINT', '').strip() or XAI_API_ENDPOINT
     try:
         timeout = int(os.getenv('LLM_REQUEST_TIMEOUT', '60'))
     except ValueError:
         logger.warning("Invalid LLM_REQUEST_TIMEOUT value, using default 60 seconds.")
         timeout = 60
+    try:
+        # 1: 모든 오류를 하나의 프롬프트로 요청, 2 이상: 오류(배치)별 요청을 해당 개수만큼 동시에 전송
+        concurrency = int(os.getenv('LLM_CONCURRENCY', '1'))
+        batch_size = int(os.getenv('LLM_BATCH_SIZE', '1'))
+        max_retries = int(os.getenv('LLM_MAX_RETRIES', '3'))
+    except ValueError:
+        logger.warning("Invalid LLM request settings (concurrency, batch size, retries), using defaults.")
+        concurrency = 1
+        batch_size = 1
+        max_retries = 3
+    try:
+        # 프롬프트 토큰 예산 (오류가 많으면 순위가 낮은 오류부터 상세 정보를 줄이거나 제외)
+        token_budget = int(os.getenv('LLM_PROMPT_TOKEN_BUDGET', '4000'))
+    except ValueError:
+        logger.warning("Invalid LLM_PROMPT_TOKEN_BUDGET value, using default 4000 tokens.")
+        token_budget = 4000
+    try:
+        cache_ttl_hours = float(os.getenv('LLM_CACHE_TTL_HOURS', '168'))
+        cache_max_entries = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '500'))
+    except ValueError:
+        logger.warning("Invalid LLM cache settings (ttl, max entries), using defaults.")
+        cache_ttl_hours = 168
+        cache_max_entries = 500
 
     # 설정 유효성 검사
     if provider not in ['grok', 'xai', 'x.ai']:
@@ -28,108 +84,325 @@ def get_llm_suggestions_from_env(error_details):
         logger.error(error_msg)
         return f"오류: {error_msg}"
 
-    if not api_key or api_key.startswith('YOUR_') or api_key == 'YOUR_GROK_API_KEY_HERE':
-        error_msg = "GROK_API_KEY 환경 변수가 설정되지 않았거나 기본값 그대로입니다."
-        logger.error(error_msg)
-        return f"오류: Grok API 키가 환경 변수에 설정되지 않았습니다. (.env 파일을 확인하세요)"
-
-    # 오류 요약 텍스트 생성 (이전과 동일, 한국어 환경 고려)
-    error_summary_text = ""
-    for i, error in enumerate(error_details, 1):
-        source = error.get('Source', '알 수 없음')
-        event_id = error.get('EventID', '알 수 없음')
-        count = error.get('Count', '알 수 없음')
-        sample_message = error.get('SampleMessage', '메시지 없음')
-        error_summary_text += (
-            f"\n--- 오류 #{i} ---\n"
-            f"소스: {source}\n"
-            f"이벤트 ID: {event_id}\n"
-            f"발생 횟수: {count}\n"
-            f"샘플 메시지 일부: {sample_message}\n"
-        )
-
-    # 프롬프트 생성 (한국어 버전 유지)
-    prompt = f"""
-당신은 숙련된 Windows 시스템 관리자이자 문제 해결 전문가입니다.
-Windows PC의 이벤트 로그를 분석하여 반복적으로 발생하는 주요 심각/오류 이벤트를 확인했습니다.
-
-다음은 가장 빈번하게 발생한 오류들의 요약 정보입니다:
-{error_summary_text}
-
-위에 제공된 정보(소스, 이벤트 ID, 발생 횟수, 샘플 메시지 일부)만을 바탕으로, 각 오류에 대해 다음을 **한국어**로 수행해 주십시오:
-
-1.  **잠재적 원인 식별:** 이 오류가 발생할 수 있는 가장 가능성 높은 이유를 간략하게 설명합니다.
-2.  **구체적인 문제 해결 단계 제공:** 사용자가 문제를 진단하고 잠재적으로 해결하기 위해 취할 수 있는 구체적이고 단계적인 조치를 제안합니다. 실용적이고 실행 가능한 조언에 초점을 맞추고, 가장 일반적이거나 효과적인 해결책을 우선적으로 제시합니다.
-3.  **구조:** 위에서 식별된 각 오류에 대한 분석(원인 및 단계)을 명확하게 구분합니다 (예: "오류 #1 분석", "오류 #2 분석" 과 같은 제목 사용).
-
-**중요:**
-* 추가 정보를 요청하지 마십시오. 입력된 요약 정보만을 바탕으로 최선의 지침을 제공하십시오.
-* 당신의 목표는 이 로그를 바탕으로 사용자가 PC 문제를 해결하도록 돕는 것입니다.
-* **반드시 한국어로 답변해야 합니다.** 명확하고 이해하기 쉬운 한국어를 사용해 주십시오.
-"""
-
-    # API 요청 헤더 및 페이로드 구성 (curl 예시 참조)
-    headers = {
-        "Authorization": f"Bearer {api_key}",
-        "Content-Type": "application/json"
-    }
-
-    payload = {
-        "messages": [
-            # 시스템 메시지로 한국어 응답 요청 추가
-            {"role": "system", "content": "You are a helpful Windows troubleshooting assistant. Always respond in Korean language."},
-            {"role": "user", "content": prompt}
-        ],
-        "model": model,
-        "stream": False, # 스트리밍 응답 사용 안 함
-        "temperature": 0.7 # 약간의 창의성 허용 (필요에 따라 0으로 설정)
-    }
-
-    logger.info(f"X.AI Grok API ({XAI_API_ENDPOINT}) 요청 시작 (모델: {model}, 타임아웃: {timeout}s)")
-
+    cache = None
+    if cache_path:
+        cache = LlmResponseCache(cache_path, ttl_seconds=cache_ttl_hours * 3600, max_entries=cache_max_entries).load()
+    prompt_builder = PromptBuilder(token_budget=token_budget)
+    # 영향도 순으로 정렬 (오류 번호와 캐시 키 모두 이 순서를 따름)
+    error_details = prompt_builder.prioritize(error_details)
+    client = _LlmClient(endpoint, api_key, model, timeout, max_retries=max_retries, concurrency=concurrency,
+                        stream=is_streaming_enabled())
     try:
-        response = requests.post(
-            XAI_API_ENDPOINT,
-            headers=headers,
-            json=payload,
-            timeout=timeout
-        )
-        response.raise_for_status() # HTTP 오류 발생 시 예외 발생 (4xx, 5xx)
-
-        # 응답 처리
-        response_data = response.json()
-        # 응답 구조가 OpenAI 호환이므로 동일하게 처리 시도
-        if 'choices' in response_data and len(response_data['choices']) > 0:
-            message_content = response_data['choices'][0].get('message', {}).get('content')
-            if message_content:
-                logger.info("X.AI Grok API로부터 성공적으로 응답 수신.")
-                return message_content.strip()
-            else:
-                logger.error("API 응답 구조에서 메시지 내용을 찾을 수 없습니다.", extra={"response": response_data})
-                return "오류: LLM 응답에서 내용을 추출하지 못했습니다."
+        return _get_suggestions(client, prompt_builder, cache, error_details, batch_size, on_progress=on_progress)
+    finally:
+        client.close()
+        if cache is not None:
+            cache.save()
+
+def _is_api_key_configured(api_key):
+    return bool(api_key) and not api_key.startswith('YOUR_') and api_key != 'YOUR_GROK_API_KEY_HERE'
+
+def _missing_api_key_message():
+    logger.error("GROK_API_KEY 환경 변수가 설정되지 않았거나 기본값 그대로입니다.")
+    return f"오류: Grok API 키가 환경 변수에 설정되지 않았습니다. (.env 파일을 확인하세요)"
+
+def _get_suggestions(client, prompt_builder, cache, error_details, batch_size, on_progress=None):
+    """
+    캐시(있으면)를 전체 목록 → 오류별 순서로 확인하고, 캐시에 없는 오류만 요청한 뒤 오류 순서대로 합칩니다.
+    동시 요청 모드가 아니면 캐시에 없는 오류를 하나의 프롬프트로 모아 요청합니다.
+    """
+    model = client.model
+    set_key = make_cache_key(error_details, model, PROMPT_VERSION)
+    error_keys = [make_cache_key([error], model, PROMPT_VERSION) for error in error_details]
+    sections = [None] * len(error_details)
+    if cache is not None:
+        cached_response = cache.get(set_key)
+        if cached_response is not None:
+            logger.info("LLM 응답 캐시 적중 (전체 오류 목록). API 요청을 생략합니다.")
+            return cached_response
+        sections = [cache.get(key) for key in error_keys]
+    missing = [i for i, section in enumerate(sections) if section is None]
+    if cache is not None:
+        logger.info(f"LLM 응답 캐시: {len(error_details) - len(missing)}/{len(error_details)}개 오류 적중.")
+
+    unsplit_responses = [] # 오류별로 나눌 수 없었던 응답 (순서 유지, 마지막에 그대로 덧붙임)
+    failures = []
+    failed = set()
+    if missing:
+        if not _is_api_key_configured(client.api_key):
+            return _missing_api_key_message()
+        if client.concurrency > 1:
+            step = max(batch_size, 1)
+            batches = [missing[i:i + step] for i in range(0, len(missing), step)]
         else:
-            logger.error("API 응답이 예상한 'choices' 구조를 포함하지 않습니다.", extra={"response": response_data})
-            return "오류: LLM으로부터 유효하지 않은 응답 형식을 받았습니다."
-
-    except requests.exceptions.Timeout:
-        logger.error(f"LLM API 요청 시간 초과 ({timeout}초)")
-        return f"오류: LLM API 요청 시간이 초과되었습니다 ({timeout}초)."
-    except requests.exceptions.HTTPError as e:
-        # HTTP 오류 상태 코드와 응답 내용을 로깅
-        error_details = f"HTTP 오류 코드: {e.response.status_code}"
+            batches = [missing]
+        on_batch_progress = None
+        if on_progress is not None:
+            on_batch_progress = _ProgressAssembler(error_details, sections, len(batches), on_progress).update
+        results = client.complete_all([prompt_builder.build([error_details[i] for i in batch]) for batch in batches],
+                                      on_progress=on_batch_progress)
+
+        for batch, result in zip(batches, results):
+            if isinstance(result, LlmRequestError):
+                failures.append(str(result))
+                failed.update(batch)
+                for i in batch:
+                    sections[i] = str(result)
+                continue
+            new_sections = _split_sections(result, len(batch))
+            if new_sections is None and len(batch) == 1:
+                new_sections = [result] # 오류 하나에 대한 응답은 제목이 없어도 그대로 사용
+            if new_sections is None:
+                logger.warning("LLM 응답을 오류별로 나눌 수 없어 응답 전체를 그대로 표시합니다.")
+                if len(batches) == 1 and len(batch) == len(error_details):
+                    if cache is not None:
+                        cache.put(set_key, result)
+                    return result
+                unsplit_responses.append((batch, result))
+                continue
+            for i, section in zip(batch, new_sections):
+                sections[i] = section
+                if cache is not None:
+                    cache.put(error_keys[i], section)
+
+    if failures and len(failed) == len(error_details):
+        # 모든 오류의 요청이 실패한 경우 기존처럼 오류 메시지만 반환
+        return failures[0]
+
+    unsplit = {i for batch, _ in unsplit_responses for i in batch}
+    parts = [_format_section(i, error, section) for i, (error, section) in enumerate(zip(error_details, sections))
+             if i not in unsplit]
+    parts.extend(response for _, response in unsplit_responses)
+    result = "\n\n".join(parts)
+    if cache is not None and not failures and not unsplit_responses:
+        cache.put(set_key, result)
+    return result
+
+class _ProgressAssembler:
+    """배치별로 스트리밍 중인 응답 조각을 캐시된 분석과 합쳐 진행 중인 전체 텍스트로 전달합니다."""
+
+    def __init__(self, error_details, cached_sections, batch_count, on_progress):
+        self._cached_parts = [_format_section(i, error, section)
+                              for i, (error, section) in enumerate(zip(error_details, cached_sections))
+                              if section is not None]
+        self._partials = [''] * batch_count
+        self._on_progress = on_progress
+        self._lock = threading.Lock()
+
+    def update(self, batch_index, text):
+        with self._lock:
+            self._partials[batch_index] = text
+            self._on_progress("\n\n".join(self._cached_parts + [part for part in self._partials if part]))
+
+
+def _split_sections(response, expected_count):
+    """'오류 #N 분석' 제목 기준으로 응답을 오류별 본문 목록으로 나눕니다 (제목 번호가 1..N 이 아니면 None)."""
+    headings = list(_SECTION_HEADING.finditer(response))
+    if [int(match.group(1)) for match in headings] != list(range(1, expected_count + 1)):
+        return None
+    bodies = []
+    for match, next_match in zip(headings, headings[1:] + [None]):
+        end = next_match.start() if next_match else len(response)
+        bodies.append(response[match.end():end].strip())
+    return bodies
+
+def _format_section(index, error, section):
+    """오류별 본문에 현재 오류 순서에 맞는 번호의 제목을 붙입니다."""
+    return (f"### 오류 #{index + 1} 분석 ({error.get('Source', '알 수 없음')} / "
+            f"이벤트 ID {error.get('EventID', '알 수 없음')})\n\n{section}")
+
+class _LlmClient:
+    """
+    채팅 완성 API 클라이언트. keep-alive 세션(연결 풀)을 공유하고,
+    429/5xx 응답과 시간 초과/연결 오류는 지수 백오프(Retry-After 우선)로 max_retries 번까지 재시도합니다.
+    requests 모듈과 세션은 첫 요청 때 만들므로, 모든 응답이 캐시에 있으면 불러오지 않습니다.
+    """
+
+    def __init__(self, endpoint, api_key, model, timeout, max_retries=3, concurrency=1, backoff_seconds=1.0,
+                 stream=False):
+        self.endpoint = endpoint
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max(max_retries, 0)
+        self.concurrency = max(concurrency, 1)
+        self.backoff_seconds = backoff_seconds
+        self.stream = stream
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _get_session(self):
+        with self._session_lock:
+            if self._session is None:
+                import requests
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {self.api_key}",
+                    "Content-Type": "application/json"
+                })
+                self._session = session
+            return self._session
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+    def complete_all(self, prompts, on_progress=None):
+        """
+        프롬프트 목록을 최대 concurrency 개씩 동시에 요청해 입력 순서대로 결과를 반환합니다.
+        각 결과는 응답 문자열 또는 실패한 요청의 LlmRequestError 입니다.
+        스트리밍 모드에서는 on_progress(프롬프트 순번, 지금까지 받은 텍스트) 를 조각마다 호출합니다.
+        """
+        def complete_or_error(index):
+            on_delta = (lambda text: on_progress(index, text)) if on_progress is not None else None
+            try:
+                return self.complete(prompts[index], on_delta=on_delta)
+            except LlmRequestError as e:
+                return e
+
+        if self.concurrency <= 1 or len(prompts) <= 1:
+            return [complete_or_error(index) for index in range(len(prompts))]
+        logger.info(f"LLM 요청 {len(prompts)}건을 최대 {self.concurrency}건씩 동시에 전송합니다.")
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(prompts)), thread_name_prefix='llm-request') as executor:
+            return list(executor.map(complete_or_error, range(len(prompts))))
+
+    def _retry_delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                return min(float(retry_after), 60.0)
+            except ValueError:
+                pass
+        return self.backoff_seconds * (2 ** attempt) * (0.5 + random.random())
+
+    def complete(self, prompt, on_delta=None):
+        """
+        채팅 완성 API 를 호출해 응답 내용을 반환합니다. 실패 시 LlmRequestError 를 발생시킵니다.
+        스트리밍 모드에서는 재시도는 응답 본문을 받기 전까지만 하며, on_delta(지금까지 받은 텍스트) 를 조각마다 호출합니다.
+        """
+        import requests
+        for attempt in range(self.max_retries + 1):
+            started = time.perf_counter()
+            try:
+                response = self._post(prompt)
+            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+                if attempt >= self.max_retries:
+                    return self._handle_response(None, e)
+                delay = self._retry_delay(attempt)
+                logger.warning(f"LLM API 요청 실패 ({e.__class__.__name__}). {delay:.1f}초 후 재시도합니다 ({attempt + 1}/{self.max_retries}).")
+                time.sleep(delay)
+                continue
+            if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                delay = self._retry_delay(attempt, response)
+                logger.warning(f"LLM API 응답 코드 {response.status_code}. {delay:.1f}초 후 재시도합니다 ({attempt + 1}/{self.max_retries}).")
+                response.close()
+                time.sleep(delay)
+                continue
+            if self.stream and response.ok:
+                return self._read_stream(response, started, on_delta)
+            return self._handle_response(response)
+
+    def _read_stream(self, response, started, on_delta):
+        """SSE(text/event-stream) 응답의 'data:' 줄을 읽어 delta 내용을 이어 붙입니다."""
+        import requests
+        chunks = []
+        first_token_seconds = None
         try:
-            error_content = e.response.json()
-            error_details += f", 응답: {error_content}"
-        except json.JSONDecodeError:
-            error_details += f", 응답 내용(텍스트): {e.response.text}"
-        logger.error(f"LLM API HTTP 오류 발생: {error_details}", exc_info=False) 
-        return f"오류: LLM API 요청 실패 ({error_details})"
-    except requests.exceptions.RequestException as e:
-        logger.error(f"LLM API 요청 중 네트워크 오류 발생: {e}", exc_info=True)
-        return f"오류: LLM API 요청 중 네트워크 오류 발생: {e}"
-    except json.JSONDecodeError as e:
-         logger.error(f"LLM API 응답 JSON 디코딩 실패: {e}", extra={"response_text": response.text if 'response' in locals() else 'N/A'})
-         return f"오류: LLM API 응답 처리 중 오류 발생 (JSON 형식 오류)"
-    except Exception as e:
-        logger.error(f"LLM 상호작용 중 예기치 않은 오류 발생: {e}", exc_info=True)
-        return f"오류: LLM 요청 중 예기치 않은 오류 발생: {e}"
\ No newline at end of file
+            with response:
+                # charset 없는 text/event-stream 은 requests 가 ISO-8859-1 로 디코딩하므로 줄 단위로 직접 UTF-8 디코딩
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode('utf-8')
+                    if not line or not line.startswith('data:'):
+                        continue
+                    data = line[5:].strip()
+                    if data == '[DONE]':
+                        break
+                    choices = json.loads(data).get('choices') or []
+                    delta = (choices[0].get('delta') or {}).get('content') if choices else None
+                    if not delta:
+                        continue
+                    if first_token_seconds is None:
+                        first_token_seconds = time.perf_counter() - started
+                        logger.info(f"LLM 첫 토큰 수신까지 {first_token_seconds:.2f}초",
+                                    extra={"metric": "llm_time_to_first_token_seconds", "value": first_token_seconds})
+                    chunks.append(delta)
+                    if on_delta is not None:
+                        on_delta(''.join(chunks))
+        except requests.exceptions.RequestException as e:
+            logger.error(f"LLM API 스트리밍 응답 수신 중 네트워크 오류 발생: {e}", exc_info=True)
+            raise LlmRequestError(f"오류: LLM API 스트리밍 응답 수신 중 네트워크 오류 발생: {e}")
+        except (ValueError, AttributeError, IndexError) as e:
+            logger.error(f"LLM API 스트리밍 응답 처리 실패: {e}", exc_info=True)
+            raise LlmRequestError(f"오류: LLM API 스트리밍 응답 처리 중 오류 발생 (형식 오류)")
+
+        content = ''.join(chunks).strip()
+        if not content:
+            logger.error("LLM 스트리밍 응답에서 내용을 찾을 수 없습니다.")
+            raise LlmRequestError("오류: LLM 응답에서 내용을 추출하지 못했습니다.")
+        logger.info(f"X.AI Grok API로부터 스트리밍 응답 수신 완료 ({time.perf_counter() - started:.2f}초).")
+        return content
+
+    def _post(self, prompt):
+        payload = {
+            "messages": [
+                # 시스템 메시지로 한국어 응답 요청 추가
+                {"role": "system", "content": "You are a helpful Windows troubleshooting assistant. Always respond in Korean language."},
+                {"role": "user", "content": prompt}
+            ],
+            "model": self.model,
+            "stream": self.stream, # True 이면 SSE 로 조각 단위 수신
+            "temperature": 0.7 # 약간의 창의성 허용 (필요에 따라 0으로 설정)
+        }
+        logger.info(f"X.AI Grok API ({self.endpoint}) 요청 시작 (모델: {self.model}, 타임아웃: {self.timeout}s)")
+        return self._get_session().post(self.endpoint, json=payload, timeout=self.timeout, stream=self.stream)
+
+    def _handle_response(self, response, request_error=None):
+        """응답(또는 재시도 후에도 실패한 요청의 예외)을 처리해 내용을 반환하거나 LlmRequestError 를 발생시킵니다."""
+        import requests
+        try:
+            if request_error is not None:
+                raise request_error
+            response.raise_for_status() # HTTP 오류 발생 시 예외 발생 (4xx, 5xx)
+
+            # 응답 처리
+            response_data = response.json()
+            # 응답 구조가 OpenAI 호환이므로 동일하게 처리 시도
+            if 'choices' in response_data and len(response_data['choices']) > 0:
+                message_content = response_data['choices'][0].get('message', {}).get('content')
+                if message_content:
+                    logger.info("X.AI Grok API로부터 성공적으로 응답 수신.")
+                    return message_content.strip()
+                else:
+                    logger.error("API 응답 구조에서 메시지 내용을 찾을 수 없습니다.", extra={"response": response_data})
+                    raise LlmRequestError("오류: LLM 응답에서 내용을 추출하지 못했습니다.")
+            else:
+                logger.error("API 응답이 예상한 'choices' 구조를 포함하지 않습니다.", extra={"response": response_data})
+                raise LlmRequestError("오류: LLM으로부터 유효하지 않은 응답 형식을 받았습니다.")
+
+        except LlmRequestError:
+            raise
+        except requests.exceptions.Timeout:
+            logger.error(f"LLM API 요청 시간 초과 ({self.timeout}초)")
+            raise LlmRequestError(f"오류: LLM API 요청 시간이 초과되었습니다 ({self.timeout}초).")
+        except requests.exceptions.HTTPError as e:
+            # HTTP 오류 상태 코드와 응답 내용을 로깅
+            error_details = f"HTTP 오류 코드: {e.response.status_code}"
+            try:
+                error_content = e.response.json()
+                error_details += f", 응답: {error_content}"
+            except json.JSONDecodeError:
+                error_details += f", 응답 내용(텍스트): {e.response.text}"
+            logger.error(f"LLM API HTTP 오류 발생: {error_details}", exc_info=False) 
+            raise LlmRequestError(f"오류: LLM API 요청 실패 ({error_details})")
+        except requests.exceptions.RequestException as e:
+            logger.error(f"LLM API 요청 중 네트워크 오류 발생: {e}", exc_info=True)
+            raise LlmRequestError(f"오류: LLM API 요청 중 네트워크 오류 발생: {e}")
+        except json.JSONDecodeError as e:
+             logger.error(f"LLM API 응답 JSON 디코딩 실패: {e}", extra={"response_text": response.text if response is not None else 'N/A'})
+             raise LlmRequestError(f"오류: LLM API 응답 처리 중 오류 발생 (JSON 형식 오류)")
+        except Exception as e:
+            logger.error(f"LLM 상호작용 중 예기치 않은 오류 발생: {e}", exc_info=True)
+            raise LlmRequestError(f"오류: LLM 요청 중 예기치 않은 오류 발생: {e}")
\ No newline at end of file
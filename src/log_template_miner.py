@@ -0,0 +1,163 @@
+import re
+from collections import OrderedDict
+
+# 템플릿에서 가변 토큰을 나타내는 와일드카드
+WILDCARD = '<*>'
+
+# 가변 토큰 마스킹 규칙 (구체적인 패턴이 먼저 오도록 순서 유지)
+_MASK_RULES = [
+    ('GUID', '<GUID>', r'\{?[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\}?'),
+    ('PATH', '<PATH>', r'(?:\b[A-Za-z]:\\|\\\\|\\(?:Device|\?\?|SystemRoot)\\)[^\s"\'<>|;,]*'),
+    ('IP', '<IP>', r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'),
+    ('HEX', '<HEX>', r'\b0[xX][0-9a-fA-F]+\b|\b(?=[0-9a-fA-F]*\d)[0-9a-fA-F]{8,}\b'),
+    ('NUM', '<NUM>', r'(?<![\w.])[-+]?\d+(?:[.,:]\d+)*(?!\w|\.\w)'),
+]
+_MASK_REGEX = re.compile('|'.join(f'(?P<{name}>{pattern})' for name, _, pattern in _MASK_RULES))
+_MASK_TOKENS = {name: token for name, token, _ in _MASK_RULES}
+
+
+def mask_message(message):
+    """GUID, 경로, IP, 16진수, 숫자 등 가변 토큰을 <GUID>/<PATH>/<IP>/<HEX>/<NUM> 으로 치환합니다."""
+    return _MASK_REGEX.sub(lambda match: _MASK_TOKENS[match.lastgroup], message)
+
+
+class LogCluster:
+    """같은 템플릿으로 묶인 메시지 군집."""
+    __slots__ = ('cluster_id', 'tokens', 'size', 'leaf')
+
+    def __init__(self, cluster_id, tokens, size=0):
+        self.cluster_id = cluster_id
+        self.tokens = tokens
+        self.size = size
+        self.leaf = None # 이 군집이 들어 있는 접두사 트리 리프의 군집 목록
+
+    @property
+    def template(self):
+        return ' '.join(self.tokens)
+
+
+class LogTemplateMiner:
+    """
+    Drain 방식의 온라인 로그 템플릿 추출기.
+    마스킹된 메시지를 토큰 수 → 앞쪽 토큰들로 이루어진 고정 깊이 접두사 트리로 분류한 뒤,
+    리프 안에서 가장 유사한 군집에 병합(다른 토큰은 <*> 로 일반화)하거나 새 군집을 만듭니다.
+    메시지당 비용은 리프 크기에만 비례하므로 전체적으로 거의 선형 시간이며,
+    군집 수는 max_clusters 로 제한되어 가장 오래 사용되지 않은 군집부터 제거됩니다.
+    """
+
+    def __init__(self, depth=4, similarity_threshold=0.5, max_children=100, max_clusters=10000,
+                 message_cache_size=50000):
+        self.depth = max(depth, 3)
+        self.similarity_threshold = similarity_threshold
+        self.max_children = max_children
+        self.max_clusters = max_clusters
+        self.message_cache_size = message_cache_size
+        self._root = {}
+        self._clusters = OrderedDict() # cluster_id -> LogCluster (LRU 순서)
+        self._message_cache = {} # 원본 메시지 -> cluster_id (동일 메시지 반복 시 트리 탐색 생략)
+        self._next_id = 1
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def get_cluster(self, cluster_id):
+        return self._clusters.get(cluster_id)
+
+    def clusters(self):
+        return list(self._clusters.values())
+
+    # --- 트리 탐색 ---
+    def _leaf(self, tokens):
+        """토큰 목록이 속하는 리프(군집 목록)를 찾고, 없으면 만듭니다."""
+        node = self._root.setdefault(len(tokens), {})
+        for token in tokens[:self.depth - 2]:
+            children = node.setdefault('children', {})
+            if token not in children:
+                if any(ch.isdigit() for ch in token):
+                    token = WILDCARD
+                elif len(children) >= self.max_children:
+                    token = WILDCARD
+            node = children.setdefault(token, {})
+        return node.setdefault('clusters', [])
+
+    @staticmethod
+    def _similarity(template_tokens, tokens):
+        same = 0
+        wildcards = 0
+        for template_token, token in zip(template_tokens, tokens):
+            if template_token == WILDCARD:
+                wildcards += 1
+            elif template_token == token:
+                same += 1
+        return same / len(tokens) if tokens else 1.0, wildcards
+
+    # --- 추가 ---
+    def add_message(self, message):
+        """메시지를 군집에 추가하고 해당 LogCluster 를 반환합니다."""
+        cluster_id = self._message_cache.get(message)
+        if cluster_id is not None:
+            cluster = self._clusters.get(cluster_id)
+            if cluster is not None:
+                cluster.size += 1
+                self._clusters.move_to_end(cluster_id)
+                return cluster
+
+        tokens = mask_message(message).split()
+        leaf = self._leaf(tokens)
+
+        best_cluster = None
+        best_score = (-1.0, -1)
+        for candidate in leaf:
+            score = self._similarity(candidate.tokens, tokens)
+            if score > best_score:
+                best_cluster, best_score = candidate, score
+
+        if best_cluster is not None and best_score[0] >= self.similarity_threshold:
+            cluster = best_cluster
+            cluster.tokens = [t if t == token else WILDCARD for t, token in zip(cluster.tokens, tokens)]
+            self._clusters.move_to_end(cluster.cluster_id)
+        else:
+            cluster = self._create_cluster(tokens, leaf)
+
+        cluster.size += 1
+        if len(self._message_cache) >= self.message_cache_size:
+            self._message_cache.clear()
+        self._message_cache[message] = cluster.cluster_id
+        return cluster
+
+    def _create_cluster(self, tokens, leaf, cluster_id=None, size=0):
+        if cluster_id is None:
+            cluster_id = self._next_id
+        self._next_id = max(self._next_id, cluster_id + 1)
+        cluster = LogCluster(cluster_id, list(tokens), size)
+        cluster.leaf = leaf
+        leaf.append(cluster)
+        self._clusters[cluster_id] = cluster
+        while len(self._clusters) > self.max_clusters:
+            _, evicted = self._clusters.popitem(last=False)
+            evicted.leaf.remove(evicted)
+        return cluster
+
+    # --- 저장/복원 ---
+    def to_dict(self):
+        return {
+            'Depth': self.depth,
+            'SimilarityThreshold': self.similarity_threshold,
+            'MaxChildren': self.max_children,
+            'MaxClusters': self.max_clusters,
+            'NextID': self._next_id,
+            'Clusters': [{'ClusterID': c.cluster_id, 'Template': c.template, 'Size': c.size}
+                         for c in self._clusters.values()]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        miner = cls(depth=data.get('Depth', 4),
+                    similarity_threshold=data.get('SimilarityThreshold', 0.5),
+                    max_children=data.get('MaxChildren', 100),
+                    max_clusters=data.get('MaxClusters', 10000))
+        for entry in data.get('Clusters', []):
+            tokens = entry.get('Template', '').split()
+            miner._create_cluster(tokens, miner._leaf(tokens), cluster_id=entry['ClusterID'], size=entry.get('Size', 0))
+        miner._next_id = max(miner._next_id, data.get('NextID', 1))
+        return miner
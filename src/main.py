@@ -1,147 +1,552 @@
 import os
 import sys
+import time
 import datetime
 import logging
-from dotenv import load_dotenv # dotenv 임포트
+import contextlib
 
 # --- 경로 설정 및 sys.path 수정 ---
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
-# --- .env 파일 로드 ---
-# 스크립트 시작 시 .env 파일 로드 시도
-# .env 파일이 없어도 오류 없이 진행됨 (환경 변수가 직접 설정되었을 수 있음)
-dotenv_path = os.path.join(PROJECT_ROOT, '.env')
-loaded_dotenv = load_dotenv(dotenv_path=dotenv_path)
-if loaded_dotenv:
-    print(f"Loaded environment variables from: {dotenv_path}") # 로거 설정 전이므로 print 사용
-else:
-    print("No .env file found or failed to load. Relying on system environment variables.")
-
 # --- 기본 설정값 (환경 변수에서 읽어오되, 실패 시 사용할 값) ---
 DEFAULT_LOG_DIR_NAME = 'logs'
 
-# --- 로그 디렉토리 경로 설정 ---
-log_output_dir_env = os.getenv('ANALYSIS_LOG_OUTPUT_DIR', DEFAULT_LOG_DIR_NAME)
-log_dir = os.path.join(PROJECT_ROOT, log_output_dir_env)
-
-# --- 중요: 로그 디렉토리 생성 ---
-try:
-    if not os.path.exists(log_dir):
-        os.makedirs(log_dir)
-        print(f"Created log directory: {log_dir}")
-    else:
-        print(f"Log directory already exists: {log_dir}")
-except OSError as e:
-    print(f"Warning: Failed to create log directory '{log_dir}': {e}")
-    # 심각한 오류지만 일단 진행, 디렉토리 생성 실패는 나중에 로깅에서 다시 시도됨
+# 로그/결과 파일 디렉토리. main() 에서 ANALYSIS_LOG_OUTPUT_DIR 로 결정
+log_dir = os.path.join(PROJECT_ROOT, DEFAULT_LOG_DIR_NAME)
 
 # --- 절대 경로 임포트 ---
-from src.event_log_processor import get_critical_errors, save_critical_logs_to_file
-from src.error_analyzer import find_recurring_errors, save_recurring_errors_to_json
-from src.llm_interface import get_llm_suggestions_from_env # LLM 함수 이름 변경 반영
+# import 시에는 설정 읽기/디렉토리 생성/로깅 설정 등 부수 효과가 없도록 하고(main() 에서 수행),
+# requests, rich, pywin32, numpy 같은 무거운 모듈은 각 모듈에서 필요한 경로에 처음 들어갈 때 불러옴
+from src.event_log_processor import iter_critical_errors
+from src.exporters import create_exporter
+from src.evtx_reader import iter_critical_errors_from_evtx
+from src.error_analyzer import ErrorTimeline, RecurringErrorAggregator, summarize_recurring_errors, save_recurring_errors_to_json
+from src.background_writer import BackgroundWriter
+from src.checkpoint_store import CheckpointStore
+from src.correlation import ErrorCorrelator
+from src.event_filter import EventFilter, parse_duration
+from src.event_sources import datetime_to_epoch
+from src.log_template_miner import LogTemplateMiner
+from src.metrics import PipelineMetrics, Profiler
+from src.near_duplicates import NearDuplicateClusterer
+from src.llm_interface import get_llm_suggestions_from_env, is_streaming_enabled # LLM 함수 이름 변경 반영
 from src.ui_display import (
-    setup_logging, display_start_message, display_progress, display_error_summary,
-    display_llm_results, display_end_message, display_warning, display_error
+    setup_logging, shutdown_logging, display_start_message, display_progress, display_error_summary,
+    display_llm_results, display_end_message, display_warning, display_error, LlmStreamDisplay,
+    display_stage_metrics, display_window_status, display_fleet_hosts
 )
 
-# --- 로거 설정 ---
-# 환경 변수 또는 기본값으로 로깅 설정
-log_level_str = os.getenv('LOG_LEVEL', 'INFO').upper()
-log_level = getattr(logging, log_level_str, logging.INFO)
-log_filename = os.getenv('LOG_FILENAME', 'analyzer.log')
-log_file = os.path.join(log_dir, log_filename)
-
-try:
-    max_bytes = int(os.getenv('LOG_FILE_MAX_BYTES', '5242880'))
-    backup_count = int(os.getenv('LOG_FILE_BACKUP_COUNT', '3'))
-except ValueError:
-    print("Warning: Invalid logging size/count settings in environment variables. Using defaults.")
-    max_bytes = 5 * 1024 * 1024
-    backup_count = 3
-
-try:
-    # 로깅 설정 (파일 및 콘솔)
-    setup_logging(log_level=log_level, log_file=log_file, max_bytes=max_bytes, backup_count=backup_count)
-    logger = logging.getLogger(__name__) # main 모듈 로거
+logger = logging.getLogger(__name__) # main 모듈 로거
+
+def _load_environment():
+    """.env 파일을 환경 변수로 불러옵니다. 파일이 없어도 오류 없이 진행 (환경 변수가 직접 설정되었을 수 있음)."""
+    from dotenv import load_dotenv # dotenv 임포트
+    dotenv_path = os.path.join(PROJECT_ROOT, '.env')
+    if load_dotenv(dotenv_path=dotenv_path):
+        print(f"Loaded environment variables from: {dotenv_path}") # 로거 설정 전이므로 print 사용
+    else:
+        print("No .env file found or failed to load. Relying on system environment variables.")
+
+def _prepare_log_dir():
+    """ANALYSIS_LOG_OUTPUT_DIR(기본 logs) 로그 디렉토리를 만들고 경로를 반환합니다."""
+    path = os.path.join(PROJECT_ROOT, os.getenv('ANALYSIS_LOG_OUTPUT_DIR', DEFAULT_LOG_DIR_NAME))
+    try:
+        if not os.path.exists(path):
+            os.makedirs(path)
+            print(f"Created log directory: {path}")
+        else:
+            print(f"Log directory already exists: {path}")
+    except OSError as e:
+        print(f"Warning: Failed to create log directory '{path}': {e}")
+        # 심각한 오류지만 일단 진행, 디렉토리 생성 실패는 나중에 로깅에서 다시 시도됨
+    return path
+
+def _configure_logging(log_dir):
+    """환경 변수 또는 기본값으로 콘솔 및 파일 로깅을 설정합니다."""
+    log_level_str = os.getenv('LOG_LEVEL', 'INFO').upper()
+    log_level = getattr(logging, log_level_str, logging.INFO)
+    log_file = os.path.join(log_dir, os.getenv('LOG_FILENAME', 'analyzer.log'))
+    try:
+        max_bytes = int(os.getenv('LOG_FILE_MAX_BYTES', '5242880'))
+        backup_count = int(os.getenv('LOG_FILE_BACKUP_COUNT', '3'))
+    except ValueError:
+        print("Warning: Invalid logging size/count settings in environment variables. Using defaults.")
+        max_bytes = 5 * 1024 * 1024
+        backup_count = 3
+    try:
+        # 같은 위치에서 반복되는 경고(이벤트별 메시지 포맷/파싱 실패 등)는 구간마다 이 건수까지만 기록하고 나머지는 요약 (0 이면 제한 없음)
+        rate_limit_count = int(os.getenv('LOG_WARNING_RATE_LIMIT', '5'))
+        rate_limit_seconds = float(os.getenv('LOG_WARNING_RATE_LIMIT_SECONDS', '60'))
+    except ValueError:
+        print("Warning: Invalid log rate limit settings in environment variables. Using defaults.")
+        rate_limit_count = 5
+        rate_limit_seconds = 60.0
+
+    setup_logging(log_level=log_level, log_file=log_file, max_bytes=max_bytes, backup_count=backup_count,
+                  rate_limit_count=rate_limit_count, rate_limit_seconds=rate_limit_seconds)
     logger.info(f"Logging configured. Level: {log_level_str}, File: '{log_file}'")
-except Exception as e:
-    print(f"FATAL: Failed to setup logging: {e}")
-    sys.exit(1)
+
+def _check_admin():
+    """Windows 에서 관리자 권한이 없으면 경고합니다 (모든 이벤트 로그를 읽으려면 필요할 수 있음)."""
+    if os.name != 'nt':
+        return
+    is_admin = False
+    try:
+        import ctypes
+        is_admin = ctypes.windll.shell32.IsUserAnAdmin() != 0
+    except Exception as e:
+        logger.warning(f"Could not check for administrator privileges: {e}")
+
+    if not is_admin:
+        logger.warning("This script might require administrator privileges to read all event logs.")
+
+def main():
+    """
+    명령줄 진입점: .env 로드 → 로그 디렉토리 생성 → 로깅 설정 → 분석 실행 순으로 수행하고 종료 코드를 반환합니다.
+    (python src/main.py 또는 설치 시 analyze-logs)
+    """
+    global log_dir
+    _load_environment()
+    log_dir = _prepare_log_dir()
+    try:
+        # 로깅 설정 (파일 및 콘솔)
+        _configure_logging(log_dir)
+    except Exception as e:
+        print(f"FATAL: Failed to setup logging: {e}")
+        return 1
+    try:
+        _check_admin()
+        run_analyzer()
+    finally:
+        # 백그라운드 로그 스레드에 남은 로그(생략된 경고 요약 포함)를 모두 기록
+        shutdown_logging()
+    return 0
 
 def run_analyzer():
     """메인 분석 프로세스를 실행합니다."""
     start_time = datetime.datetime.now()
     display_start_message()
+    timestamp_str = start_time.strftime("%Y%m%d_%H%M%S")
+
+    # 단계별 소요 시간/처리량/기록 바이트 측정 (ANALYSIS_PROFILE 처럼 ANALYSIS_METRICS=true 로 켤 때만)
+    metrics_enabled = os.getenv('ANALYSIS_METRICS', 'false').strip().lower() in ('1', 'true', 'yes')
+    metrics = PipelineMetrics() if metrics_enabled else None
+    # 선택적 프로파일링: cprofile, tracemalloc 또는 both
+    profiler = Profiler(os.getenv('ANALYSIS_PROFILE', ''), os.path.join(log_dir, f"profile_{timestamp_str}"))
+    if profiler.enabled:
+        profiler.start()
+    try:
+        _run_analysis(timestamp_str, metrics)
+    finally:
+        if profiler.enabled:
+            profiler.stop()
+        if metrics is not None:
+            metrics.finish()
+            display_stage_metrics(metrics.to_dict())
+            metrics.save_json(os.path.join(log_dir, f"metrics_{timestamp_str}.json"))
+    display_end_message(start_time)
+
+def _stage(metrics, name):
+    """metrics 가 있으면 단계 측정 컨텍스트를, 없으면 아무것도 하지 않는 컨텍스트를 반환합니다."""
+    return metrics.stage(name) if metrics is not None else contextlib.nullcontext()
 
+def _background_writes_enabled():
+    """ANALYSIS_BACKGROUND_WRITES(기본 true): 이벤트 내보내기와 JSON 보고서를 백그라운드 스레드에서 기록할지 여부."""
+    return os.getenv('ANALYSIS_BACKGROUND_WRITES', 'true').strip().lower() in ('1', 'true', 'yes')
+
+def _file_size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+def _run_analysis(timestamp_str, metrics=None):
+    """설정을 읽고 수집 → 저장 → 분석 → LLM 요청을 실행합니다."""
     # 분석 설정 읽기 (환경 변수 또는 기본값)
     log_names_str = os.getenv('ANALYSIS_LOG_NAMES', 'System,Application')
     log_names = [name.strip() for name in log_names_str.split(',')]
+    # 내보낸 .evtx 파일 경로 (쉼표 구분). 설정 시 라이브 이벤트 로그 대신 파일을 분석
+    evtx_files_str = os.getenv('ANALYSIS_EVTX_FILES', '')
+    evtx_files = [path.strip() for path in evtx_files_str.split(',') if path.strip()]
     try:
         max_events = int(os.getenv('ANALYSIS_MAX_EVENTS_TO_READ', '2000'))
         top_n = int(os.getenv('ANALYSIS_TOP_RECURRING_ERRORS', '5'))
+        # 1: 로그를 순서대로 읽음, 2 이상: 로그별 병렬 읽기 + 해당 개수의 메시지 포맷 스레드
+        read_workers = int(os.getenv('ANALYSIS_READ_WORKERS', '1'))
     except ValueError:
-        logger.warning("Invalid analysis settings (max_events, top_n) in environment variables. Using defaults.")
+        logger.warning("Invalid analysis settings (max_events, top_n, read_workers) in environment variables. Using defaults.")
         max_events = 2000
         top_n = 5
+        read_workers = 1
 
-    logger.info(f"Analysis Settings - Log Names: {log_names}, Max Events: {max_events}, Top N: {top_n}")
+    # 증분 수집: 로그별 북마크 이후의 새 이벤트만 읽고 누적 집계 상태에 합침
+    incremental = os.getenv('ANALYSIS_INCREMENTAL', 'false').strip().lower() in ('1', 'true', 'yes')
+    state_filename = os.getenv('ANALYSIS_STATE_FILE', 'analysis_state.json')
+    # 메시지 템플릿 기준 그룹핑: 같은 Source/EventID 라도 메시지 형태가 다르면 별도 오류로 집계
+    group_by_template = os.getenv('ANALYSIS_GROUP_BY_TEMPLATE', 'false').strip().lower() in ('1', 'true', 'yes')
+    # 급증/추세 분석 구간(초, 0 이면 비활성화)과 급증 판단 기준(이동 표준편차 배수)
+    try:
+        trend_interval = int(os.getenv('ANALYSIS_TREND_INTERVAL_SECONDS', '300'))
+        burst_threshold = float(os.getenv('ANALYSIS_BURST_THRESHOLD', '4.0'))
+    except ValueError:
+        logger.warning("Invalid trend analysis settings (interval, burst threshold) in environment variables. Using defaults.")
+        trend_interval = 300
+        burst_threshold = 4.0
+    trend_options = {'interval_seconds': trend_interval, 'burst_threshold': burst_threshold}
+    # 유사 메시지 군집화(MinHash/LSH): 같은 Source/EventID 안에서 거의 같은 메시지를 묶어 군집 크기와 대표 메시지를 보고
+    near_duplicates = os.getenv('ANALYSIS_NEAR_DUPLICATES', 'false').strip().lower() in ('1', 'true', 'yes')
+    try:
+        near_duplicate_threshold = float(os.getenv('ANALYSIS_NEAR_DUPLICATE_THRESHOLD', '0.6'))
+    except ValueError:
+        logger.warning("Invalid ANALYSIS_NEAR_DUPLICATE_THRESHOLD in environment variables. Using default 0.6.")
+        near_duplicate_threshold = 0.6
+    # 오류 상관 분석: 오류마다 이후 일정 시간(ANALYSIS_CORRELATION_WINDOW, 기본 5m) 안에 자주 뒤따르는 오류와 순서를 보고
+    correlation = os.getenv('ANALYSIS_CORRELATION', 'false').strip().lower() in ('1', 'true', 'yes')
+    try:
+        correlation_window = parse_duration(os.getenv('ANALYSIS_CORRELATION_WINDOW', '5m'))
+    except ValueError:
+        logger.warning("Invalid ANALYSIS_CORRELATION_WINDOW in environment variables. Using default 5m.")
+        correlation_window = 300
+    if correlation and read_workers <= 1 and len(evtx_files or log_names) > 1:
+        # 상관 분석에는 여러 로그/파일의 이벤트가 시간순으로 병합된 스트림이 필요하므로 로그별 병렬 읽기를 사용.
+        # ANALYSIS_READ_WORKERS 를 직접 설정했으면 그 값을 따름 (순차 읽기에서는 소스가 바뀔 때마다 상관 분석 범위를 새로 시작)
+        if os.getenv('ANALYSIS_READ_WORKERS', '').strip():
+            logger.info(f"Correlation analysis with ANALYSIS_READ_WORKERS={read_workers}: logs are read one after another, "
+                        f"so errors are only correlated within each log. Set ANALYSIS_READ_WORKERS to 2 or more to correlate across logs.")
+        else:
+            logger.info("Correlation analysis needs a time-merged stream. Reading logs in parallel (read workers: 2).")
+            read_workers = 2
+    # 로컬 이벤트 저장소(SQLite) 파일 이름. 설정 시 수집한 이벤트를 누적 저장
+    event_store_filename = os.getenv('ANALYSIS_EVENT_STORE', '').strip()
+    # 저장소 조회 구간 ('YYYY-mm-dd HH:MM:SS'). 설정 시 로그를 다시 읽지 않고 저장소에서 해당 구간을 분석
+    store_query_since = os.getenv('ANALYSIS_STORE_QUERY_SINCE', '').strip() or None
+    store_query_until = os.getenv('ANALYSIS_STORE_QUERY_UNTIL', '').strip() or None
+    # 수집한 이벤트 내보내기 형식: csv(기본), ndjson(압축: gzip/zstd/none), columnar
+    export_format = os.getenv('ANALYSIS_EXPORT_FORMAT', 'csv')
+    export_compression = os.getenv('ANALYSIS_EXPORT_COMPRESSION', 'gzip')
+    # 백그라운드 기록: 이벤트 내보내기/JSON 보고서를 별도 스레드에서 기록해 읽기/분석이 디스크 속도를 기다리지 않음
+    background_writes = _background_writes_enabled()
+    # 지연 메시지 포맷: 집계는 Source/EventID 등 싼 필드로 하고, 메시지는 샘플/내보내기에 필요한 레코드만 템플릿 캐시로 포맷
+    deferred_format = os.getenv('ANALYSIS_DEFERRED_FORMAT', 'false').strip().lower() in ('1', 'true', 'yes')
+    # 감시 모드: 종료하지 않고 주기적으로 새 이벤트만 읽어 롤링 윈도우 집계를 갱신
+    watch = os.getenv('ANALYSIS_WATCH', 'false').strip().lower() in ('1', 'true', 'yes')
+    # 플릿 분석: 호스트별 내보내기 파일(.evtx/CSV/NDJSON) 디렉토리 트리를 프로세스 풀로 집계
+    fleet_dir = os.getenv('ANALYSIS_FLEET_DIR', '').strip()
+    # 이벤트 필터: 수준/시각 범위/Source/EventID/메시지 정규식 (읽는 단계에서 적용)
+    event_filter = _read_event_filter()
+
+    logger.info(f"Analysis Settings - Log Names: {log_names}, EVTX Files: {evtx_files}, Max Events: {max_events}, Top N: {top_n}, Read Workers: {read_workers}, Incremental: {incremental}, Group By Template: {group_by_template}, Trend Interval: {trend_interval}s, Near Duplicates: {near_duplicates}, Correlation: {correlation} ({correlation_window}s), Event Store: {event_store_filename or 'disabled'}, Export Format: {export_format}, Background Writes: {background_writes}, Deferred Format: {deferred_format}, Filter: {event_filter}")
+
+    if fleet_dir:
+        _run_fleet(fleet_dir, max_events, top_n, group_by_template, timestamp_str, metrics=metrics,
+                   event_filter=event_filter)
+        return
+
+    event_store = None
+    event_store_size = 0
+    if event_store_filename:
+        from src.event_store import EventStore # 저장소를 쓸 때만 sqlite3 를 불러옴
+        try:
+            event_store_size = _file_size(os.path.join(log_dir, event_store_filename))
+            event_store = EventStore(os.path.join(log_dir, event_store_filename))
+        except Exception as e:
+            logger.error(f"Failed to open event store '{event_store_filename}': {e}", exc_info=True)
+            display_error("Failed to open event store.")
 
-    # 1. 이벤트 로그 읽기
-    critical_errors = []
+    if watch:
+        _run_watch(evtx_files, log_names, max_events, read_workers, top_n, group_by_template,
+                   event_store=event_store, metrics=metrics, deferred=deferred_format, event_filter=event_filter)
+        return
+
+    if event_store is not None and (store_query_since or store_query_until):
+        # 저장소 조회 모드: 원본 로그를 다시 읽지 않고 인덱스로 시간 구간을 집계
+        display_progress(f"Querying event store ({store_query_since or '-'} ~ {store_query_until or '-'})...")
+        try:
+            with event_store, _stage(metrics, 'store_query'):
+                aggregator = event_store.aggregate(since=store_query_since, until=store_query_until, top_n=top_n)
+        except Exception as e:
+            logger.error(f"An error occurred while querying the event store: {e}", exc_info=True)
+            display_error("Failed to query event store.")
+            return
+        _report_recurring_errors(aggregator, top_n, timestamp_str, metrics=metrics)
+        return
+
+    checkpoint_store = None
+    bookmarks = None
+    aggregator = RecurringErrorAggregator(template_miner=LogTemplateMiner() if group_by_template else None)
+    if incremental:
+        checkpoint_store = CheckpointStore(os.path.join(log_dir, state_filename)).load()
+        bookmarks = checkpoint_store.bookmarks
+        if checkpoint_store.aggregate:
+            saved_aggregator = RecurringErrorAggregator.from_dict(checkpoint_store.aggregate)
+            if (saved_aggregator.template_miner is not None) == group_by_template:
+                aggregator = saved_aggregator
+            else:
+                logger.warning("ANALYSIS_GROUP_BY_TEMPLATE changed since the last run. Starting a new aggregate (previously collected events are not re-read).")
+    if trend_interval > 0:
+        # 시계열은 상태 파일에 저장하지 않으므로 증분 모드에서는 이번 실행에서 읽은 이벤트만 분석
+        try:
+            aggregator.timeline = ErrorTimeline()
+        except ImportError as e:
+            logger.warning(f"Burst/trend analysis disabled: {e}")
+    if near_duplicates:
+        # 시계열과 마찬가지로 상태 파일에 저장하지 않으므로 증분 모드에서는 이번 실행에서 읽은 이벤트만 군집화
+        aggregator.near_duplicates = NearDuplicateClusterer(similarity_threshold=near_duplicate_threshold)
+    if correlation:
+        aggregator.correlation = ErrorCorrelator(window_seconds=correlation_window)
+
+    # 1~3. 이벤트 로그 읽기 → 파일 저장(CSV/NDJSON/columnar) → 반복 오류 분석 (단일 패스 스트리밍 파이프라인)
+    # 레코드는 하나씩 읽혀 파일에 기록된 뒤 곧바로 집계되므로, 전체 목록을 메모리에 보관하지 않음
+    # 로그 디렉토리는 로거 설정 시 결정된 log_dir 사용
+    exporter = create_exporter(export_format, os.path.join(log_dir, f"critical_errors_{timestamp_str}"),
+                               compression=export_compression, background=background_writes, metrics=metrics)
+    collection_completed = False
     try:
-        display_progress(f"Reading event logs ({', '.join(log_names)})...")
-        critical_errors = get_critical_errors(log_types=log_names, max_records=max_events)
+        critical_errors = _collect_events(evtx_files, log_names, max_events, read_workers, bookmarks, metrics,
+                                          deferred=deferred_format, event_filter=event_filter)
+
+        display_progress("Saving critical logs and analyzing recurring errors...")
+        # 각 단계를 감싸 자체 소요 시간을 측정 ('collect' 는 읽기/포맷 외의 레코드 생성 및 대기 시간)
+        if metrics is not None:
+            critical_errors = metrics.timed_iter('collect', critical_errors)
+        if event_store is not None:
+            critical_errors = event_store.passthrough(critical_errors)
+            if metrics is not None:
+                critical_errors = metrics.timed_iter('event_store', critical_errors)
+        with exporter:
+            records = exporter.passthrough(critical_errors)
+            if metrics is not None:
+                records = metrics.timed_iter('export', records)
+            with _stage(metrics, 'aggregate'):
+                aggregator.update(records)
+        collection_completed = True
     except Exception as e:
         logger.error(f"An error occurred during event log processing: {e}", exc_info=True)
         display_error("Failed during event log processing.")
+    finally:
+        if event_store is not None:
+            logger.info(f"Stored {event_store.inserted_count} new events in '{event_store.path}' "
+                        f"({event_store.ignored_count} already stored events skipped).")
+            with _stage(metrics, 'event_store'):
+                event_store.close()
+            if metrics is not None:
+                metrics.add_bytes('event_store', max(_file_size(event_store.path) - event_store_size, 0))
+        if metrics is not None:
+            metrics.add_bytes('export', exporter.bytes_written)
 
-    if not critical_errors:
-        display_warning("No critical/error events found or processing failed.")
-        display_end_message(start_time)
+    # 수집이 끝까지 완료된 경우에만 북마크와 누적 집계를 저장 (중단 시 다음 실행에서 다시 읽음)
+    if checkpoint_store is not None and collection_completed:
+        with _stage(metrics, 'checkpoint'):
+            checkpoint_store.aggregate = aggregator.to_dict()
+            checkpoint_store.save()
+        if metrics is not None:
+            metrics.add_file_bytes('checkpoint', checkpoint_store.path)
+
+    if not exporter.count:
+        if incremental and collection_completed:
+            display_warning("No new critical/error events since the last run.")
+        else:
+            display_warning("No critical/error events found or processing failed.")
         return
 
-    # 2. 필터링된 로그 파일 저장 (CSV)
-    timestamp_str = start_time.strftime("%Y%m%d_%H%M%S")
-    # 로그 디렉토리는 로거 설정 시 결정된 log_dir 사용
-    critical_log_filename = os.path.join(log_dir, f"critical_errors_{timestamp_str}.csv")
-    display_progress(f"Saving {len(critical_errors)} critical logs...")
-    save_critical_logs_to_file(critical_errors, critical_log_filename)
+    _report_recurring_errors(aggregator, top_n, timestamp_str, trend_options=trend_options, metrics=metrics)
+
+def _read_event_filter():
+    """ANALYSIS_FILTER_* 환경 변수로 EventFilter 를 만듭니다. 설정이 잘못되면 경고 후 기본 필터(심각/오류)를 사용합니다."""
+    spec = {
+        'levels': os.getenv('ANALYSIS_FILTER_LEVELS', ''),
+        'since': os.getenv('ANALYSIS_FILTER_SINCE', '').strip(),
+        'until': os.getenv('ANALYSIS_FILTER_UNTIL', '').strip(),
+        'include_sources': os.getenv('ANALYSIS_FILTER_SOURCES', ''),
+        'exclude_sources': os.getenv('ANALYSIS_FILTER_EXCLUDE_SOURCES', ''),
+        'include_event_ids': os.getenv('ANALYSIS_FILTER_EVENT_IDS', ''),
+        'exclude_event_ids': os.getenv('ANALYSIS_FILTER_EXCLUDE_EVENT_IDS', ''),
+        'message_regex': os.getenv('ANALYSIS_FILTER_MESSAGE_REGEX', '')
+    }
+    try:
+        return EventFilter.from_spec(spec)
+    except ValueError as e:
+        logger.warning(f"Invalid event filter settings in environment variables ({e}). Using defaults.")
+        return EventFilter()
+
+def _collect_events(evtx_files, log_names, max_events, read_workers, bookmarks=None, metrics=None, announce=True,
+                    deferred=False, event_filter=None):
+    """설정에 따라 .evtx 파일 또는 라이브 이벤트 로그의 레코드 스트림을 반환합니다 (event_filter 가 없으면 심각/오류만)."""
+    if evtx_files:
+        if announce:
+            display_progress(f"Reading evtx files ({', '.join(evtx_files)})...")
+        return iter_critical_errors_from_evtx(evtx_files, max_records=max_events, read_workers=read_workers,
+                                              bookmarks=bookmarks, metrics=metrics, deferred=deferred,
+                                              event_filter=event_filter)
+    if announce:
+        display_progress(f"Reading event logs ({', '.join(log_names)})...")
+    return iter_critical_errors(log_types=log_names, max_records=max_events, read_workers=read_workers,
+                                bookmarks=bookmarks, metrics=metrics, deferred=deferred, event_filter=event_filter)
+
+def _run_watch(evtx_files, log_names, max_events, read_workers, top_n, group_by_template, event_store=None, metrics=None,
+               deferred=False, event_filter=None, clock=datetime.datetime.now):
+    """
+    감시 모드: 주기마다 북마크 이후의 새 이벤트만 읽어 롤링 윈도우(기본 1h/24h/7d) 집계를 갱신합니다.
+    첫 주기에는 소스별 최대 max_events 건의 최근 이벤트로 윈도우를 채우고,
+    LLM 분석은 기준 윈도우의 상위 N개 오류 구성이 바뀌었을 때(Jaccard 거리 >= 기준값)만 요청합니다.
+    윈도우 시계는 clock(로컬 시각)이며, 라이브 로그와 .evtx 리더 모두 로컬 시각을 반환하므로 같은 기준입니다.
+    Ctrl+C 로 종료합니다.
+    """
+    from src.rolling_window import RollingErrorWindows, top_n_distance
+    try:
+        interval = float(os.getenv('ANALYSIS_WATCH_INTERVAL_SECONDS', '60'))
+        change_threshold = float(os.getenv('ANALYSIS_WATCH_CHANGE_THRESHOLD', '0.3'))
+        durations = [(name.strip(), parse_duration(name))
+                     for name in os.getenv('ANALYSIS_WATCH_WINDOWS', '1h,24h,7d').split(',') if name.strip()]
+        if not durations:
+            raise ValueError("No watch windows configured.")
+    except ValueError:
+        logger.warning("Invalid watch settings (interval, change threshold, windows) in environment variables. Using defaults.")
+        interval = 60.0
+        change_threshold = 0.3
+        durations = [('1h', 3600), ('24h', 86400), ('7d', 604800)]
+    windows = RollingErrorWindows(durations, template_miner=LogTemplateMiner() if group_by_template else None)
+    llm_window_name = os.getenv('ANALYSIS_WATCH_LLM_WINDOW', '').strip()
+    llm_window = windows.get(llm_window_name) or windows.windows[0]
+    logger.info(f"Watch Settings - Interval: {interval}s, Windows: {[name for name, _ in durations]}, LLM Window: {llm_window.name}, Change Threshold: {change_threshold}")
+    display_progress(f"Watching for new events every {interval:g}s (windows: {', '.join(name for name, _ in durations)}). "
+                     "Press Ctrl+C to stop.")
 
-    # 3. 반복 오류 분석
-    display_progress("Analyzing recurring errors...")
-    summary_text, recurring_error_details = find_recurring_errors(critical_errors, top_n=top_n)
+    bookmarks = {} # 주기 사이에 유지되어 다음 주기에는 새 이벤트만 읽음
+    reported_top = None # 마지막으로 LLM 분석을 요청한 상위 N개 식별자
+    try:
+        while True:
+            cycle_started = time.monotonic()
+            windows.advance(datetime_to_epoch(clock()))
+            try:
+                records = _collect_events(evtx_files, log_names, max_events, read_workers, bookmarks, metrics,
+                                          announce=reported_top is None, deferred=deferred, event_filter=event_filter)
+                if event_store is not None:
+                    records = event_store.passthrough(records)
+                with _stage(metrics, 'watch_update'):
+                    added, total = windows.update(records)
+                logger.info(f"Watch cycle: {total} new events, {added} within the rolling windows.")
+            except Exception as e:
+                # 한 주기의 수집 실패로 감시를 중단하지 않음 (북마크가 갱신되지 않은 소스는 다음 주기에 다시 읽음)
+                logger.error(f"An error occurred during event log processing: {e}", exc_info=True)
+                display_error("Failed during event log processing. Retrying in the next cycle.")
+
+            status_rows = []
+            llm_aggregator = None
+            for window in windows:
+                aggregator = window.aggregate()
+                if window is llm_window:
+                    llm_aggregator = aggregator
+                top = aggregator.most_common(1)
+                status_rows.append({
+                    'Window': window.name,
+                    'Errors': aggregator.total_count,
+                    'Distinct': len(aggregator.stats),
+                    'TopError': f"{top[0][0][0]} / {top[0][0][1]} ({top[0][1].count})" if top else None
+                })
+            display_window_status(status_rows)
+
+            current_top = {identifier for identifier, _ in llm_aggregator.most_common(top_n)}
+            if current_top and (reported_top is None or top_n_distance(reported_top, current_top) >= change_threshold):
+                logger.info(f"Top {top_n} errors in the {llm_window.name} window changed. Requesting a new analysis.")
+                _report_recurring_errors(llm_aggregator, top_n, clock().strftime("%Y%m%d_%H%M%S"),
+                                         metrics=metrics)
+                reported_top = current_top
+            elif reported_top is None:
+                reported_top = set()
+            time.sleep(max(0.0, interval - (time.monotonic() - cycle_started)))
+    except KeyboardInterrupt:
+        display_progress("Watch mode stopped.")
+    finally:
+        if event_store is not None:
+            logger.info(f"Stored {event_store.inserted_count} new events in '{event_store.path}' "
+                        f"({event_store.ignored_count} already stored events skipped).")
+            event_store.close()
 
+def _run_fleet(fleet_dir, max_events, top_n, group_by_template, timestamp_str, metrics=None, event_filter=None):
+    """플릿 모드: 호스트별 내보내기 파일을 병렬로 집계해 전체 상위 N개 오류와 호스트별 분포를 보고합니다."""
+    # 프로세스 풀(multiprocessing)은 플릿 모드에서만 불러옴
+    from src.fleet import analyze_fleet, DEFAULT_HISTOGRAM_SECONDS
+    try:
+        workers = int(os.getenv('ANALYSIS_FLEET_WORKERS', '0'))
+        histogram_seconds = int(os.getenv('ANALYSIS_FLEET_HISTOGRAM_SECONDS', str(DEFAULT_HISTOGRAM_SECONDS)))
+        if histogram_seconds <= 0:
+            raise ValueError("Histogram interval must be positive.")
+    except ValueError:
+        logger.warning("Invalid fleet settings (workers, histogram interval) in environment variables. Using defaults.")
+        workers = 0
+        histogram_seconds = DEFAULT_HISTOGRAM_SECONDS
+    fleet_path = fleet_dir if os.path.isabs(fleet_dir) else os.path.join(PROJECT_ROOT, fleet_dir)
+    logger.info(f"Fleet Settings - Directory: {fleet_path}, Workers: {workers or os.cpu_count()}, Max Events Per File: {max_events}, Histogram Interval: {histogram_seconds}s")
+    if not os.path.isdir(fleet_path):
+        display_error(f"Fleet directory not found: {fleet_path}")
+        return
+
+    display_progress(f"Aggregating fleet exports under '{fleet_path}'...")
+    try:
+        with _stage(metrics, 'fleet'):
+            fleet = analyze_fleet(fleet_path, workers=workers, group_by_template=group_by_template,
+                                  max_records=max_events, histogram_seconds=histogram_seconds, metrics=metrics,
+                                  event_filter=event_filter)
+    except Exception as e:
+        logger.error(f"An error occurred during fleet analysis: {e}", exc_info=True)
+        display_error("Failed during fleet analysis.")
+        return
+    display_fleet_hosts(fleet.host_rows())
+    if not fleet.total_count:
+        display_warning("No critical/error events found in the fleet exports.")
+        return
+    _report_recurring_errors(fleet, top_n, timestamp_str, metrics=metrics)
+
+def _report_recurring_errors(aggregator, top_n, timestamp_str, trend_options=None, metrics=None):
+    """집계 결과(또는 FleetAggregator)의 상위 반복 오류를 출력/저장하고 LLM 해결 방안을 요청합니다."""
+    with _stage(metrics, 'summarize'):
+        if hasattr(aggregator, 'summarize'):
+            summary_text, recurring_error_details = aggregator.summarize(top_n=top_n)
+        else:
+            summary_text, recurring_error_details = summarize_recurring_errors(aggregator, top_n=top_n, trend_options=trend_options)
     if not recurring_error_details:
         display_warning(summary_text)
-    else:
-        display_error_summary(summary_text)
-        # 3.1 반복 오류 상세 결과 저장 (JSON)
-        recurring_errors_filename = os.path.join(log_dir, f"recurring_errors_{timestamp_str}.json")
-        save_recurring_errors_to_json(recurring_error_details, recurring_errors_filename)
-
-        # 4. LLM에게 해결 방안 요청
-        display_progress("Requesting analysis from LLM...")
-        # LLM 함수는 내부적으로 환경 변수 사용하므로 config 객체 전달 불필요
-        llm_suggestions = get_llm_suggestions_from_env(recurring_error_details)
+        return
 
-        # 5. LLM 결과 출력
-        display_llm_results(llm_suggestions)
+    display_error_summary(summary_text)
+    # 3.1 반복 오류 상세 결과 저장 (JSON). 백그라운드 기록 시 LLM 요청과 동시에 기록하고 함수가 끝나기 전에 완료를 기다림
+    # (상세 데이터는 이후 단계에서 읽기만 하므로 스레드 사이에 복사하지 않음)
+    recurring_errors_filename = os.path.join(log_dir, f"recurring_errors_{timestamp_str}.json")
+    with BackgroundWriter('report-writer') as report_writer:
+        if _background_writes_enabled():
+            report_writer.submit(_save_json_report, recurring_error_details, recurring_errors_filename, metrics)
+        else:
+            _save_json_report(recurring_error_details, recurring_errors_filename, metrics)
+        _request_llm_suggestions(recurring_error_details, metrics)
 
-    display_end_message(start_time)
+def _save_json_report(recurring_error_details, filename, metrics=None):
+    with _stage(metrics, 'json_save'):
+        save_recurring_errors_to_json(recurring_error_details, filename)
+    if metrics is not None:
+        metrics.add_file_bytes('json_save', filename)
 
-if __name__ == "__main__":
-    # 관리자 권한 확인 (이전과 동일)
-    is_admin = False
-    if os.name == 'nt':
-        try:
-            import ctypes
-            is_admin = ctypes.windll.shell32.IsUserAnAdmin() != 0
-        except Exception as e:
-            logger.warning(f"Could not check for administrator privileges: {e}")
+def _request_llm_suggestions(recurring_error_details, metrics=None):
+    """LLM 에게 상위 반복 오류의 해결 방안을 요청해 출력합니다."""
+    # 4. LLM에게 해결 방안 요청
+    display_progress("Requesting analysis from LLM...")
+    # LLM 함수는 내부적으로 환경 변수 사용하므로 config 객체 전달 불필요
+    # LLM_CACHE_FILE 을 빈 값으로 설정하면 응답 캐시를 사용하지 않음
+    llm_cache_filename = os.getenv('LLM_CACHE_FILE', 'llm_cache.json').strip()
+    llm_cache_path = os.path.join(log_dir, llm_cache_filename) if llm_cache_filename else None
+    with _stage(metrics, 'llm'):
+        if is_streaming_enabled():
+            # 스트리밍 모드: 응답 조각이 도착하는 대로 화면에 표시
+            with LlmStreamDisplay() as stream_display:
+                llm_suggestions = get_llm_suggestions_from_env(recurring_error_details, cache_path=llm_cache_path,
+                                                               on_progress=stream_display.update)
+        else:
+            llm_suggestions = get_llm_suggestions_from_env(recurring_error_details, cache_path=llm_cache_path)
 
-        if not is_admin:
-            logger.warning("This script might require administrator privileges to read all event logs.")
+    # 5. LLM 결과 출력
+    display_llm_results(llm_suggestions)
 
-    run_analyzer()
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
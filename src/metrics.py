@@ -0,0 +1,292 @@
+import json
+import logging
+import os
+import sys
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def peak_rss_bytes():
+    """프로세스의 최대 상주 메모리(peak RSS) 를 바이트 단위로 반환합니다 (확인할 수 없으면 None)."""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # macOS 는 바이트, Linux 는 KB 단위
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    try:
+        import ctypes
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                        ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                        ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                        ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                        ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t)]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        process = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except Exception as e:
+        logger.debug(f"Could not read peak memory usage: {e}")
+    return None
+
+
+class PipelineMetrics:
+    """
+    분석 단계별 소요 시간, 처리 건수, 기록 바이트 수를 수집합니다.
+    단계는 중첩될 수 있으며(스트리밍 파이프라인에서 하위 단계의 next() 가 상위 단계 안에서 호출됨),
+    각 단계에는 하위 단계에서 보낸 시간을 뺀 자체 시간만 기록됩니다.
+    스레드별로 따로 집계한 뒤 합치므로, 병렬 읽기/포맷 단계의 시간은 스레드 시간의 합입니다.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.finished = None
+        self._order = [] # 단계 이름 (처음 기록된 순서)
+        self._bytes = {}
+        self._thread_totals = [] # 스레드별 {단계 이름: [초, 건수]}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _state(self):
+        state = self._local
+        if not hasattr(state, 'stack'):
+            state.stack = []
+            state.totals = {}
+            with self._lock:
+                self._thread_totals.append(state.totals)
+        return state
+
+    def _register(self, name):
+        if name not in self._order:
+            with self._lock:
+                if name not in self._order:
+                    self._order.append(name)
+
+    def _enter(self, name):
+        state = self._state()
+        now = time.perf_counter()
+        if state.stack:
+            # 상위 단계의 시간을 멈춤
+            parent = state.stack[-1]
+            state.totals[parent[0]][0] += now - parent[1]
+        if name not in state.totals:
+            state.totals[name] = [0.0, 0]
+            self._register(name)
+        state.stack.append([name, now])
+
+    def _exit(self, items=0):
+        state = self._local
+        now = time.perf_counter()
+        name, resumed = state.stack.pop()
+        totals = state.totals[name]
+        totals[0] += now - resumed
+        totals[1] += items
+        if state.stack:
+            state.stack[-1][1] = now # 상위 단계 시간 재개
+
+    def stage(self, name, items=0):
+        """with 블록을 단계 name 으로 측정하는 컨텍스트 관리자."""
+        return _StageContext(self, name, items)
+
+    def timed_iter(self, name, iterable):
+        """이터러블의 next() 에 걸린 시간을 단계 name 으로 기록하며 항목을 그대로 내보냅니다 (항목 수 = 처리 건수)."""
+        iterator = iter(iterable)
+        try:
+            while True:
+                self._enter(name)
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    self._exit()
+                    return
+                except BaseException:
+                    self._exit()
+                    raise
+                self._exit(1)
+                yield item
+        finally:
+            close = getattr(iterator, 'close', None)
+            if close is not None:
+                close()
+
+    def timed_call(self, name, func):
+        """func 호출 시간을 단계 name 으로 기록하는 래퍼를 반환합니다 (호출 수 = 처리 건수)."""
+        def wrapper(*args, **kwargs):
+            self._enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(1)
+        return wrapper
+
+    def add_bytes(self, name, byte_count):
+        """단계 name 에서 기록한 바이트 수를 더합니다."""
+        if not byte_count:
+            return
+        self._register(name)
+        with self._lock:
+            self._bytes[name] = self._bytes.get(name, 0) + byte_count
+
+    def add_file_bytes(self, name, path):
+        """파일 크기를 단계 name 의 기록 바이트 수로 더합니다 (파일이 없으면 무시)."""
+        try:
+            self.add_bytes(name, os.path.getsize(path))
+        except OSError:
+            pass
+
+    def finish(self):
+        self.finished = time.perf_counter()
+        return self
+
+    def to_dict(self):
+        """단계별 측정 결과를 JSON 으로 저장할 수 있는 dict 로 반환합니다."""
+        with self._lock:
+            thread_totals = [dict(totals) for totals in self._thread_totals]
+            order = list(self._order)
+            written = dict(self._bytes)
+        stages = []
+        for name in order:
+            seconds = sum(totals[name][0] for totals in thread_totals if name in totals)
+            items = sum(totals[name][1] for totals in thread_totals if name in totals)
+            stages.append({
+                'Stage': name,
+                'Seconds': round(seconds, 4),
+                'Items': items,
+                'ItemsPerSecond': round(items / seconds, 1) if items and seconds > 0 else None,
+                'BytesWritten': written.get(name, 0)
+            })
+        end = self.finished if self.finished is not None else time.perf_counter()
+        return {
+            'TotalSeconds': round(end - self.started, 4),
+            'PeakRssBytes': peak_rss_bytes(),
+            'Stages': stages
+        }
+
+    def save_json(self, filename):
+        try:
+            os.makedirs(os.path.dirname(filename) or '.', exist_ok=True)
+            with open(filename, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=4, ensure_ascii=False)
+            logger.info(f"Saved run metrics to '{filename}'.")
+        except (OSError, TypeError, ValueError) as e:
+            logger.error(f"Failed to save run metrics to '{filename}': {e}", exc_info=True)
+
+
+class _StageContext:
+    __slots__ = ('_metrics', '_name', '_items')
+
+    def __init__(self, metrics, name, items):
+        self._metrics = metrics
+        self._name = name
+        self._items = items
+
+    def __enter__(self):
+        self._metrics._enter(self._name)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._metrics._exit(self._items)
+        return False
+
+
+class Profiler:
+    """
+    선택적 프로파일링 (mode: 'cprofile', 'tracemalloc' 또는 'both').
+    stop() 시 cProfile 통계(.prof, 누적 시간 상위 함수 텍스트)와 tracemalloc 할당 상위 위치를 output_prefix 로 저장합니다.
+    cProfile 은 Python 3.12 미만에서 enable() 한 스레드만 측정하므로, start() 이후 시작된 스레드(읽기/포맷 작업자 등)는
+    스레드마다 별도 프로파일로 측정하고 stop() 시 하나의 통계로 합칩니다 (3.12 부터는 한 프로파일이 모든 스레드를 측정).
+    """
+
+    def __init__(self, mode, output_prefix):
+        mode = (mode or '').strip().lower()
+        self.use_cprofile = mode in ('cprofile', 'both')
+        self.use_tracemalloc = mode in ('tracemalloc', 'both')
+        self.output_prefix = output_prefix
+        self._profile = None
+        self._thread_profiles = []
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.use_cprofile or self.use_tracemalloc
+
+    def start(self):
+        if self.use_tracemalloc:
+            import tracemalloc
+            tracemalloc.start(25)
+        if self.use_cprofile:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+            if sys.version_info < (3, 12):
+                threading.setprofile(self._start_thread_profile)
+        return self
+
+    def _start_thread_profile(self, *args):
+        """새 스레드의 첫 프로파일 이벤트에서 그 스레드용 cProfile 을 켭니다 (이후 이벤트는 cProfile 이 받음)."""
+        import cProfile
+        profile = cProfile.Profile()
+        with self._lock:
+            if self._profile is None:
+                return
+            self._thread_profiles.append(profile)
+        profile.enable()
+
+    def stop(self):
+        try:
+            os.makedirs(os.path.dirname(self.output_prefix) or '.', exist_ok=True)
+        except OSError:
+            pass
+        if self._profile is not None:
+            threading.setprofile(None)
+            self._profile.disable()
+        # 통계 저장 과정의 할당이 섞이지 않도록 tracemalloc 스냅샷을 먼저 저장
+        if self.use_tracemalloc:
+            self._dump_tracemalloc()
+        if self._profile is not None:
+            self._dump_cprofile()
+            with self._lock:
+                self._profile = None
+                self._thread_profiles = []
+
+    def _dump_cprofile(self):
+        import io
+        import pstats
+        try:
+            text = io.StringIO()
+            stats = pstats.Stats(self._profile, stream=text)
+            with self._lock:
+                thread_profiles = list(self._thread_profiles)
+            for profile in thread_profiles:
+                stats.add(profile)
+            stats.dump_stats(f"{self.output_prefix}.prof")
+            stats.sort_stats('cumulative').print_stats(40)
+            with open(f"{self.output_prefix}_cprofile.txt", 'w', encoding='utf-8') as f:
+                f.write(text.getvalue())
+            logger.info(f"Saved cProfile output to '{self.output_prefix}.prof' ({len(thread_profiles)} worker thread(s) merged).")
+        except OSError as e:
+            logger.error(f"Failed to save cProfile output: {e}", exc_info=True)
+
+    def _dump_tracemalloc(self):
+        import tracemalloc
+        if not tracemalloc.is_tracing():
+            return
+        try:
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(f"{self.output_prefix}_tracemalloc.txt", 'w', encoding='utf-8') as f:
+                f.write(f"Current traced memory: {current} bytes, peak: {peak} bytes\n\n")
+                for stat in snapshot.statistics('lineno')[:30]:
+                    f.write(f"{stat}\n")
+            logger.info(f"Saved tracemalloc output to '{self.output_prefix}_tracemalloc.txt'.")
+        except OSError as e:
+            logger.error(f"Failed to save tracemalloc output: {e}", exc_info=True)
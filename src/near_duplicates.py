@@ -0,0 +1,213 @@
+import heapq
+import importlib.util
+import operator
+import random
+import zlib
+
+from src.log_template_miner import mask_message
+
+# numpy 가 있으면 서명을 배치 단위 벡터 연산으로 계산하고, 없으면 같은 결과를 순수 Python 으로 계산
+np = None
+
+def _load_numpy():
+    """numpy 를 불러와 반환합니다 (설치되어 있지 않으면 None)."""
+    global np
+    if np is None and importlib.util.find_spec('numpy') is not None:
+        import numpy
+        np = numpy
+    return np
+
+# MinHash 서명 길이(해시 함수 수)와 LSH 밴드 수 (밴드당 행 수 = 서명 길이 / 밴드 수)
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+# 대표 메시지와의 추정 Jaccard 유사도가 이 값 이상이면 같은 군집으로 봄
+DEFAULT_SIMILARITY_THRESHOLD = 0.6
+# 문자(바이트) 단위 shingle 길이. 메시지 앞부분 MAX_SHINGLE_BYTES 바이트만 사용
+DEFAULT_SHINGLE_SIZE = 5
+MAX_SHINGLE_BYTES = 1024
+# 후보 군집 중 겹치는 밴드가 많은 순으로 서명 유사도를 확인할 최대 개수
+MAX_VERIFIED_CANDIDATES = 3
+# 식별자(Source, EventID[, 템플릿 ID])당 최대 군집 수. 넘치면 새 형태의 메시지는 군집 없이 건수만 셈
+DEFAULT_MAX_CLUSTERS = 100
+# 서명을 한 번에 계산하는 서로 다른 메시지 수와, numpy 계산 시 한 번에 펼치는 shingle 수
+DEFAULT_BATCH_SIZE = 4096
+_SIGNATURE_CHUNK_SHINGLES = 16384
+
+_MASK64 = (1 << 64) - 1
+
+
+class MessageCluster:
+    """서로 비슷한 메시지 군집. 처음 들어온 메시지를 대표로 하고 그 MinHash 서명으로 비교합니다."""
+    __slots__ = ('representative', 'signature', 'size')
+
+    def __init__(self, representative, signature, size=0):
+        self.representative = representative
+        self.signature = signature
+        self.size = size
+
+
+class _MessageGroup:
+    """식별자 하나의 군집 목록과 LSH 밴드 테이블."""
+    __slots__ = ('clusters', 'bands', 'unclustered')
+
+    def __init__(self, band_count):
+        self.clusters = []
+        self.bands = [{} for _ in range(band_count)] # 밴드별: 서명 조각 -> [MessageCluster, ...]
+        self.unclustered = 0 # 군집 수 상한으로 군집에 넣지 못한 메시지 수
+
+
+class NearDuplicateClusterer:
+    """
+    MinHash/LSH 로 식별자(Source, EventID[, 템플릿 ID])별 거의 같은 메시지(PID, 경로, 시각만 다른 메시지 등)를 군집화합니다.
+    메시지를 shingle_size 바이트 shingle 집합으로 보고 num_perm 개 해시의 최솟값으로 서명을 만든 뒤,
+    서명을 bands 개 조각으로 나눠 한 조각이라도 같은 군집만 후보로 삼아 대표 메시지와의 추정 유사도를 확인하므로
+    메시지당 비용은 군집 수와 거의 무관합니다 (모든 쌍을 비교하지 않음).
+    shingle 은 가변 토큰(GUID, 경로, IP, 16진수, 숫자)을 마스킹(mask_message)한 메시지로 만들며, 마스킹한 메시지가 같으면 서명을 한 번만 계산하며(배치 내 중복 제거 + 메시지 캐시),
+    서명은 batch_size 개씩 모아 계산합니다.
+    메모리는 식별자 수 × max_clusters 개 군집(대표 메시지와 서명)과 캐시 크기로 제한됩니다.
+    """
+
+    def __init__(self, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS, similarity_threshold=DEFAULT_SIMILARITY_THRESHOLD,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, max_clusters=DEFAULT_MAX_CLUSTERS, batch_size=DEFAULT_BATCH_SIZE,
+                 message_cache_size=50000, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands}).")
+        self.num_perm = num_perm
+        self.band_count = bands
+        self.rows_per_band = num_perm // bands
+        self.similarity_threshold = similarity_threshold
+        self.shingle_size = shingle_size
+        self.max_clusters = max_clusters
+        self.batch_size = batch_size
+        self.message_cache_size = message_cache_size
+        # 해시 함수 i: ((a_i × h + b_i) mod 2^64) >> 32 (a_i 는 홀수), 같은 seed 면 항상 같은 서명
+        rng = random.Random(seed)
+        self._perms = [(rng.getrandbits(64) | 1, rng.getrandbits(64)) for _ in range(num_perm)]
+        self._groups = {} # 식별자 -> _MessageGroup
+        self._pending = {} # (식별자, 마스킹한 메시지) -> [원본 메시지, 건수] (서명 계산 대기)
+        self._cache = {} # (식별자, 마스킹한 메시지) -> MessageCluster (같은 형태 반복 시 서명 계산 생략)
+
+    def add(self, identifier, message, count=1):
+        key = (identifier, mask_message(message))
+        cluster = self._cache.get(key)
+        if cluster is not None:
+            cluster.size += count
+            return
+        pending = self._pending.get(key)
+        if pending is not None:
+            pending[1] += count
+            return
+        self._pending[key] = [message, count]
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+
+    # --- 서명 ---
+    def _shingle_hashes(self, message):
+        data = message.encode('utf-8', 'replace')[:MAX_SHINGLE_BYTES]
+        size = self.shingle_size
+        if len(data) <= size:
+            return [zlib.crc32(data)]
+        return list({zlib.crc32(data[i:i + size]) for i in range(len(data) - size + 1)})
+
+    def signatures(self, messages):
+        """(마스킹한) 메시지 목록의 MinHash 서명(int 튜플) 목록을 반환합니다."""
+        hash_lists = [self._shingle_hashes(message) for message in messages]
+        if _load_numpy() is None:
+            perms = self._perms
+            return [tuple(min(((a * h + b) & _MASK64) >> 32 for h in hashes) for a, b in perms)
+                    for hashes in hash_lists]
+
+        a = np.array([[a] for a, _ in self._perms], dtype=np.uint64)
+        b = np.array([[b] for _, b in self._perms], dtype=np.uint64)
+        signatures = []
+        start = 0
+        while start < len(hash_lists):
+            # shingle 수가 _SIGNATURE_CHUNK_SHINGLES 를 넘지 않도록 메시지를 나눠 (shingle × 해시 함수) 행렬을 계산
+            end, total = start, 0
+            while end < len(hash_lists) and (end == start or total + len(hash_lists[end]) <= _SIGNATURE_CHUNK_SHINGLES):
+                total += len(hash_lists[end])
+                end += 1
+            chunk = hash_lists[start:end]
+            hashes = np.fromiter((h for hashes in chunk for h in hashes), dtype=np.uint64, count=total)
+            offsets = np.zeros(len(chunk), dtype=np.int64)
+            np.cumsum([len(hashes) for hashes in chunk[:-1]], out=offsets[1:])
+            # (해시 함수 × shingle) 행렬. uint64 곱셈/덧셈은 2^64 를 법으로 순환하며, 제자리 연산으로 임시 배열을 줄임
+            values = a * hashes
+            values += b
+            values >>= np.uint64(32)
+            signatures.extend(map(tuple, np.minimum.reduceat(values, offsets, axis=1).T.tolist()))
+            start = end
+        return signatures
+
+    def _similarity(self, first, second):
+        return sum(map(operator.eq, first, second)) / self.num_perm
+
+    def _band_keys(self, signature):
+        rows = self.rows_per_band
+        return [signature[i:i + rows] for i in range(0, self.num_perm, rows)]
+
+    # --- 군집화 ---
+    def _group(self, identifier):
+        group = self._groups.get(identifier)
+        if group is None:
+            group = self._groups[identifier] = _MessageGroup(self.band_count)
+        return group
+
+    def _assign(self, group, message, signature, count):
+        """서명이 가장 비슷한 후보 군집에 넣거나 새 군집을 만듭니다. 군집 수 상한이면 None 을 반환합니다."""
+        band_keys = self._band_keys(signature)
+        # 겹치는 밴드 수로 후보 순위를 매기고, 상위 후보만 서명 전체로 유사도를 확인
+        collisions = {}
+        for table, band_key in zip(group.bands, band_keys):
+            for candidate in table.get(band_key, ()):
+                collisions[candidate] = collisions.get(candidate, 0) + 1
+        best, best_similarity = None, self.similarity_threshold
+        for candidate in heapq.nlargest(MAX_VERIFIED_CANDIDATES, collisions, key=collisions.get):
+            similarity = self._similarity(signature, candidate.signature)
+            if similarity >= best_similarity:
+                best, best_similarity = candidate, similarity
+        if best is None:
+            if len(group.clusters) >= self.max_clusters:
+                group.unclustered += count
+                return None
+            best = MessageCluster(message, signature)
+            group.clusters.append(best)
+            for table, band_key in zip(group.bands, band_keys):
+                table.setdefault(band_key, []).append(best)
+        best.size += count
+        return best
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending = list(self._pending.items())
+        self._pending = {}
+        signatures = self.signatures([masked for (_, masked), _ in pending])
+        for (key, (message, count)), signature in zip(pending, signatures):
+            cluster = self._assign(self._group(key[0]), message, signature, count)
+            if cluster is None:
+                continue
+            if len(self._cache) >= self.message_cache_size:
+                self._cache.clear()
+            self._cache[key] = cluster
+
+    def merge(self, other):
+        """다른 군집화 결과를 합칩니다 (각 군집을 대표 메시지와 건수로 다시 배정)."""
+        other._flush()
+        self._flush()
+        for identifier, other_group in other._groups.items():
+            group = self._group(identifier)
+            group.unclustered += other_group.unclustered
+            for cluster in other_group.clusters:
+                self._assign(group, cluster.representative, cluster.signature, cluster.size)
+        return self
+
+    # --- 결과 ---
+    def summary(self, identifier, top_n=5):
+        """식별자의 (군집 수, 군집에 넣지 못한 메시지 수, 크기 순 상위 top_n 개 MessageCluster) 를 반환합니다."""
+        self._flush()
+        group = self._groups.get(identifier)
+        if group is None:
+            return 0, 0, []
+        top = sorted(group.clusters, key=lambda cluster: -cluster.size)[:top_n]
+        return len(group.clusters), group.unclustered, top
@@ -0,0 +1,181 @@
+import datetime
+import logging
+import math
+
+from src.log_template_miner import mask_message
+
+logger = logging.getLogger(__name__)
+
+# 오류 하나의 상세 수준별 (샘플/템플릿 최대 글자 수, 급증 구간 최대 개수). 마지막 수준은 기본 정보만 포함
+DETAIL_LEVELS = [(200, 3), (100, 1), (60, 0), (0, 0)]
+
+# 프롬프트 고정 부분 ({error_summary_text} 자리에 오류 요약이 들어감)
+PROMPT_TEMPLATE = """
+당신은 숙련된 Windows 시스템 관리자이자 문제 해결 전문가입니다.
+Windows PC의 이벤트 로그를 분석하여 반복적으로 발생하는 주요 심각/오류 이벤트를 확인했습니다.
+
+다음은 가장 빈번하게 발생한 오류들의 요약 정보입니다:
+{error_summary_text}
+
+위에 제공된 정보(소스, 이벤트 ID, 발생 횟수, 샘플 메시지 일부)만을 바탕으로, 각 오류에 대해 다음을 **한국어**로 수행해 주십시오:
+
+1.  **잠재적 원인 식별:** 이 오류가 발생할 수 있는 가장 가능성 높은 이유를 간략하게 설명합니다.
+2.  **구체적인 문제 해결 단계 제공:** 사용자가 문제를 진단하고 잠재적으로 해결하기 위해 취할 수 있는 구체적이고 단계적인 조치를 제안합니다. 실용적이고 실행 가능한 조언에 초점을 맞추고, 가장 일반적이거나 효과적인 해결책을 우선적으로 제시합니다.
+3.  **구조:** 위에서 식별된 각 오류에 대한 분석(원인 및 단계)을 "### 오류 #1 분석", "### 오류 #2 분석" 과 같은 제목으로 오류 순서대로 구분하고, 제목 앞에는 다른 내용을 쓰지 마십시오.
+
+**중요:**
+* 추가 정보를 요청하지 마십시오. 입력된 요약 정보만을 바탕으로 최선의 지침을 제공하십시오.
+* 당신의 목표는 이 로그를 바탕으로 사용자가 PC 문제를 해결하도록 돕는 것입니다.
+* **반드시 한국어로 답변해야 합니다.** 명확하고 이해하기 쉬운 한국어를 사용해 주십시오.
+"""
+
+
+def estimate_tokens(text):
+    """
+    토크나이저 없이 토큰 수를 보수적으로 추정합니다.
+    ASCII 문자는 약 4글자당 1토큰, 한글 등 그 밖의 문자는 글자당 1토큰으로 계산합니다.
+    """
+    ascii_count = len(text.encode('ascii', 'ignore'))
+    return math.ceil(ascii_count / 4) + (len(text) - ascii_count)
+
+
+def _parse_timestamp(timestamp):
+    try:
+        return datetime.datetime.strptime(timestamp, '%Y-%m-%d %H:%M:%S')
+    except (TypeError, ValueError):
+        return None
+
+
+def _truncate(text, limit):
+    return text[:limit] + ('...' if len(text) > limit else '')
+
+
+class PromptBuilder:
+    """
+    토큰 예산에 맞춰 LLM 프롬프트를 조립합니다.
+    - prioritize: 오류를 영향도(발생 횟수, 최근성, 급증/증가 추세) 순으로 정렬하고, 기본 정보만으로도
+      예산을 넘는 하위 오류는 제외합니다.
+    - build: 가변 값을 마스킹했을 때 같은 샘플 메시지는 한 번만 싣고, 예산을 넘으면 순위가 낮은 오류부터
+      샘플/템플릿/급증 구간을 줄여 예산에 맞춥니다.
+    """
+
+    def __init__(self, token_budget=4000):
+        self.token_budget = token_budget
+        self._fixed_tokens = estimate_tokens(PROMPT_TEMPLATE.format(error_summary_text=''))
+
+    # --- 순위 ---
+    @staticmethod
+    def impact_scores(errors):
+        """오류별 영향도 점수 (0~1): 발생 횟수 60%, 마지막 발생 시각의 최근성 25%, 급증/증가 추세 15%."""
+        max_count = max((error.get('Count') or 0 for error in errors), default=0) or 1
+        last_seen = [_parse_timestamp(error.get('LastSeen')) for error in errors]
+        known = [timestamp for timestamp in last_seen if timestamp is not None]
+        newest, oldest = (max(known), min(known)) if known else (None, None)
+        span = (newest - oldest).total_seconds() if known else 0
+
+        scores = []
+        for error, timestamp in zip(errors, last_seen):
+            count_score = (error.get('Count') or 0) / max_count
+            if timestamp is None:
+                recency_score = 0.0
+            elif span:
+                recency_score = 1.0 - (newest - timestamp).total_seconds() / span
+            else:
+                recency_score = 1.0
+            burst_score = min(len(error.get('Bursts') or []), 3) / 3 * 0.5
+            if (error.get('Trend') or {}).get('Rising'):
+                burst_score += 0.5
+            scores.append(0.6 * count_score + 0.25 * recency_score + 0.15 * burst_score)
+        return scores
+
+    def prioritize(self, errors):
+        """영향도 순으로 정렬한 오류 목록을 반환합니다 (최소 상세 수준으로도 예산을 넘는 하위 오류는 제외)."""
+        scores = self.impact_scores(errors)
+        ranked = [error for _, error in sorted(zip(scores, errors), key=lambda item: -item[0])]
+        used = self._fixed_tokens
+        selected = []
+        for error in ranked:
+            used += estimate_tokens(self._format_error(len(selected) + 1, error, len(DETAIL_LEVELS) - 1, None))
+            if selected and used > self.token_budget:
+                break
+            selected.append(error)
+        if len(selected) < len(ranked):
+            logger.warning(f"Prompt token budget ({self.token_budget}) exceeded. "
+                           f"Sending {len(selected)} of {len(ranked)} errors to the LLM.")
+        return selected
+
+    # --- 조립 ---
+    def _format_error(self, number, error, level, duplicate_of):
+        text_limit, max_bursts = DETAIL_LEVELS[level]
+        lines = [
+            f"\n--- 오류 #{number} ---",
+            f"소스: {error.get('Source', '알 수 없음')}",
+            f"이벤트 ID: {error.get('EventID', '알 수 없음')}",
+            f"발생 횟수: {error.get('Count', '알 수 없음')}",
+        ]
+        if error.get('HostCount'):
+            # 플릿 분석 시 영향 호스트 수와 가장 많이 발생한 호스트
+            top_hosts = ", ".join(f"{host['Host']}({host['Count']}건)" for host in (error.get('TopHosts') or [])[:3])
+            lines.append(f"영향 호스트 수: {error['HostCount']}" + (f" (상위: {top_hosts})" if top_hosts else ""))
+        if error.get('Template') and text_limit:
+            # 템플릿 기준 그룹핑 시 가변 값(<NUM>, <PATH> 등)이 마스킹된 메시지 형태
+            lines.append(f"메시지 템플릿: {_truncate(error['Template'], text_limit)}")
+        bursts = error.get('Bursts') or []
+        for burst in sorted(bursts, key=lambda burst: -burst['Count'])[:max_bursts]:
+            lines.append(f"급증 구간: {burst['Start']} ~ {burst['End']} "
+                         f"({burst['Count']}건, 평소 구간당 약 {burst['Baseline']}건)")
+        if (error.get('Trend') or {}).get('Rising'):
+            lines.append("추세: 분석 기간 동안 발생 빈도 증가")
+        clusters = error.get('MessageClusters') or []
+        if len(clusters) > 1:
+            # 유사 메시지 군집화 시 같은 오류 안의 메시지 변형 수와 큰 군집의 대표 메시지
+            lines.append(f"메시지 변형: {error.get('MessageClusterCount', len(clusters))}가지")
+            if text_limit:
+                for cluster in clusters[:max_bursts]:
+                    lines.append(f"  - {cluster['Count']}건: {_truncate(cluster['Representative'], text_limit // 2)}")
+        followers = error.get('FollowedBy') or []
+        if followers:
+            # 상관 분석 시 이 오류 이후 일정 시간 안에 평소보다 자주 뒤따른 오류 (근본 원인/연쇄 오류 판단용)
+            described = ", ".join(f"{follower['Source']} {follower['EventID']}"
+                                  f"({follower['Count']}건, {follower['Confidence']:.0%}, 향상도 {follower['Lift']})"
+                                  for follower in followers[:max(max_bursts, 1)])
+            lines.append(f"이후 {error.get('CorrelationWindowSeconds')}초 안에 자주 발생: {described}")
+        sequences = error.get('Sequences') or []
+        if sequences and max_bursts:
+            sequence = sequences[0]
+            lines.append("자주 나타나는 순서: " + " → ".join(f"{item['Source']} {item['EventID']}" for item in sequence['Sequence'])
+                         + f" ({sequence['Count']}건)")
+        if text_limit and duplicate_of is not None:
+            lines.append(f"샘플 메시지 일부: 오류 #{duplicate_of} 의 샘플과 같은 형식")
+        elif text_limit:
+            lines.append(f"샘플 메시지 일부: {_truncate(error.get('SampleMessage') or '메시지 없음', text_limit)}")
+        return "\n".join(lines) + "\n"
+
+    def _render(self, errors, levels, duplicates):
+        summary = "".join(self._format_error(i + 1, error, level, duplicates[i])
+                          for i, (error, level) in enumerate(zip(errors, levels)))
+        return PROMPT_TEMPLATE.format(error_summary_text=summary)
+
+    def build(self, errors):
+        """오류 목록(순서가 곧 오류 번호)으로 토큰 예산에 맞춘 프롬프트를 만듭니다."""
+        # 가변 값을 마스킹한 샘플이 앞선 오류와 같으면 "오류 #k 의 샘플과 같은 형식" 으로 대체
+        duplicates = []
+        first_seen = {}
+        for i, error in enumerate(errors):
+            masked = mask_message(error.get('SampleMessage') or '').strip()
+            duplicates.append(first_seen.get(masked) if masked else None)
+            first_seen.setdefault(masked, i + 1)
+
+        levels = [0] * len(errors)
+        prompt = self._render(errors, levels, duplicates)
+        # 예산을 넘으면 한 단계씩, 순위가 낮은(뒤쪽) 오류부터 상세 수준을 낮춤
+        for level in range(1, len(DETAIL_LEVELS)):
+            for i in reversed(range(len(errors))):
+                if estimate_tokens(prompt) <= self.token_budget:
+                    return prompt
+                levels[i] = level
+                prompt = self._render(errors, levels, duplicates)
+        if estimate_tokens(prompt) > self.token_budget:
+            logger.warning(f"Prompt for {len(errors)} errors is still over the token budget "
+                           f"({estimate_tokens(prompt)} > {self.token_budget}).")
+        return prompt
@@ -0,0 +1,107 @@
+import datetime
+import logging
+
+from src.error_analyzer import RecurringErrorAggregator
+from src.event_sources import COMPACT_RECORD_TYPES, datetime_to_epoch
+
+logger = logging.getLogger(__name__)
+
+# 윈도우 하나를 나누는 시간 구간 수 (메모리 = 구간 수 × 구간별 오류 종류 수)
+DEFAULT_BUCKETS_PER_WINDOW = 60
+
+
+def top_n_distance(previous, current):
+    """두 상위 오류 식별자 집합의 Jaccard 거리 (0: 같음, 1: 겹치는 오류 없음)."""
+    if not previous and not current:
+        return 0.0
+    return 1.0 - len(previous & current) / len(previous | current)
+
+def _record_epoch(record):
+    if type(record) in COMPACT_RECORD_TYPES:
+        return record.epoch
+    return datetime_to_epoch(datetime.datetime.fromisoformat(record['Timestamp']))
+
+
+class RollingErrorWindow:
+    """
+    최근 window_seconds 동안의 반복 오류 집계를 유지하는 롤링 윈도우.
+    윈도우를 buckets 개의 시간 구간으로 나눠 구간마다 RecurringErrorAggregator 를 두고,
+    advance 로 시간이 지나면 윈도우를 벗어난 구간을 통째로 버리므로 메모리는 이벤트 수와 무관하게 제한됩니다.
+    """
+
+    def __init__(self, name, window_seconds, buckets=DEFAULT_BUCKETS_PER_WINDOW):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.bucket_seconds = max(1, -(-window_seconds // buckets))
+        self.bucket_count = -(-window_seconds // self.bucket_seconds)
+        self._buckets = {} # 구간 번호(epoch // bucket_seconds) -> RecurringErrorAggregator
+        self._oldest_index = None # 윈도우에 남아 있는 가장 오래된 구간 번호
+
+    @property
+    def total_count(self):
+        return sum(bucket.total_count for bucket in self._buckets.values())
+
+    def advance(self, now_epoch):
+        """현재 시각 기준으로 윈도우를 벗어난 구간을 버립니다."""
+        self._oldest_index = now_epoch // self.bucket_seconds - self.bucket_count + 1
+        for index in [index for index in self._buckets if index < self._oldest_index]:
+            del self._buckets[index]
+
+    def add(self, record, epoch, cluster=None):
+        """레코드를 해당 구간에 추가합니다. 윈도우보다 오래된 레코드는 무시하고 False 를 반환합니다."""
+        index = epoch // self.bucket_seconds
+        if self._oldest_index is not None and index < self._oldest_index:
+            return False
+        bucket = self._buckets.get(index)
+        if bucket is None:
+            bucket = self._buckets[index] = RecurringErrorAggregator()
+        bucket.add(record, cluster=cluster)
+        return True
+
+    def aggregate(self):
+        """윈도우 전체 구간을 합친 RecurringErrorAggregator 를 반환합니다."""
+        merged = RecurringErrorAggregator()
+        for index in sorted(self._buckets):
+            merged.merge(self._buckets[index])
+        return merged
+
+
+class RollingErrorWindows:
+    """
+    여러 길이의 롤링 윈도우(예: 1h/24h/7d)를 함께 갱신합니다.
+    template_miner 가 주어지면 레코드마다 템플릿을 한 번만 추출해 모든 윈도우에서 같은 템플릿 ID 로 집계합니다.
+    """
+
+    def __init__(self, durations, template_miner=None, buckets=DEFAULT_BUCKETS_PER_WINDOW):
+        self.windows = [RollingErrorWindow(name, seconds, buckets) for name, seconds in durations]
+        self.template_miner = template_miner
+
+    def __iter__(self):
+        return iter(self.windows)
+
+    def get(self, name):
+        return next((window for window in self.windows if window.name == name), None)
+
+    def advance(self, now_epoch):
+        for window in self.windows:
+            window.advance(now_epoch)
+
+    def add(self, record):
+        epoch = _record_epoch(record)
+        cluster = None
+        if self.template_miner is not None:
+            message = record.message if type(record) in COMPACT_RECORD_TYPES else record.get('Message')
+            cluster = self.template_miner.add_message(message or '')
+        added = False
+        for window in self.windows:
+            added = window.add(record, epoch, cluster=cluster) or added
+        return added
+
+    def update(self, records):
+        """레코드 스트림을 추가하고 (추가된 건수, 전달받은 건수) 를 반환합니다."""
+        added = total = 0
+        for record in records:
+            total += 1
+            if self.add(record):
+                added += 1
+        return added, total
@@ -0,0 +1,130 @@
+import datetime
+import random
+
+from src.event_sources import EventRecord, datetime_to_epoch
+
+# 기본 이벤트 종류: (Source, EventID, 메시지 템플릿, 가중치)
+# 템플릿의 {num} {hex} {guid} {path} {ip} {name} 자리는 이벤트마다 다른 값으로 채워집니다.
+DEFAULT_EVENT_KINDS = [
+    ('Service Control Manager', 7031, "The {name} service terminated unexpectedly. It has done this {num} time(s).", 30),
+    ('Disk', 7, "The device, \\Device\\Harddisk{num}\\DR{num}, has a bad block.", 15),
+    ('Ntfs', 55, "A corruption was discovered in the file system structure on volume {path}.", 10),
+    ('Microsoft-Windows-Kernel-Power', 41, "The system has rebooted without cleanly shutting down first.", 8),
+    ('DistributedCOM', 10016, "The application-specific permission settings do not grant Local Activation "
+                              "permission for the COM Server application with CLSID {guid} to the user {name}.", 20),
+    ('Application Error', 1000, "Faulting application name: {name}.exe, version: {num}.{num}.{num}.{num}, "
+                                "exception code: {hex}, fault offset: {hex}", 12),
+    ('Tcpip', 4199, "The system detected an address conflict for IP address {ip} with the system "
+                    "having network hardware address {hex}.", 5),
+]
+
+_NAMES = ('Spooler', 'wuauserv', 'BITS', 'Dnscache', 'WinDefend', 'explorer', 'svchost', 'OneDrive', 'Teams', 'chrome')
+_PATHS = ('C:\\', 'D:\\', '\\Device\\HarddiskVolume3', 'C:\\Windows\\System32\\config', 'E:\\data\\archive')
+
+
+class SyntheticEventGenerator:
+    """
+    get_critical_errors 출력과 같은 형태의 레코드 dict 를 결정적으로 생성합니다 (벤치마크/시험용).
+    같은 seed 와 설정이면 항상 같은 레코드 순서를 만들며, 레코드는 get_critical_errors 처럼 최신순입니다.
+    burst_probability 확률로 한 종류의 이벤트가 burst_length 건 연달아 burst_interval_seconds 간격으로 발생합니다.
+    """
+
+    def __init__(self, seed=0, event_kinds=None, start_time=None, interval_seconds=30.0,
+                 burst_probability=0.001, burst_length=200, burst_interval_seconds=0.5,
+                 log_type='System', level_types=(1, 2)):
+        self.seed = seed
+        self.event_kinds = list(event_kinds or DEFAULT_EVENT_KINDS)
+        self.start_time = start_time or datetime.datetime(2026, 1, 1)
+        self.interval_seconds = interval_seconds
+        self.burst_probability = burst_probability
+        self.burst_length = burst_length
+        self.burst_interval_seconds = burst_interval_seconds
+        self.log_type = log_type
+        self.level_types = level_types
+
+    @staticmethod
+    def _compile(template):
+        """템플릿을 (앞부분 문자열, [(자리 표시자, 뒤따르는 문자열), ...]) 로 나눕니다."""
+        parts = template.split('{')
+        return parts[0], [tuple(part.split('}', 1)) if '}' in part else ('', '{' + part) for part in parts[1:]]
+
+    @staticmethod
+    def _fill(rng, compiled):
+        """컴파일된 템플릿의 자리 표시자를 무작위 값으로 채웁니다 (자리마다 다른 값)."""
+        head, fields = compiled
+        out = [head]
+        for key, rest in fields:
+            if key == 'num':
+                out.append(str(rng.randrange(1, 100)))
+            elif key == 'hex':
+                out.append(f"0x{rng.getrandbits(32):08x}")
+            elif key == 'guid':
+                value = f"{rng.getrandbits(128):032X}"
+                out.append(f"{{{value[:8]}-{value[8:12]}-{value[12:16]}-{value[16:20]}-{value[20:]}}}")
+            elif key == 'path':
+                out.append(rng.choice(_PATHS))
+            elif key == 'ip':
+                out.append(f"192.168.{rng.randrange(256)}.{rng.randrange(1, 255)}")
+            elif key == 'name':
+                out.append(rng.choice(_NAMES))
+            elif key:
+                out.append('{' + key + '}')
+            out.append(rest)
+        return ''.join(out)
+
+    def iter_records(self, count, compact=False):
+        """
+        레코드 dict 를 count 건 생성합니다 (메모리에 보관하지 않는 스트림).
+        compact 가 True 이면 get_critical_errors 와 같은 EventRecord 를 생성합니다.
+        """
+        rng = random.Random(self.seed)
+        cum_weights = []
+        total = 0
+        for kind in self.event_kinds:
+            total += kind[3]
+            cum_weights.append(total)
+        kind_indexes = range(len(self.event_kinds))
+        compiled = [self._compile(kind[2]) for kind in self.event_kinds]
+
+        offset = 0.0 # start_time 으로부터 과거 방향 경과 초
+        burst_remaining = 0
+        burst_kind = None
+        last_second = None
+        last_timestamp = None
+        start_epoch = datetime_to_epoch(self.start_time)
+        for i in range(count):
+            if burst_remaining:
+                burst_remaining -= 1
+                kind_index = burst_kind
+                offset += self.burst_interval_seconds
+            else:
+                if self.burst_probability and rng.random() < self.burst_probability:
+                    burst_kind = rng.choices(kind_indexes, cum_weights=cum_weights)[0]
+                    burst_remaining = self.burst_length - 1
+                    kind_index = burst_kind
+                else:
+                    kind_index = rng.choices(kind_indexes, cum_weights=cum_weights)[0]
+                offset += rng.expovariate(1.0 / self.interval_seconds) if self.interval_seconds else 0.0
+
+            second = int(offset)
+            source, event_id = self.event_kinds[kind_index][:2]
+            if compact:
+                yield EventRecord(start_epoch - second, source, event_id, self.level_types[i % len(self.level_types)],
+                                  self._fill(rng, compiled[kind_index]), self.log_type, count - i)
+                continue
+            # 같은 초의 타임스탬프 문자열은 재사용 (strftime 비용 절감)
+            if second != last_second:
+                last_second = second
+                last_timestamp = (self.start_time - datetime.timedelta(seconds=second)).strftime('%Y-%m-%d %H:%M:%S')
+            yield {
+                'Timestamp': last_timestamp,
+                'Source': source,
+                'EventID': event_id,
+                'LevelType': self.level_types[i % len(self.level_types)],
+                'Message': self._fill(rng, compiled[kind_index]),
+                'LogType': self.log_type,
+                'RecordNumber': count - i
+            }
+
+    def generate_records(self, count, compact=False):
+        return list(self.iter_records(count, compact=compact))
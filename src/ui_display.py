@@ -1,18 +1,89 @@
 # src/ui_display.py
 
+import atexit
 import datetime
 import logging
+import logging.handlers
 import os # os 모듈 임포트
-from rich.console import Console
-from rich.panel import Panel
-from rich.text import Text
-from rich.logging import RichHandler
+import queue
 
-console = Console()
+# rich 모듈은 출력할 때 불러옴 (import 시간 단축). 콘솔은 get_console 로 처음 사용할 때 생성
+_console = None
 logger = logging.getLogger(__name__) # 로거 사용 확인
+# 로그 레코드를 콘솔/파일 핸들러로 전달하는 백그라운드 리스너와 로거 쪽 큐 핸들러 (setup_logging 에서 생성)
+_log_listener = None
+_log_handler = None
 
-def setup_logging(log_level=logging.INFO, log_file=None, max_bytes=5*1024*1024, backup_count=3):
-    """rich와 파일 로깅을 함께 사용하도록 로깅 설정"""
+def get_console():
+    """공용 rich 콘솔 (처음 호출 시 생성)"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
+def _print(renderable):
+    """대기 중인 로그를 먼저 출력한 뒤 콘솔에 출력합니다."""
+    flush_logging()
+    get_console().print(renderable)
+
+class RateLimitedQueueHandler(logging.handlers.QueueHandler):
+    """
+    호출 위치(로거, 파일, 줄)별로 WARNING 빈도를 제한하는 QueueHandler.
+    같은 위치의 경고는 interval_seconds 구간마다 limit 건까지만 큐에 넣고 나머지는 건수만 세었다가,
+    구간이 지난 뒤 같은 위치에서 다시 경고가 나오거나 flush_suppressed 가 호출되면 요약 한 줄로 기록합니다.
+    이벤트마다 반복되는 경고(메시지 포맷/레코드 파싱 실패 등)용이며, ERROR 이상과 INFO 이하는 제한하지 않습니다.
+    """
+
+    def __init__(self, log_queue, limit=5, interval_seconds=60.0):
+        super().__init__(log_queue)
+        self.limit = limit
+        self.interval_seconds = interval_seconds
+        self._sites = {} # (로거, 파일, 줄) -> [구간 시작 시각, 기록한 건수, 생략한 건수, 마지막으로 생략한 레코드]
+
+    def emit(self, record):
+        if self.limit > 0 and record.levelno == logging.WARNING:
+            key = (record.name, record.pathname, record.lineno)
+            site = self._sites.get(key)
+            if site is None or record.created - site[0] >= self.interval_seconds:
+                if site is not None and site[2]:
+                    super().emit(self._summary_record(site))
+                site = self._sites[key] = [record.created, 0, 0, None]
+            if site[1] >= self.limit:
+                site[2] += 1
+                site[3] = record
+                return
+            site[1] += 1
+        super().emit(record)
+
+    def _summary_record(self, site):
+        suppressed, last = site[2], site[3]
+        message = (f"Suppressed {suppressed} similar warning(s) (limit: {self.limit} per {self.interval_seconds:g}s, "
+                   f"last: {last.getMessage()})")
+        return logging.makeLogRecord(dict(last.__dict__, msg=message, args=None, exc_info=None, exc_text=None))
+
+    def flush_suppressed(self):
+        """생략된 경고가 있는 위치마다 요약을 기록합니다 (종료 시 호출)."""
+        self.acquire()
+        try:
+            for site in self._sites.values():
+                if site[2]:
+                    super().emit(self._summary_record(site))
+                    site[2] = 0
+        finally:
+            self.release()
+
+def setup_logging(log_level=logging.INFO, log_file=None, max_bytes=5*1024*1024, backup_count=3,
+                  rate_limit_count=5, rate_limit_seconds=60.0):
+    """
+    rich와 파일 로깅을 함께 사용하도록 로깅 설정.
+    로거에는 RateLimitedQueueHandler 만 붙이고 콘솔(RichHandler)/파일 출력은 QueueListener 백그라운드 스레드에서 하므로,
+    로그 호출이 터미널 렌더링이나 디스크 기록을 기다리지 않습니다. 반복 경고는 호출 위치별로
+    rate_limit_seconds 마다 rate_limit_count 건까지만 기록하고 나머지는 요약합니다 (0 이면 제한 없음).
+    종료 시 shutdown_logging 으로 남은 로그를 기록합니다 (atexit 에도 등록).
+    """
+    global _log_listener, _log_handler
+    shutdown_logging()
     # 기본 로거 설정 (RichHandler 사용)
     # basicConfig는 루트 로거를 설정하므로, 핸들러를 직접 추가/제거하는 것이 더 유연할 수 있음
     # 기존 핸들러 제거 후 재설정 (중복 방지)
@@ -24,11 +95,13 @@ def setup_logging(log_level=logging.INFO, log_file=None, max_bytes=5*1024*1024,
 
     # 루트 로거 레벨 설정
     root_logger.setLevel(log_level)
+    handlers = []
 
     # 콘솔 핸들러 추가
-    console_handler = RichHandler(console=console, rich_tracebacks=True, show_path=False, markup=True)
+    from rich.logging import RichHandler
+    console_handler = RichHandler(console=get_console(), rich_tracebacks=True, show_path=False, markup=True)
     console_handler.setLevel(log_level) # 콘솔 핸들러 레벨 설정
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # 파일 핸들러 추가 (옵션)
     if log_file:
@@ -50,23 +123,52 @@ def setup_logging(log_level=logging.INFO, log_file=None, max_bytes=5*1024*1024,
                 formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
                 file_handler.setFormatter(formatter)
                 file_handler.setLevel(log_level) # 파일 핸들러 레벨 설정
-                root_logger.addHandler(file_handler)
+                handlers.append(file_handler)
             except Exception as e:
                 print(f"Warning: Failed to setup file logging handler for '{log_file}': {e}")
 
+    # 로그 레코드는 큐에 넣기만 하고 (크기 제한 없음, 로그 호출이 막히지 않음) 리스너 스레드가 핸들러로 출력
+    log_queue = queue.Queue()
+    _log_handler = RateLimitedQueueHandler(log_queue, limit=rate_limit_count, interval_seconds=rate_limit_seconds)
+    root_logger.addHandler(_log_handler)
+    _log_listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _log_listener.start()
+    atexit.register(shutdown_logging)
+
+def flush_logging():
+    """큐에 쌓인 로그가 모두 출력될 때까지 기다립니다 (패널/표를 로그 출력 순서에 맞춰 표시하기 위함)."""
+    if _log_listener is not None:
+        _log_listener.queue.join()
+
+def shutdown_logging():
+    """생략된 경고 요약을 기록하고, 남은 로그를 모두 출력한 뒤 리스너 스레드를 멈춥니다."""
+    global _log_listener, _log_handler
+    if _log_listener is None:
+        return
+    _log_handler.flush_suppressed()
+    _log_listener.stop()
+    for handler in _log_listener.handlers:
+        handler.close()
+    logging.getLogger().removeHandler(_log_handler)
+    _log_listener = None
+    _log_handler = None
+
 # --- 나머지 display 함수들은 이전과 동일 ---
 def display_start_message():
     """프로그램 시작 메시지를 패널로 출력"""
-    console.print(Panel("[bold cyan]Starting Windows Event Log Analyzer[/]", title="Status", border_style="cyan"))
+    from rich.panel import Panel
+    _print(Panel("[bold cyan]Starting Windows Event Log Analyzer[/]", title="Status", border_style="cyan"))
 
 # ... (display_progress, display_error_summary 등 나머지 함수 동일) ...
 def display_progress(message):
     logger.info(message)
 
 def display_error_summary(summary_text):
-    console.print(Panel(summary_text, title="[bold yellow]Recurring Error Summary[/]", border_style="yellow", expand=False))
+    from rich.panel import Panel
+    _print(Panel(summary_text, title="[bold yellow]Recurring Error Summary[/]", border_style="yellow", expand=False))
 
 def display_llm_results(suggestions):
+    from rich.panel import Panel
     title = "[bold green]LLM Troubleshooting Suggestions[/]"
     border_style = "green"
     # suggestions 문자열에 마크업이 포함될 수 있으므로 Text 객체 사용 시 주의
@@ -78,12 +180,107 @@ def display_llm_results(suggestions):
         border_style = "red"
         content = f"[red]{suggestions}[/red]" # 오류 스타일 직접 적용
 
-    console.print(Panel(content, title=title, border_style=border_style, expand=True)) # expand=True 추가
+    _print(Panel(content, title=title, border_style=border_style, expand=True)) # expand=True 추가
+
+class LlmStreamDisplay:
+    """
+    스트리밍 중인 LLM 응답을 rich.live 로 점진적으로 표시하는 컨텍스트 관리자.
+    화면 높이에 맞게 마지막 줄들만 보여주며, 종료 시 지워지므로 최종 결과는 display_llm_results 로 출력합니다.
+    """
+
+    def __init__(self):
+        from rich.live import Live
+        self._live = Live(self._render(""), console=get_console(), refresh_per_second=8, transient=True)
+
+    def _render(self, text):
+        from rich.panel import Panel
+        from rich.text import Text
+        max_lines = max(get_console().height - 4, 5)
+        lines = text.splitlines()[-max_lines:] or ["응답을 기다리는 중..."]
+        # 응답 조각에 대괄호가 포함될 수 있으므로 마크업으로 해석하지 않도록 Text 사용
+        return Panel(Text("\n".join(lines)), title="[bold green]LLM Troubleshooting Suggestions[/] [dim](streaming)[/]",
+                     border_style="green", expand=True)
+
+    def update(self, text):
+        self._live.update(self._render(text))
+
+    def __enter__(self):
+        flush_logging()
+        self._live.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._live.stop()
+        return False
+
+def _format_bytes(byte_count):
+    if not byte_count:
+        return "-"
+    for unit in ("B", "KB", "MB"):
+        if byte_count < 1024:
+            return f"{byte_count:.0f} {unit}" if unit == "B" else f"{byte_count:.1f} {unit}"
+        byte_count /= 1024
+    return f"{byte_count:.1f} GB"
+
+def display_stage_metrics(metrics_data):
+    """PipelineMetrics.to_dict() 결과를 단계별 표로 출력"""
+    if not metrics_data.get('Stages'):
+        return
+    from rich.table import Table
+    table = Table(title="Stage Metrics", title_style="bold magenta", border_style="magenta")
+    table.add_column("Stage")
+    table.add_column("Seconds", justify="right")
+    table.add_column("Items", justify="right")
+    table.add_column("Items/s", justify="right")
+    table.add_column("Written", justify="right")
+    for stage in metrics_data['Stages']:
+        table.add_row(
+            stage['Stage'],
+            f"{stage['Seconds']:.3f}",
+            f"{stage['Items']:,}" if stage['Items'] else "-",
+            f"{stage['ItemsPerSecond']:,.0f}" if stage['ItemsPerSecond'] else "-",
+            _format_bytes(stage['BytesWritten'])
+        )
+    peak_rss = metrics_data.get('PeakRssBytes')
+    table.caption = f"Total {metrics_data['TotalSeconds']:.2f}s, Peak RSS {_format_bytes(peak_rss) if peak_rss else 'N/A'}"
+    _print(table)
+
+def display_window_status(rows):
+    """감시 모드의 롤링 윈도우별 집계 현황을 표로 출력 (rows: {'Window', 'Errors', 'Distinct', 'TopError'} 목록)"""
+    from rich.table import Table
+    table = Table(title=f"Watch Status ({datetime.datetime.now().strftime('%H:%M:%S')})",
+                  title_style="bold cyan", border_style="cyan")
+    table.add_column("Window")
+    table.add_column("Errors", justify="right")
+    table.add_column("Distinct", justify="right")
+    table.add_column("Top Error")
+    for row in rows:
+        table.add_row(row['Window'], f"{row['Errors']:,}", f"{row['Distinct']:,}", row['TopError'] or "-")
+    _print(table)
+
+def display_fleet_hosts(rows, limit=20):
+    """플릿 모드의 호스트별 처리 현황을 표로 출력 (rows: {'Host', 'Files', 'Events', 'FailedFiles', 'Seconds'} 목록, 앞쪽 limit 개만)"""
+    if not rows:
+        return
+    from rich.table import Table
+    table = Table(title=f"Fleet Hosts ({len(rows)})", title_style="bold cyan", border_style="cyan")
+    table.add_column("Host")
+    table.add_column("Files", justify="right")
+    table.add_column("Errors", justify="right")
+    table.add_column("Failed", justify="right")
+    table.add_column("Seconds", justify="right")
+    for row in rows[:limit]:
+        table.add_row(row['Host'], f"{row['Files']:,}", f"{row['Events']:,}",
+                      f"{row['FailedFiles']:,}" if row['FailedFiles'] else "-", f"{row['Seconds']:.2f}")
+    if len(rows) > limit:
+        table.caption = f"... and {len(rows) - limit} more hosts"
+    _print(table)
 
 def display_end_message(start_time):
+    from rich.panel import Panel
     end_time = datetime.datetime.now()
     duration = (end_time - start_time).total_seconds()
-    console.print(Panel(f"Analysis complete in [bold blue]{duration:.2f}[/] seconds", title="Status", border_style="blue"))
+    _print(Panel(f"Analysis complete in [bold blue]{duration:.2f}[/] seconds", title="Status", border_style="blue"))
 
 def display_warning(message):
      logger.warning(message)